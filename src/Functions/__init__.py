@@ -5,6 +5,7 @@ Contains all the core game functionality modules.
 """
 
 # Import all main functions for easy access
+from .atomic_write import atomic_write
 from .check_inventory import check_inventory
 from .clear_screen import clear_screen
 from .look_around import look_around
@@ -15,6 +16,7 @@ from .type_to_screen import type_to_screen
 from .wrap_text import wrap_text
 
 __all__ = [
+    'atomic_write',
     'check_inventory',
     'clear_screen', 
     'look_around',
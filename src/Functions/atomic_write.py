@@ -0,0 +1,32 @@
+import os
+import tempfile
+from typing import Union
+
+
+def atomic_write(path: str, data: Union[str, bytes]):
+    """
+    Replace a file's contents so readers see either the old or the new file, never a partial one.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk, and renamed over the target.
+
+    Args:
+        path: File to write
+        data: New contents; str is written as UTF-8
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
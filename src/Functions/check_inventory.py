@@ -1,73 +1,51 @@
-from typing import List
+from typing import List, Optional, Tuple, Union
 
 from game_state import game_state
+from inventory import Inventory, format_stack
+from item_catalog import item_catalog
 
 
-def check_inventory(inventory: List[str]) -> str:
+# Last rendered inventory, the (version, weight, capacity) it was rendered at, and its text
+_render_owner: Optional[Inventory] = None
+_render_key: Optional[Tuple[int, float, float]] = None
+_render_text = ""
+
+
+def check_inventory(inventory: Union[Inventory, List[str]]) -> str:
     """
     Display player inventory with categorization and item details.
 
+    The text for an Inventory is cached until the inventory changes, so
+    reopening the inventory screen does not rebuild it.
+
     Args:
-        inventory: List of items in inventory
+        inventory: Inventory, or a list of item names
 
     Returns:
         Formatted inventory string
     """
+    global _render_owner, _render_key, _render_text
+
     if not inventory:
         return "Your inventory is empty."
 
-    # Define item categories and their properties
-    item_categories = {
-        "Weapons": {
-            "items": ["hunting knife", "baseball bat", "pistol", "hunting rifle", "shotgun", "crowbar", "axe"],
-            "icon": "⚔️"
-        },
-        "Medical": {
-            "items": ["first aid kit", "medicine", "painkillers", "antibiotics", "bandages", "medical supplies"],
-            "icon": "🏥"
-        },
-        "Food & Drink": {
-            "items": ["water bottle", "food rations", "canned food", "energy drink", "snack bar", "berries"],
-            "icon": "🍽️"
-        },
-        "Tools & Equipment": {
-            "items": ["flashlight", "rope", "compass", "radio", "batteries", "tools", "jumper cables"],
-            "icon": "🔧"
-        },
-        "Clothing & Gear": {
-            "items": ["backpack", "sleeping bag", "warm jacket", "boots", "bulletproof vest", "blanket"],
-            "icon": "👕"
-        },
-        "Fuel & Automotive": {
-            "items": ["can of motor oil", "gasoline", "diesel fuel", "spare tire", "car keys"],
-            "icon": "⛽"
-        },
-        "Miscellaneous": {
-            "items": [],  # Will catch anything not in other categories
-            "icon": "📦"
-        }
-    }
-
-    # Categorize inventory items
-    categorized_inventory = {}
-    uncategorized_items = []
+    if not isinstance(inventory, Inventory):
+        return _render_inventory(Inventory(inventory))
 
-    for item in inventory:
-        categorized = False
-        for category, data in item_categories.items():
-            if item in data["items"]:
-                if category not in categorized_inventory:
-                    categorized_inventory[category] = []
-                categorized_inventory[category].append(item)
-                categorized = True
-                break
+    key = (inventory.version, game_state.current_weight, game_state.max_inventory_weight)
+    if inventory is not _render_owner or key != _render_key:
+        _render_text = _render_inventory(inventory)
+        _render_owner = inventory
+        _render_key = key
+    return _render_text
 
-        if not categorized:
-            uncategorized_items.append(item)
 
-    # Add uncategorized items to miscellaneous
-    if uncategorized_items:
-        categorized_inventory["Miscellaneous"] = uncategorized_items
+def _render_inventory(inventory: Inventory) -> str:
+    """Build the inventory display for a non-empty inventory."""
+    # Group item stacks by their catalog category
+    categorized_inventory = {}
+    for item, count in inventory.stacks():
+        categorized_inventory.setdefault(item_catalog.category(item), []).append((item, count))
 
     # Build inventory display string
     inventory_lines = []
@@ -81,18 +59,18 @@ def check_inventory(inventory: List[str]) -> str:
     inventory_lines.append("")
 
     # Display items by category
-    for category, data in item_categories.items():
+    for category, icon in item_catalog.categories:
         if category in categorized_inventory:
             items = categorized_inventory[category]
-            inventory_lines.append(f"{data['icon']} {category}:")
+            inventory_lines.append(f"{icon} {category}:")
 
-            for item in items:
+            for item, count in items:
                 # Add item details if available
                 item_info = get_item_info(item)
                 if item_info:
-                    inventory_lines.append(f"  • {item} - {item_info}")
+                    inventory_lines.append(f"  • {format_stack(item, count)} - {item_info}")
                 else:
-                    inventory_lines.append(f"  • {item}")
+                    inventory_lines.append(f"  • {format_stack(item, count)}")
 
             inventory_lines.append("")
 
@@ -112,48 +90,4 @@ def get_item_info(item: str) -> str:
     Returns:
         Information string about the item
     """
-    item_info = {
-        # Weapons
-        "hunting knife": "15 damage, 80% accuracy",
-        "baseball bat": "20 damage, 75% accuracy",
-        "pistol": "35 damage, 60% accuracy (needs bullets)",
-        "hunting rifle": "50 damage, 80% accuracy (needs rifle rounds)",
-        "shotgun": "45 damage, 70% accuracy (needs shells)",
-        "crowbar": "18 damage, 80% accuracy",
-        "axe": "25 damage, 70% accuracy",
-
-        # Medical
-        "first aid kit": "Restores 25 health",
-        "medicine": "Restores 15 health",
-        "painkillers": "Restores 10 health, reduces fatigue",
-        "antibiotics": "Prevents infection, restores 20 health",
-        "water bottle": "Restores 30 thirst",
-        "energy drink": "Reduces 20 fatigue, restores 10 thirst",
-
-        # Food
-        "food rations": "Restores 40 hunger",
-        "canned food": "Restores 30 hunger",
-        "snack bar": "Restores 15 hunger",
-        "berries": "Restores 10 hunger, 5 thirst",
-
-        # Tools
-        "flashlight": "Illuminates dark areas",
-        "rope": "Useful for climbing and securing items",
-        "compass": "Helps with navigation",
-        "radio": "Can contact other survivors",
-        "batteries": "Powers electronic devices",
-
-        # Gear
-        "backpack": "Increases carrying capacity",
-        "sleeping bag": "Improves rest quality",
-        "warm jacket": "Protection from cold",
-        "bulletproof vest": "Reduces damage from attacks",
-
-        # Automotive
-        "can of motor oil": "Vehicle maintenance",
-        "gasoline": "Fuel for vehicles",
-        "diesel fuel": "Fuel for trucks and generators",
-        "car keys": "Starts specific vehicles"
-    }
-
-    return item_info.get(item, "")
+    return item_catalog.info(item)
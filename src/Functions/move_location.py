@@ -1,6 +1,3 @@
-from Functions.read_location_data import read_location_data
-
-
 def move_location(current_location: str) -> str:
     """
     Handle player movement to a new location with improved error handling.
@@ -11,8 +8,10 @@ def move_location(current_location: str) -> str:
     Returns:
         Name of the new location, or current location if move failed
     """
+    from world_index import get_world
+
     try:
-        locations = read_location_data()
+        locations = get_world().locations
         if not locations:
             print("Error: No location data available!")
             return current_location
@@ -1,41 +1,115 @@
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
+COMPILED_SUFFIX = '.zworld'
+SHARDED_SUFFIX = '.zshards'
+SHARD_MANIFEST = 'manifest.json'
 
-def read_location_data() -> List[Dict[str, Any]]:
+
+def find_location_file() -> Optional[str]:
+    """
+    Locate the locations.json assets file.
+
+    A sharded world (see world_shards.py) or compiled world (see
+    world_compiler.py) next to the JSON file is preferred, in that order, as
+    long as it is at least as new as the JSON it was built from.
+
+    Returns:
+        Path to the first candidate file that exists, or None if none do
+    """
+    # Try different possible paths for the assets file
+    possible_paths = [
+        'Assets/locations.json',
+        '../Assets/locations.json',
+        os.path.join(os.path.dirname(__file__), '..', 'Assets', 'locations.json')
+    ]
+
+    for path in possible_paths:
+        if os.path.exists(path):
+            stem = os.path.splitext(path)[0]
+            for built_path in (os.path.join(stem + SHARDED_SUFFIX, SHARD_MANIFEST),
+                               stem + COMPILED_SUFFIX):
+                if _is_up_to_date(built_path, path):
+                    return built_path
+            return path
+    return None
+
+
+def _is_up_to_date(built_path: str, source_path: str) -> bool:
+    """Check if a compiled world exists and is not older than its source."""
+    try:
+        return os.path.getmtime(built_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def is_shard_manifest(path: str) -> bool:
+    """Check if a path points at the manifest of a sharded world."""
+    return (os.path.basename(path) == SHARD_MANIFEST and
+            os.path.dirname(path).endswith(SHARDED_SUFFIX))
+
+
+def source_for_built_world(path: str) -> str:
+    """Get the locations.json path that a compiled or sharded world was built from."""
+    if is_shard_manifest(path):
+        path = os.path.dirname(path)
+    return os.path.splitext(path)[0] + '.json'
+
+
+def validate_location_data(location_data: Any):
+    """
+    Validate the structure of parsed location data.
+
+    Args:
+        location_data: Parsed contents of a locations file
+
+    Raises:
+        ValueError: If the data does not match the locations schema
+    """
+    if not isinstance(location_data, list):
+        raise ValueError("Location data must be a list")
+
+    for location in location_data:
+        if not isinstance(location, dict):
+            raise ValueError("Each location must be a dictionary")
+        if "name" not in location:
+            raise ValueError("Each location must have a 'name' field")
+        if "description" not in location:
+            raise ValueError("Each location must have a 'description' field")
+
+
+def read_location_data(path: Optional[str] = None) -> Sequence[Mapping[str, Any]]:
     """
     Read location data from JSON file with error handling.
 
+    Args:
+        path: Explicit file to read; the assets directories are searched if omitted
+
     Returns:
-        List of location dictionaries, or empty list if error occurs
+        List of location dictionaries (a lazily decoded, memory-mapped
+        sequence for compiled worlds), or default locations if an error occurs
     """
     try:
-        # Try different possible paths for the assets file
-        possible_paths = [
-            'Assets/locations.json',
-            '../Assets/locations.json',
-            os.path.join(os.path.dirname(__file__), '..', 'Assets', 'locations.json')
-        ]
-
-        for path in possible_paths:
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    location_data = json.load(f)
-
-                # Validate the data structure
-                if not isinstance(location_data, list):
-                    raise ValueError("Location data must be a list")
-
-                for location in location_data:
-                    if not isinstance(location, dict):
-                        raise ValueError("Each location must be a dictionary")
-                    if "name" not in location:
-                        raise ValueError("Each location must have a 'name' field")
-                    if "description" not in location:
-                        raise ValueError("Each location must have a 'description' field")
-
-                return location_data
+        if path is None:
+            path = find_location_file()
+
+        if path is not None and path.endswith(COMPILED_SUFFIX):
+            from world_compiler import load_compiled_world
+            return load_compiled_world(path).locations
+
+        if path is not None and is_shard_manifest(path):
+            from world_shards import ShardedWorld
+            return ShardedWorld(path).locations
+
+        if path is not None:
+            with open(path, 'r', encoding='utf-8') as f:
+                location_data = json.load(f)
+
+            # Validate the data structure
+            validate_location_data(location_data)
+
+            return location_data
 
         # If no file found, return default location data
         print("Warning: locations.json not found, using default locations")
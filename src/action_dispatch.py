@@ -0,0 +1,131 @@
+"""
+Action Dispatch - Bind location actions to handlers when the world loads
+
+Every action in the world data is resolved once to a handler ID, either
+from an explicit "handler" field on the action or from the rule table
+below. GameEngine.execute_action then dispatches with a single dict lookup,
+and actions that no rule covers are reported when the world is loaded
+instead of when a player picks them.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Handler IDs; GameEngine maps each one to a method
+LOOK_AROUND = "look_around"
+MOVE_SHORT = "move_short"
+MOVE_LONG = "move_long"
+REPAIR_VEHICLE = "repair_vehicle"
+INVENTORY = "inventory"
+SEARCH = "search"
+USE_ITEM = "use_item"
+BUY_GEAR = "buy_gear"
+REST = "rest"
+REFUEL = "refuel"
+CLIMB_BELL_TOWER = "climb_bell_tower"
+DESCEND_TO_CEMETERY = "descend_to_cemetery"
+
+HANDLERS = frozenset([
+    LOOK_AROUND, MOVE_SHORT, MOVE_LONG, REPAIR_VEHICLE, INVENTORY, SEARCH, USE_ITEM,
+    BUY_GEAR, REST, REFUEL, CLIMB_BELL_TOWER, DESCEND_TO_CEMETERY
+])
+
+# Rules for actions without a "handler" field, tried in order. Each rule is
+# (handler, alternatives) and matches if every substring of any one
+# alternative occurs in the lowercased action name.
+ACTION_RULES: List[Tuple[str, Tuple[Tuple[str, ...], ...]]] = [
+    (LOOK_AROUND, (("look around",),)),
+    (MOVE_SHORT, (("move", "nearby"), ("go", "nearby"))),
+    (MOVE_LONG, (("move", "distant"), ("go", "distant"))),
+    (MOVE_SHORT, (("move",), ("go",))),
+    (REPAIR_VEHICLE, (("repair", "vehicle"),)),
+    (MOVE_LONG, (("travel", "distant"),)),
+    (INVENTORY, (("check your inventory",),)),
+    (SEARCH, (("search",), ("check",), ("explore",), ("examine",))),
+    (USE_ITEM, (("use",),)),
+    (BUY_GEAR, (("buy",), ("purchase",))),
+    (REST, (("rest",), ("sleep",))),
+    (REFUEL, (("fuel",),)),
+    (CLIMB_BELL_TOWER, (("climb", "bell tower"),)),
+    (DESCEND_TO_CEMETERY, (("descend", "cemetery"),)),
+]
+
+# Exact names that rules cannot express as substrings
+EXACT_NAMES = {"inventory": INVENTORY}
+
+
+def match_action_name(name: str) -> Optional[str]:
+    """
+    Resolve an action name against the rule table.
+
+    Args:
+        name: Action name as written in the world data
+
+    Returns:
+        Handler ID, or None if no rule matches
+    """
+    lowered = name.lower()
+    if lowered in EXACT_NAMES:
+        return EXACT_NAMES[lowered]
+    for handler, alternatives in ACTION_RULES:
+        for substrings in alternatives:
+            if all(substring in lowered for substring in substrings):
+                return handler
+    return None
+
+
+class ActionTable:
+    """Cache of action name to handler ID bindings shared by every world."""
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._by_name: Dict[str, Optional[str]] = {}
+
+    def resolve(self, action: Mapping[str, Any]) -> Optional[str]:
+        """
+        Get the handler ID for an action.
+
+        Args:
+            action: Action dictionary from a location
+
+        Returns:
+            Handler ID, or None if the action has no handler
+        """
+        handler = action.get("handler")
+        if handler:
+            return handler if handler in HANDLERS else None
+        name = action["name"]
+        try:
+            return self._by_name[name]
+        except KeyError:
+            handler = self._by_name[name] = match_action_name(name)
+            return handler
+
+    def bind(self, locations: Iterable[Mapping[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Resolve every action in a set of locations ahead of play.
+
+        Args:
+            locations: Location data
+
+        Returns:
+            (location name, action name) pairs for actions with no handler
+        """
+        unmatched = []
+        for location in locations:
+            for action in location.get("actions", ()):
+                if self.resolve(action) is None:
+                    unmatched.append((location["name"], action["name"]))
+        return unmatched
+
+
+def report_unmatched(unmatched: List[Tuple[str, str]]):
+    """Print a warning listing actions that no handler covers."""
+    if not unmatched:
+        return
+    print(f"Warning: {len(unmatched)} action(s) in the world data have no handler:")
+    for location_name, action_name in unmatched:
+        print(f"  {location_name}: {action_name}")
+
+
+# Global action table instance
+action_table = ActionTable()
@@ -0,0 +1,142 @@
+"""
+Autosave - Background saving of the game state
+
+The game loop calls Autosaver.tick() once per turn. When a save is due,
+every few turns or whenever the player changes location, tick() takes an
+in-memory snapshot (see snapshots.py), which costs microseconds, and
+hands it to a background thread. The thread turns the snapshot into save
+data and appends the fields that changed since the last autosave to the
+autosave slot, with a full save written atomically (temp file, fsync and
+rename) every so often; see SaveSlots.write_delta(). The game never
+waits on the disk, and a crash part way through a save loses at most
+that save.
+
+Only the latest snapshot waiting to be written is kept: if several saves
+are requested while one is being written, the older ones are dropped and
+just the newest is written next.
+"""
+
+import threading
+from typing import Optional
+
+from game_state import GameState
+from save_slots import save_slots
+from save_store import SaveBackend
+from snapshots import GameSnapshot
+
+# Binary (see save_codec.py): about a tenth the size of the same save in JSON
+AUTOSAVE_FILE = 'save_autosave.sav'
+
+
+class Autosaver:
+    """Writes snapshots of a game state to an autosave slot on a background thread."""
+
+    def __init__(self, state: GameState, slots: SaveBackend = save_slots, filename: str = AUTOSAVE_FILE,
+                 every: int = 5):
+        """
+        Set up an autosaver.
+
+        Args:
+            state: GameState to save
+            slots: Save backend to write to
+            filename: Autosave slot file name
+            every: Turns between saves when the location does not change
+        """
+        self.state = state
+        self.slots = slots
+        self.filename = filename
+        self.every = every
+        self.saves_written = 0
+        self._turns_since_save = 0
+        self._saved_location: Optional[str] = None
+        self._pending: Optional[GameSnapshot] = None
+        self._writing = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self) -> bool:
+        """
+        Request a save if one is due; call once per turn.
+
+        Turns are counted here rather than read from GameState.turn_count,
+        which only advances on moves, so a long stay in one place is still
+        saved every few turns.
+
+        Returns:
+            True if a save was requested
+        """
+        state = self.state
+        if self._saved_location is None:
+            # Nothing has changed yet at the start of a session
+            self._saved_location = state.current_location
+            return False
+        self._turns_since_save += 1
+        if (state.current_location == self._saved_location
+                and self._turns_since_save < self.every):
+            return False
+        self.request()
+        return True
+
+    def request(self):
+        """Snapshot the state now and queue it for writing."""
+        snapshot = self.state.snapshot()
+        self._turns_since_save = 0
+        self._saved_location = self.state.current_location
+        with self._condition:
+            # Replaces any snapshot that has not been picked up yet
+            self._pending = snapshot
+            self._condition.notify()
+
+    def _run(self):
+        """Write queued snapshots until stopped."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                snapshot = self._pending
+                if snapshot is None:
+                    return
+                self._pending = None
+                self._writing = True
+            try:
+                save_data = GameState.from_snapshot(snapshot).to_dict()
+                if self.slots.write_delta(self.filename, save_data):
+                    self.saves_written += 1
+            except Exception as e:
+                print(f"Warning: autosave failed: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued snapshots to be written.
+
+        Args:
+            timeout: Seconds to wait at most; no limit if omitted
+
+        Returns:
+            True if nothing is left to write
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def start(self):
+        """Start the background writer thread."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write any queued snapshot and stop the writer thread."""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
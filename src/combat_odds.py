@@ -0,0 +1,367 @@
+"""
+Combat Odds - Exact fight outcome distributions
+
+A fight (see combat_system.resolve()) is a small Markov chain over
+(zombie health, player health). Each round the player either attacks,
+hitting with probability equal to the weapon's accuracy for damage
+uniform over its base ±3, or, at or below flee_below health, tries to
+run away with a fixed chance. A zombie left standing bites back for
+damage uniform over its base ±5, halved when it catches a fleeing
+player. Every round that does not end the fight costs the player at
+least one health, so a fight lasts at most as many rounds as the player
+has health.
+
+This module pushes the whole probability grid through one round at a
+time with NumPy, as a convolution of the grid with the damage
+distributions along each health axis, and collects the probability of
+every way a fight can end: (outcome, rounds, player health left). That
+gives the exact win, flee and death probabilities and rounds-to-kill
+distribution for a weapon against a zombie type. Results are cached per
+(weapon, zombie type, zombie health, player health bucket, flee_below),
+and auto_resolve() draws a whole fight from the cached distribution in
+constant time with an alias table.
+
+The calculation assumes the weapon never runs out of ammunition.
+
+NumPy is an optional dependency; without it, HAVE_NUMPY is False and
+computing odds raises RuntimeError.
+
+Usage:
+    python combat_odds.py axe brute --health 100 --flee-below 25
+"""
+
+import argparse
+import functools
+import math
+import random
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from combat_system import (DEFEAT, ESCAPE_CHANCE, FAST_ZOMBIE_PENALTY, FAST_ZOMBIE_SPEED, FLED, VICTORY,
+                           ZOMBIE_STATS, Rng, Zombie)
+from item_catalog import item_catalog
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+# Outcomes, in the order of CombatOdds.rounds rows
+OUTCOMES = (VICTORY, FLED, DEFEAT)
+
+# Health at or below which auto-resolved fights run away
+AUTO_FLEE_BELOW = 25
+
+# Cached distributions; each holds a few arrays of at most (rounds x health) entries
+CACHE_SIZE = 1024
+
+
+def _damage_pmf(base: int, spread: int) -> Dict[int, float]:
+    """Distribution of max(1, base + uniform(-spread, spread))."""
+    pmf: Dict[int, float] = {}
+    for variation in range(-spread, spread + 1):
+        damage = max(1, base + variation)
+        pmf[damage] = pmf.get(damage, 0.0) + 1 / (2 * spread + 1)
+    return pmf
+
+
+def _shift_down(grid: Any, damage: int, axis: int) -> Tuple[Any, Any]:
+    """
+    Lower every health along an axis of a probability grid by an amount of damage.
+
+    Index 0 of the axis stands for health 0 and carries no probability.
+
+    Returns:
+        (grid of the states still standing, probability that dropped to
+        0 or below, summed along the axis)
+    """
+    grid = np.moveaxis(grid, axis, 0)
+    kept = np.zeros_like(grid)
+    if damage < len(grid) - 1:
+        kept[1:len(grid) - damage] = grid[1 + damage:]
+    dropped = grid[1:1 + damage].sum(axis=0)
+    return np.moveaxis(kept, 0, axis), dropped
+
+
+class CombatOdds:
+    """Exact outcome distribution of one fight setup."""
+
+    __slots__ = ("weapon", "zombie", "zombie_health", "health", "flee_below", "probabilities", "rounds",
+                 "_endings", "_alias_probability", "_alias")
+
+    def __init__(self, weapon: str, zombie: str, zombie_health: int, health: int, flee_below: float,
+                 endings: Dict[Tuple[str, int, int], float]):
+        """
+        Args:
+            weapon: Weapon the player attacks with
+            zombie: Zombie type
+            zombie_health: Zombie health at the start
+            health: Player health at the start
+            flee_below: Health at or below which the player runs away
+            endings: Probability of each (outcome, rounds, player health left)
+        """
+        self.weapon = weapon
+        self.zombie = zombie
+        self.zombie_health = zombie_health
+        self.health = health
+        self.flee_below = flee_below
+
+        max_rounds = max(rounds for _, rounds, _ in endings)
+        # rounds[i, r]: probability of ending with OUTCOMES[i] after r rounds
+        self.rounds = np.zeros((len(OUTCOMES), max_rounds + 1))
+        for (outcome, rounds, _), probability in endings.items():
+            self.rounds[OUTCOMES.index(outcome), rounds] += probability
+        self.probabilities = dict(zip(OUTCOMES, self.rounds.sum(axis=1).tolist()))
+
+        self._endings = list(endings)
+        self._alias_probability, self._alias = self._alias_table(list(endings.values()))
+
+    @staticmethod
+    def _alias_table(probabilities: List[float]) -> Tuple[List[float], List[int]]:
+        """Build a Vose alias table for sampling from a discrete distribution."""
+        count = len(probabilities)
+        total = sum(probabilities)
+        scaled = [p * count / total for p in probabilities]
+        alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+        for i in small + large:
+            scaled[i] = 1.0
+        return scaled, alias
+
+    def rounds_distribution(self, outcome: Optional[str] = None) -> Any:
+        """
+        Get the probability that a fight ends after each number of rounds.
+
+        Args:
+            outcome: Only count fights ending this way; all fights if omitted
+
+        Returns:
+            Array indexed by number of rounds
+        """
+        if outcome is None:
+            return self.rounds.sum(axis=0)
+        return self.rounds[OUTCOMES.index(outcome)]
+
+    def mean_rounds(self, outcome: Optional[str] = None) -> float:
+        """Get the expected number of rounds, optionally given how the fight ends."""
+        distribution = self.rounds_distribution(outcome)
+        total = distribution.sum()
+        return float(np.arange(len(distribution)) @ distribution / total) if total else 0.0
+
+    def sample(self, rng: Rng = random) -> Tuple[str, int, int]:
+        """
+        Draw how a fight ends, in constant time.
+
+        Args:
+            rng: Random number source
+
+        Returns:
+            (outcome, rounds, player health left) tuple
+        """
+        index = int(rng.random() * len(self._endings))
+        if rng.random() >= self._alias_probability[index]:
+            index = self._alias[index]
+        return self._endings[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the odds as plain data."""
+        return {
+            "weapon": self.weapon,
+            "zombie": self.zombie,
+            "zombie_health": self.zombie_health,
+            "health": self.health,
+            "flee_below": self.flee_below,
+            "probabilities": self.probabilities,
+            "mean_rounds": {outcome: self.mean_rounds(outcome) for outcome in OUTCOMES}
+        }
+
+    def __repr__(self) -> str:
+        odds = ", ".join(f"{outcome}={p:.3f}" for outcome, p in self.probabilities.items())
+        return f"CombatOdds({self.weapon!r} vs {self.zombie!r}, {odds})"
+
+
+def compute_odds(weapon: str, zombie: str, health: int, flee_below: float = 0,
+                 zombie_health: Optional[int] = None) -> CombatOdds:
+    """
+    Work out the exact outcome distribution of a fight, without caching.
+
+    Args:
+        weapon: Weapon the player attacks with
+        zombie: Zombie type
+        health: Player health at the start, in whole points
+        flee_below: Health at or below which the player runs away; 0 never runs
+        zombie_health: Zombie health at the start; full health if omitted
+
+    Returns:
+        Outcome distribution
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+        ValueError: If the weapon or zombie type is unknown, or health is not positive
+    """
+    if not HAVE_NUMPY:
+        raise RuntimeError("Combat odds need NumPy; install it with 'pip install numpy'")
+    weapon_info = item_catalog.weapons.get(weapon)
+    if weapon_info is None:
+        raise ValueError(f"Unknown weapon '{weapon}'")
+    stats = ZOMBIE_STATS.get(zombie)
+    if stats is None:
+        raise ValueError(f"Unknown zombie type '{zombie}'")
+    if health <= 0:
+        raise ValueError("Player health must be positive")
+    if zombie_health is None:
+        zombie_health = stats["health"]
+
+    accuracy = weapon_info["accuracy"]
+    hits = _damage_pmf(weapon_info["damage"], 3)
+    bites = _damage_pmf(stats["damage"], 5)
+    caught: Dict[int, float] = {}
+    for damage, probability in bites.items():
+        caught[max(1, damage // 2)] = caught.get(max(1, damage // 2), 0.0) + probability
+    escape = ESCAPE_CHANCE - (FAST_ZOMBIE_PENALTY if stats["speed"] > FAST_ZOMBIE_SPEED else 0)
+
+    # grid[z, h]: probability the fight is still on with the zombie at z and the player at h
+    grid = np.zeros((zombie_health + 1, health + 1))
+    grid[zombie_health, health] = 1.0
+    fleeing = np.arange(health + 1) <= flee_below
+    endings: Dict[Tuple[str, int, int], float] = {}
+
+    def end(outcome: str, rounds: int, by_health: Any):
+        for player_health in np.flatnonzero(by_health):
+            key = (outcome, rounds, int(player_health))
+            endings[key] = endings.get(key, 0.0) + float(by_health[player_health])
+
+    rounds = 0
+    while grid.any():
+        rounds += 1
+        flee = grid * fleeing
+        attack = grid - flee
+
+        # Running away: escape, or get caught for half damage
+        end(FLED, rounds, escape * flee.sum(axis=0))
+        standing = np.zeros_like(grid)
+        died = 0.0
+        for damage, probability in caught.items():
+            kept, dropped = _shift_down((1 - escape) * probability * flee, damage, axis=1)
+            standing += kept
+            died += dropped.sum()
+
+        # Attacking: a miss, or a hit that may kill the zombie
+        missed_or_hurt = (1 - accuracy) * attack
+        for damage, probability in hits.items():
+            kept, dropped = _shift_down(accuracy * probability * attack, damage, axis=0)
+            missed_or_hurt += kept
+            end(VICTORY, rounds, dropped)
+
+        # The zombie bites back if it is still standing
+        for damage, probability in bites.items():
+            kept, dropped = _shift_down(probability * missed_or_hurt, damage, axis=1)
+            standing += kept
+            died += dropped.sum()
+
+        if died:
+            endings[DEFEAT, rounds, 0] = died
+        grid = standing
+
+    return CombatOdds(weapon, zombie, zombie_health, health, flee_below, endings)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _cached_odds(weapon: str, zombie: str, health: int, flee_below: float, zombie_health: int) -> CombatOdds:
+    return compute_odds(weapon, zombie, health, flee_below, zombie_health)
+
+
+def get_odds(weapon: str, zombie: str, health: float, flee_below: float = 0,
+             zombie_health: Optional[int] = None) -> CombatOdds:
+    """
+    Get the outcome distribution of a fight, computing it on first use.
+
+    Damage is always whole, so a player health of 72.5 fares exactly
+    like 73; health is bucketed up to the next whole point.
+
+    Args:
+        weapon: Weapon the player attacks with
+        zombie: Zombie type
+        health: Player health at the start
+        flee_below: Health at or below which the player runs away; 0 never runs
+        zombie_health: Zombie health at the start; full health if omitted
+
+    Returns:
+        Outcome distribution, shared with other callers; do not modify it
+    """
+    if zombie_health is None and zombie in ZOMBIE_STATS:
+        zombie_health = ZOMBIE_STATS[zombie]["health"]
+    return _cached_odds(weapon, zombie, math.ceil(health), flee_below, zombie_health)
+
+
+def clear_cache():
+    """Forget cached odds, e.g. after editing the weapon or zombie tables."""
+    _cached_odds.cache_clear()
+
+
+def auto_resolve(zombie: Zombie, weapon: str, health: float, rng: Rng = random,
+                 flee_below: float = AUTO_FLEE_BELOW) -> Tuple[str, int, float]:
+    """
+    Decide a fight in one draw from its cached outcome distribution.
+
+    The zombie is left dead if the player wins; otherwise it is untouched.
+    The odds are for health bucketed up to a whole point, so the damage
+    drawn is taken off the real starting health, never adding any.
+
+    Args:
+        zombie: Zombie to fight
+        weapon: Weapon the player attacks with
+        health: Player health at the start
+        rng: Random number source
+        flee_below: Health at or below which the player runs away; 0 never runs
+
+    Returns:
+        (outcome, rounds, player health left) tuple
+    """
+    odds = get_odds(weapon, zombie.type, health, flee_below, zombie.health)
+    outcome, rounds, health_left = odds.sample(rng)
+    if health_left > 0:
+        health_left = min(health, health - (odds.health - health_left))
+    if outcome == VICTORY:
+        zombie.take_damage(zombie.health)
+    return outcome, rounds, health_left
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Show the exact outcome distribution of a fight.")
+    parser.add_argument("weapon", help="weapon the player attacks with")
+    parser.add_argument("zombie", help="zombie type")
+    parser.add_argument("--health", type=float, default=100, help="player health at the start")
+    parser.add_argument("--flee-below", type=float, default=0, help="health at which to run away; 0 never runs")
+    args = parser.parse_args(argv)
+
+    try:
+        odds = get_odds(args.weapon, args.zombie, args.health, args.flee_below)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for outcome in OUTCOMES:
+        print(f"{outcome:<8} {odds.probabilities[outcome] * 100:7.3f}%  "
+              f"mean rounds {odds.mean_rounds(outcome):5.2f}")
+    print("\nrounds  P(end)    P(win)")
+    overall = odds.rounds_distribution()
+    wins = odds.rounds_distribution(VICTORY)
+    for rounds in range(1, len(overall)):
+        if overall[rounds] >= 0.0005:
+            print(f"{rounds:>6}  {overall[rounds]:.4f}    {wins[rounds]:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
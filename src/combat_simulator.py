@@ -0,0 +1,308 @@
+"""
+Combat Simulator - Monte Carlo balance sweeps over the combat tables
+
+Runs many headless fights (see combat_system.resolve()) for every cell of
+a (weapon, zombie type, starting health) grid and reports, per cell, the
+win, flee and death rates with Wilson score intervals, and the mean
+damage taken and rounds per fight with normal-approximation intervals.
+
+The player attacks with the cell's weapon, falling back to fists when
+its ammunition runs out, and tries to run away once their health drops
+to --flee-below or lower. Cells are split into chunks of fights that
+run on a process pool, one worker per CPU core by default. Every chunk
+seeds its own random.Random from the seed and its position in the grid,
+so a sweep gives the same numbers however many workers run it.
+
+With --horde N, every fight is against a horde of N zombies of the
+cell's type instead of a single one (see horde.py; needs NumPy).
+
+Usage:
+    python combat_simulator.py --fights 20000
+    python combat_simulator.py --weapons axe pistol --zombies brute --health 100 50 --flee-below 0
+    python combat_simulator.py --weapons shotgun axe --zombies walker --horde 200
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from combat_system import DEFEAT, FLED, FLEE, VICTORY, ZOMBIE_STATS, Fight, Zombie, resolve
+from item_catalog import item_catalog
+
+# z for 95% confidence intervals
+Z_95 = 1.959964
+
+# Fights per task sent to a worker
+CHUNK_SIZE = 5000
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Get the Wilson score interval for a proportion.
+
+    Args:
+        successes: Number of successes
+        trials: Number of trials
+        z: Normal quantile for the confidence level
+
+    Returns:
+        (low, high) bounds; (0, 1) if there were no trials
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    # Exact at the ends, where rounding would otherwise leave the rate outside its own interval
+    low = 0.0 if successes == 0 else max(0.0, centre - margin)
+    high = 1.0 if successes == trials else min(1.0, centre + margin)
+    return low, high
+
+
+def mean_interval(total: float, total_sq: float, count: int, z: float = Z_95) -> Tuple[float, float, float]:
+    """
+    Get a mean and its normal-approximation confidence interval from running sums.
+
+    Args:
+        total: Sum of the values
+        total_sq: Sum of the squared values
+        count: Number of values
+        z: Normal quantile for the confidence level
+
+    Returns:
+        (mean, low, high) tuple
+    """
+    if count == 0:
+        return 0.0, 0.0, 0.0
+    mean = total / count
+    if count == 1:
+        return mean, mean, mean
+    variance = max(0.0, (total_sq - count * mean * mean) / (count - 1))
+    margin = z * math.sqrt(variance / count)
+    return mean, mean - margin, mean + margin
+
+
+class CellStats:
+    """Running totals for the fights of one grid cell."""
+
+    __slots__ = ("weapon", "zombie", "health", "fights", "wins", "fled", "deaths",
+                 "damage", "damage_sq", "rounds", "rounds_sq")
+
+    def __init__(self, weapon: str, zombie: str, health: float):
+        """
+        Args:
+            weapon: Weapon the player fights with
+            zombie: Zombie type
+            health: Player health at the start of each fight
+        """
+        self.weapon = weapon
+        self.zombie = zombie
+        self.health = health
+        self.fights = self.wins = self.fled = self.deaths = 0
+        self.damage = self.damage_sq = 0.0
+        self.rounds = self.rounds_sq = 0
+
+    def add(self, fight: Fight):
+        """Count a finished fight."""
+        self.fights += 1
+        if fight.outcome == VICTORY:
+            self.wins += 1
+        elif fight.outcome == FLED:
+            self.fled += 1
+        elif fight.outcome == DEFEAT:
+            self.deaths += 1
+        damage = self.health - fight.health
+        self.damage += damage
+        self.damage_sq += damage * damage
+        rounds = fight.rounds
+        self.rounds += rounds
+        self.rounds_sq += rounds * rounds
+
+    def merge(self, other: 'CellStats'):
+        """Add the totals of another chunk of the same cell."""
+        for name in ("fights", "wins", "fled", "deaths", "damage", "damage_sq", "rounds", "rounds_sq"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def key(self) -> Tuple[str, str, float]:
+        """(weapon, zombie, health) cell this counts."""
+        return self.weapon, self.zombie, self.health
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the cell as rates and means with 95% intervals."""
+        summary: Dict[str, Any] = {"weapon": self.weapon, "zombie": self.zombie, "health": self.health,
+                                   "fights": self.fights}
+        for name, count in (("win", self.wins), ("flee", self.fled), ("death", self.deaths)):
+            low, high = wilson_interval(count, self.fights)
+            summary[f"{name}_rate"] = [count / self.fights if self.fights else 0.0, low, high]
+        summary["damage_taken"] = list(mean_interval(self.damage, self.damage_sq, self.fights))
+        summary["rounds"] = list(mean_interval(self.rounds, self.rounds_sq, self.fights))
+        return summary
+
+
+def simulate_cell(weapon: str, zombie: str, health: float, fights: int, seed: Any = 0,
+                  flee_below: float = 25, ammo: int = 20, horde: int = 1) -> CellStats:
+    """
+    Fight one grid cell a number of times.
+
+    Args:
+        weapon: Weapon to attack with
+        zombie: Zombie type
+        health: Player health at the start of each fight
+        fights: Number of fights
+        seed: Seed for this run's random.Random
+        flee_below: Health at or below which the player runs away; 0 never runs
+        ammo: Rounds of the weapon's ammunition at the start of each fight
+        horde: Zombies per fight; more than one fights a Horde
+
+    Returns:
+        Totals for the fights
+    """
+    rng = random.Random(seed)
+    ammo_type = item_catalog.weapons[weapon].get("ammo_type")
+    ammunition = {ammo_type: ammo} if ammo_type is not None else None
+
+    def policy(fight: Fight) -> str:
+        if 0 < fight.health <= flee_below:
+            return FLEE
+        if ammo_type is not None and fight.ammunition[ammo_type] <= 0:
+            return "fists"
+        return weapon
+
+    stats = CellStats(weapon, zombie, health)
+    weapons = (weapon, "fists")
+    if horde > 1:
+        from horde import Horde, resolve_horde
+        import numpy as np
+        generator = np.random.default_rng(rng.getrandbits(64))
+        for _ in range(fights):
+            stats.add(resolve_horde(Horde([zombie] * horde), policy, generator, health, weapons, ammunition))
+        return stats
+    for _ in range(fights):
+        stats.add(resolve(Zombie(zombie), policy, rng, health, weapons, ammunition))
+    return stats
+
+
+def _run_chunk(task: Tuple[str, str, float, int, str, float, int, int]) -> CellStats:
+    """Process pool entry point: simulate_cell() with a tuple of arguments."""
+    return simulate_cell(*task)
+
+
+def simulate_grid(weapons: Sequence[str], zombies: Sequence[str], healths: Sequence[float], fights: int,
+                  seed: int = 0, flee_below: float = 25, ammo: int = 20, workers: Optional[int] = None,
+                  chunk_size: int = CHUNK_SIZE, horde: int = 1) -> List[CellStats]:
+    """
+    Simulate every (weapon, zombie, health) cell of a grid.
+
+    Args:
+        weapons: Weapons to try
+        zombies: Zombie types to fight
+        healths: Starting healths to try
+        fights: Fights per cell
+        seed: Seed for the whole sweep
+        flee_below: Health at or below which the player runs away; 0 never runs
+        ammo: Rounds of ammunition for weapons that use it
+        workers: Worker processes; one per CPU core if omitted, 1 runs in this process
+        chunk_size: Fights per task
+        horde: Zombies per fight; more than one fights a Horde
+
+    Returns:
+        Totals for each cell, in grid order
+
+    Raises:
+        ValueError: If a weapon or zombie type is unknown
+        RuntimeError: If hordes are asked for without NumPy installed
+    """
+    for weapon in weapons:
+        if weapon not in item_catalog.weapons:
+            raise ValueError(f"Unknown weapon '{weapon}'; choose from {', '.join(item_catalog.weapons)}")
+    for zombie in zombies:
+        if zombie not in ZOMBIE_STATS:
+            raise ValueError(f"Unknown zombie type '{zombie}'; choose from {', '.join(ZOMBIE_STATS)}")
+    if horde > 1:
+        from horde import HAVE_NUMPY
+        if not HAVE_NUMPY:
+            raise RuntimeError("Hordes need NumPy; install it with 'pip install numpy'")
+
+    cells = [CellStats(weapon, zombie, health) for weapon in weapons for zombie in zombies for health in healths]
+    tasks = []
+    for index, cell in enumerate(cells):
+        for start in range(0, fights, chunk_size):
+            tasks.append((cell.weapon, cell.zombie, cell.health, min(chunk_size, fights - start),
+                          f"{seed}/{index}/{start}", flee_below, ammo, horde))
+
+    by_key = {cell.key: cell for cell in cells}
+    if workers == 1:
+        for result in map(_run_chunk, tasks):
+            by_key[result.key].merge(result)
+        return cells
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_run_chunk, tasks):
+            by_key[result.key].merge(result)
+    return cells
+
+
+def format_table(cells: Sequence[CellStats]) -> str:
+    """Format cell results as a text table."""
+    lines = [f"{'weapon':<14} {'zombie':<8} {'hp':>5} {'win %':>19} {'flee %':>19} {'death %':>19} "
+             f"{'damage taken':>20} {'rounds':>17}"]
+
+    def rate(summary: List[float]) -> str:
+        value, low, high = summary
+        return f"{value * 100:5.1f} [{low * 100:4.1f}-{high * 100:5.1f}]"
+
+    def mean(summary: List[float]) -> str:
+        value, low, high = summary
+        return f"{value:6.1f} ±{(high - low) / 2:.2f}"
+
+    for cell in cells:
+        summary = cell.to_dict()
+        lines.append(f"{cell.weapon:<14} {cell.zombie:<8} {cell.health:>5g} {rate(summary['win_rate']):>19} "
+                     f"{rate(summary['flee_rate']):>19} {rate(summary['death_rate']):>19} "
+                     f"{mean(summary['damage_taken']):>20} {mean(summary['rounds']):>17}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simulate combat over a grid of weapons, zombies and health.")
+    parser.add_argument("--fights", type=int, default=10000, help="fights per cell")
+    parser.add_argument("--weapons", nargs="+", help="weapons to try (default: all)")
+    parser.add_argument("--zombies", nargs="+", help="zombie types to fight (default: all)")
+    parser.add_argument("--health", nargs="+", type=float, default=[100, 50], help="starting healths")
+    parser.add_argument("--flee-below", type=float, default=25, help="health at which to run away; 0 never runs")
+    parser.add_argument("--ammo", type=int, default=20, help="rounds for weapons that use ammunition")
+    parser.add_argument("--horde", type=int, default=1, help="zombies per fight (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU core)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        cells = simulate_grid(args.weapons or list(item_catalog.weapons), args.zombies or list(ZOMBIE_STATS),
+                              args.health, args.fights, args.seed, args.flee_below, args.ammo, args.workers,
+                              horde=args.horde)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump([cell.to_dict() for cell in cells], sys.stdout, indent=1)
+        print()
+    else:
+        print(format_table(cells))
+    total = sum(cell.fights for cell in cells)
+    print(f"{total} fights in {elapsed:.2f} s ({total / elapsed:,.0f} fights/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,23 @@ weapon usage, and damage calculations.
 """
 
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from game_state import game_state
+from item_catalog import item_catalog
+from world_index import get_world
+
+# Anything with random() and randint(), like random.Random or the random module
+Rng = Any
+
+
+# Stats for each zombie type
+ZOMBIE_STATS = {
+    "walker": {"health": 30, "damage": 15, "speed": 1, "description": "a slow-moving infected"},
+    "runner": {"health": 25, "damage": 20, "speed": 3, "description": "a fast infected"},
+    "brute": {"health": 60, "damage": 25, "speed": 1, "description": "a massive infected"},
+    "crawler": {"health": 15, "damage": 10, "speed": 2, "description": "a crawling infected"}
+}
 
 
 class Zombie:
@@ -16,14 +30,7 @@ class Zombie:
     
     def __init__(self, zombie_type: str = "walker"):
         """Initialize a zombie with type-specific stats."""
-        zombie_stats = {
-            "walker": {"health": 30, "damage": 15, "speed": 1, "description": "a slow-moving infected"},
-            "runner": {"health": 25, "damage": 20, "speed": 3, "description": "a fast infected"},
-            "brute": {"health": 60, "damage": 25, "speed": 1, "description": "a massive infected"},
-            "crawler": {"health": 15, "damage": 10, "speed": 2, "description": "a crawling infected"}
-        }
-        
-        stats = zombie_stats.get(zombie_type, zombie_stats["walker"])
+        stats = ZOMBIE_STATS.get(zombie_type, ZOMBIE_STATS["walker"])
         self.type = zombie_type
         self.health = stats["health"]
         self.max_health = stats["health"]
@@ -48,10 +55,13 @@ class Zombie:
             return True
         return False
     
-    def attack(self) -> int:
+    def attack(self, rng: Rng = random) -> int:
         """
         Zombie attacks, returns damage dealt.
         
+        Args:
+            rng: Random number source
+            
         Returns:
             Damage amount (with some randomness)
         """
@@ -60,25 +70,192 @@ class Zombie:
         
         # Add some randomness to damage
         base_damage = self.damage
-        variation = random.randint(-5, 5)
+        variation = rng.randint(-5, 5)
         return max(1, base_damage + variation)
 
 
+# Combat event kinds
+MISS = "miss"                # player missed
+HIT = "hit"                  # player hit, zombie still standing
+KILL = "kill"                # player killed the zombie
+NO_AMMO = "no_ammo"          # player's weapon is out of ammunition
+BITE = "bite"                # zombie hit the player
+ESCAPE = "escape"            # player got away
+CAUGHT = "caught"            # player failed to get away and was hit
+
+# Fight outcomes
+VICTORY = "victory"
+FLED = "fled"
+DEFEAT = "defeat"
+ABANDONED = "abandoned"      # the policy broke the fight off
+
+# Policy action for trying to run away; any other action is a weapon to attack with
+FLEE = "flee"
+
+# Active event effect that makes encounters likelier and turns them into hordes (see horde.py)
+HORDE_EFFECT = "increased_zombie_chance"
+HORDE_CHANCE_MULTIPLIER = 2
+HORDE_SIZE = (4, 10)
+
+# Menu action for settling the rest of a fight in one draw (see combat_odds.auto_resolve())
+AUTO_RESOLVE = "auto"
+
+# (kind, weapon, damage, zombie health, player health) after the event
+CombatEvent = Tuple[str, Optional[str], int, int, float]
+
+# Chance to escape, less the penalty against zombies faster than FAST_ZOMBIE_SPEED
+ESCAPE_CHANCE = 0.75
+FAST_ZOMBIE_PENALTY = 0.15
+FAST_ZOMBIE_SPEED = 2
+
+
+class Fight:
+    """State and log of one fight, as seen by a policy and returned by resolve()."""
+
+    __slots__ = ("zombie", "health", "weapons", "ammunition", "events", "outcome")
+
+    def __init__(self, zombie: Zombie, health: float, weapons: Sequence[str], ammunition: Dict[str, int]):
+        """
+        Args:
+            zombie: Zombie being fought; damaged as the fight goes on
+            health: Player health
+            weapons: Weapons the player can pick
+            ammunition: Rounds left by ammunition type; used up as the fight goes on
+        """
+        self.zombie = zombie
+        self.health = health
+        self.weapons = weapons
+        self.ammunition = ammunition
+        self.events: List[CombatEvent] = []
+        self.outcome: Optional[str] = None
+
+    @property
+    def rounds(self) -> int:
+        """Number of actions the player has taken."""
+        return sum(1 for event in self.events if event[0] != BITE)
+
+    def __repr__(self) -> str:
+        return f"Fight({self.zombie.type!r}, outcome={self.outcome!r}, health={self.health})"
+
+
+def _player_attack(fight: Fight, weapon: str, rng: Rng) -> CombatEvent:
+    """Resolve one player attack, updating the fight."""
+    zombie = fight.zombie
+    weapon_info = item_catalog.weapons.get(weapon)
+    if weapon_info is None:
+        raise ValueError(f"Unknown weapon: {weapon}")
+    ammo_type = weapon_info.get("ammo_type")
+    if ammo_type is not None and fight.ammunition.get(ammo_type, 0) <= 0:
+        event = (NO_AMMO, weapon, 0, zombie.health, fight.health)
+    elif rng.random() > weapon_info["accuracy"]:
+        event = (MISS, weapon, 0, zombie.health, fight.health)
+    else:
+        damage = max(1, weapon_info["damage"] + rng.randint(-3, 3))
+        killed = zombie.take_damage(damage)
+        if ammo_type is not None:
+            fight.ammunition[ammo_type] = max(0, fight.ammunition[ammo_type] - 1)
+        event = (KILL if killed else HIT, weapon, damage, zombie.health, fight.health)
+    fight.events.append(event)
+    return event
+
+
+def _zombie_attack(fight: Fight, rng: Rng, kind: str = BITE) -> CombatEvent:
+    """Resolve one zombie attack, updating the fight; CAUGHT attacks do half damage."""
+    damage = fight.zombie.attack(rng)
+    if kind == CAUGHT:
+        damage = max(1, damage // 2)
+    fight.health = max(0, fight.health - damage)
+    event = (kind, None, damage, fight.zombie.health, fight.health)
+    fight.events.append(event)
+    return event
+
+
+def resolve(zombie: Zombie, policy: Callable[[Fight], Optional[str]], rng: Rng = random,
+            health: float = 100, weapons: Sequence[str] = ("fists",),
+            ammunition: Optional[Dict[str, int]] = None) -> Fight:
+    """
+    Fight a zombie to the end without any input or output.
+
+    Each round the policy is called with the fight so far and returns
+    FLEE, a weapon to attack with, or None to break the fight off. An
+    attack that does not kill the zombie is answered by a zombie attack;
+    a failed escape is punished with a half-damage one.
+
+    Args:
+        zombie: Zombie to fight; damaged by the fight
+        policy: Picks the player's action each round
+        rng: Random number source, e.g. a random.Random; defaults to the random module
+        health: Player health at the start
+        weapons: Weapons the policy may pick
+        ammunition: Rounds by ammunition type; copied, see Fight.ammunition for what is left
+
+    Returns:
+        The finished fight, with its outcome, events and the player's health
+    """
+    fight = Fight(zombie, health, weapons, dict(ammunition) if ammunition else {})
+    while fight.outcome is None:
+        action = policy(fight)
+        if action is None:
+            fight.outcome = ABANDONED
+        elif action == FLEE:
+            escape_chance = ESCAPE_CHANCE
+            if zombie.speed > FAST_ZOMBIE_SPEED:
+                escape_chance -= FAST_ZOMBIE_PENALTY
+            if rng.random() < escape_chance:
+                fight.events.append((ESCAPE, None, 0, zombie.health, fight.health))
+                fight.outcome = FLED
+            elif _zombie_attack(fight, rng, CAUGHT)[4] <= 0:
+                fight.outcome = DEFEAT
+        elif _player_attack(fight, action, rng)[0] == KILL:
+            fight.outcome = VICTORY
+        elif _zombie_attack(fight, rng)[4] <= 0:
+            fight.outcome = DEFEAT
+    return fight
+
+
+def describe_event(event: CombatEvent, zombie: Zombie) -> str:
+    """
+    Get the combat log message for an event.
+
+    Args:
+        event: Event from Fight.events
+        zombie: Zombie the fight was against
+
+    Returns:
+        Message text
+    """
+    kind, weapon, damage, zombie_health, player_health = event
+    if kind in (BITE, CAUGHT):
+        if kind == BITE:
+            message = f"{zombie.description.capitalize()} attacks you for {damage} damage!"
+        else:
+            message = f"{zombie.description.capitalize()} catches you while running and deals {damage} damage!"
+        if player_health <= 0:
+            message += " You have been killed!"
+        elif player_health <= 20:
+            message += " You are badly injured!"
+        return message
+    if kind == ESCAPE:
+        return f"You successfully flee from {zombie.description}!"
+    weapon_info = item_catalog.weapons.get(weapon, {})
+    if kind == NO_AMMO:
+        return f"Cannot use {weapon}: No {weapon_info.get('ammo_type')} remaining"
+    if kind == MISS:
+        return f"You swing {weapon_info['description']} but miss {zombie.description}!"
+    if kind == KILL:
+        return (f"You strike {zombie.description} with {weapon_info['description']} "
+                f"for {damage} damage and kill it!")
+    return (f"You hit {zombie.description} with {weapon_info['description']} for {damage} damage. "
+            f"It has {zombie_health} health remaining.")
+
+
 class CombatSystem:
     """Handles all combat mechanics."""
     
     def __init__(self):
         """Initialize combat system."""
-        self.weapons = {
-            "fists": {"damage": 8, "accuracy": 0.7, "durability": 999, "description": "your bare hands"},
-            "hunting knife": {"damage": 15, "accuracy": 0.8, "durability": 50, "description": "a sharp hunting knife"},
-            "baseball bat": {"damage": 20, "accuracy": 0.75, "durability": 30, "description": "a wooden baseball bat"},
-            "pistol": {"damage": 35, "accuracy": 0.6, "durability": 100, "description": "a pistol", "ammo_type": "bullets"},
-            "hunting rifle": {"damage": 50, "accuracy": 0.8, "durability": 80, "description": "a hunting rifle", "ammo_type": "rifle_rounds"},
-            "shotgun": {"damage": 45, "accuracy": 0.7, "durability": 60, "description": "a shotgun", "ammo_type": "shells"},
-            "crowbar": {"damage": 18, "accuracy": 0.8, "durability": 80, "description": "a sturdy crowbar"},
-            "axe": {"damage": 25, "accuracy": 0.7, "durability": 40, "description": "a sharp axe"}
-        }
+        # Weapon stats by item name, from the item catalog
+        self.weapons = item_catalog.weapons
         
         self.ammunition = {
             "bullets": 0,
@@ -86,30 +263,27 @@ class CombatSystem:
             "shells": 0
         }
     
-    def check_for_zombie_encounter(self, location_name: str) -> Optional[Zombie]:
+    def check_for_zombie_encounter(self, location_name: str) -> Optional[Any]:
         """
         Check if a zombie encounter occurs at the current location.
         
+        While a horde warning is active, encounters are twice as likely
+        and, when NumPy is installed, are with a whole horde.
+        
         Args:
             location_name: Name of the current location
             
         Returns:
-            Zombie instance if encounter occurs, None otherwise
+            Zombie or Horde instance if encounter occurs, None otherwise
         """
-        # Get location data to check zombie chance
-        from Functions.read_location_data import read_location_data
-        locations = read_location_data()
-        
-        current_location = None
-        for location in locations:
-            if location["name"] == location_name:
-                current_location = location
-                break
-        
+        current_location = get_world().get(location_name)
         if not current_location:
             return None
         
         zombie_chance = current_location.get("zombie_chance", 0.1)
+        horde_warning = any(event.get("effect") == HORDE_EFFECT for event in game_state.active_events)
+        if horde_warning:
+            zombie_chance = min(1.0, zombie_chance * HORDE_CHANCE_MULTIPLIER)
         
         if random.random() < zombie_chance:
             # Determine zombie type based on location
@@ -121,6 +295,10 @@ class CombatSystem:
             elif "town square" in location_name.lower():
                 zombie_types.extend(["runner"])
             
+            from horde import HAVE_NUMPY, Horde
+            if horde_warning and HAVE_NUMPY:
+                return Horde([random.choice(zombie_types) for _ in range(random.randint(*HORDE_SIZE))])
+            
             zombie_type = random.choice(zombie_types)
             return Zombie(zombie_type)
         
@@ -184,42 +362,16 @@ class CombatSystem:
                 "zombie_killed": False
             }
         
-        weapon_info = self.weapons[weapon]
-        
-        # Check if attack hits
-        accuracy = weapon_info["accuracy"]
-        if random.random() > accuracy:
-            return {
-                "success": True,
-                "message": f"You swing {weapon_info['description']} but miss {zombie.description}!",
-                "damage": 0,
-                "zombie_killed": False
-            }
-        
-        # Calculate damage
-        base_damage = weapon_info["damage"]
-        damage_variation = random.randint(-3, 3)
-        total_damage = max(1, base_damage + damage_variation)
-        
-        # Apply damage to zombie
-        zombie_killed = zombie.take_damage(total_damage)
-        
-        # Use ammo if applicable
-        if "ammo_type" in weapon_info:
-            ammo_type = weapon_info["ammo_type"]
-            self.ammunition[ammo_type] = max(0, self.ammunition[ammo_type] - 1)
-        
-        # Create result message
+        # Shares self.ammunition, so the attack uses up a round
+        event = _player_attack(Fight(zombie, game_state.health, (weapon,), self.ammunition), weapon, random)
+        zombie_killed = event[0] == KILL
         if zombie_killed:
-            message = f"You strike {zombie.description} with {weapon_info['description']} for {total_damage} damage and kill it!"
             game_state.zombie_kills += 1
-        else:
-            message = f"You hit {zombie.description} with {weapon_info['description']} for {total_damage} damage. It has {zombie.health} health remaining."
         
         return {
             "success": True,
-            "message": message,
-            "damage": total_damage,
+            "message": describe_event(event, zombie),
+            "damage": event[2],
             "zombie_killed": zombie_killed
         }
     
@@ -236,159 +388,281 @@ class CombatSystem:
         if not zombie.is_alive:
             return {"damage": 0, "message": "The zombie is dead and cannot attack."}
         
-        damage = zombie.attack()
+        fight = Fight(zombie, game_state.health, (), self.ammunition)
+        event = _zombie_attack(fight, random)
         
         # Apply damage to player
-        game_state.health = max(0, game_state.health - damage)
-        
-        message = f"{zombie.description.capitalize()} attacks you for {damage} damage!"
-        
-        if game_state.health <= 0:
-            message += " You have been killed!"
-        elif game_state.health <= 20:
-            message += " You are badly injured!"
+        game_state.health = fight.health
         
         return {
-            "damage": damage,
-            "message": message
+            "damage": event[2],
+            "message": describe_event(event, zombie)
         }
     
-    def run_combat_encounter(self, zombie: Zombie) -> Dict:
+    def _show_event(self, event: CombatEvent, zombie: Zombie):
+        """Print a combat event during an interactive encounter."""
+        kind = event[0]
+        if kind == ESCAPE:
+            print("You successfully escape from the zombie!")
+        elif kind == CAUGHT:
+            print("You failed to escape! The zombie catches up to you.")
+            print(describe_event(event, zombie))
+        elif kind == BITE:
+            print(describe_event(event, zombie))
+        else:
+            print(f"\n{describe_event(event, zombie)}")
+    
+    def _prompt_action(self, fight: Any) -> Optional[str]:
         """
-        Run a complete combat encounter.
+        Ask the player what to do next; the policy for interactive encounters.
         
         Args:
-            zombie: The zombie to fight
+            fight: Fight or HordeFight so far
             
         Returns:
-            Dictionary with encounter results
+            FLEE, a weapon, or None if the player interrupted the fight
         """
-        print(f"\n🧟 ZOMBIE ENCOUNTER! 🧟")
-        print(f"You encounter {zombie.description}!")
-        print(f"Zombie Health: {zombie.health}/{zombie.max_health}")
-        print(f"Your Health: {game_state.health}/100")
-        
-        combat_log = []
-        
-        while zombie.is_alive and game_state.health > 0:
+        while True:
             print("\n" + "="*40)
             print("What do you want to do?")
             print("[1] Attack")
             print("[2] Try to run away")
             print("[3] Check inventory")
+            auto_resolve = isinstance(fight, Fight) and self._can_auto_resolve()
+            if auto_resolve:
+                print("[4] Auto-resolve fight")
             
             try:
                 choice = input("Enter your choice: ").strip()
                 
                 if choice == "1":
                     # Show available weapons
-                    weapons = self.get_available_weapons()
                     print("\nChoose your weapon:")
-                    for i, weapon in enumerate(weapons, 1):
+                    for i, weapon in enumerate(fight.weapons, 1):
                         weapon_info = self.get_weapon_info(weapon)
                         print(f"[{i}] {weapon} (Damage: {weapon_info['damage']}, Accuracy: {weapon_info['accuracy']*100:.0f}%)")
                     
                     try:
                         weapon_choice = int(input("Enter weapon number: ")) - 1
-                        if 0 <= weapon_choice < len(weapons):
-                            selected_weapon = weapons[weapon_choice]
-                            
-                            # Player attacks
-                            attack_result = self.attack_zombie(selected_weapon, zombie)
-                            print(f"\n{attack_result['message']}")
-                            combat_log.append(attack_result['message'])
-                            
-                            if attack_result['zombie_killed']:
-                                print("You have defeated the zombie!")
-                                # Gain combat experience for killing zombie
-                                game_state.gain_experience(15, "combat")
-                                return {
-                                    "victory": True,
-                                    "fled": False,
-                                    "combat_log": combat_log,
-                                    "result_message": f"🏆 VICTORY! You defeated {zombie.description}!"
-                                }
-                            
-                            # Zombie attacks back if still alive
-                            if zombie.is_alive:
-                                zombie_attack = self.zombie_attack_player(zombie)
-                                print(f"{zombie_attack['message']}")
-                                combat_log.append(zombie_attack['message'])
-                                
-                                if game_state.health <= 0:
-                                    print("You have been defeated!")
-                                    return {
-                                        "victory": False,
-                                        "fled": False,
-                                        "combat_log": combat_log,
-                                        "player_died": True,
-                                        "result_message": f"💀 DEFEAT! You were killed by {zombie.description}!"
-                                    }
-                        else:
-                            print("Invalid weapon choice!")
+                        if 0 <= weapon_choice < len(fight.weapons):
+                            return fight.weapons[weapon_choice]
+                        print("Invalid weapon choice!")
                     except ValueError:
                         print("Please enter a valid number!")
                 
                 elif choice == "2":
-                    # Try to run away
-                    escape_chance = 0.75  # Base 75% chance (increased from 60%)
-                    if zombie.speed > 2:
-                        escape_chance -= 0.15  # Reduced penalty for fast zombies
-
-                    if random.random() < escape_chance:
-                        print("You successfully escape from the zombie!")
-                        # Gain survival experience for successful escape
-                        game_state.gain_experience(8, "survival")
-                        return {
-                            "victory": False,
-                            "fled": True,
-                            "combat_log": combat_log,
-                            "result_message": f"🏃 ESCAPED! You successfully fled from {zombie.description}!"
-                        }
-                    else:
-                        print("You failed to escape! The zombie catches up to you.")
-                        # Zombie gets a reduced damage attack (since you're running)
-                        damage = max(1, zombie.attack() // 2)  # Half damage when running
-                        game_state.health = max(0, game_state.health - damage)
-
-                        message = f"{zombie.description.capitalize()} catches you while running and deals {damage} damage!"
-                        if game_state.health <= 0:
-                            message += " You have been killed!"
-                            print(f"{message}")
-                            combat_log.append(message)
-                            return {
-                                "victory": False,
-                                "fled": False,
-                                "combat_log": combat_log,
-                                "player_died": True,
-                                "result_message": f"💀 DEFEAT! You were killed while trying to escape from {zombie.description}!"
-                            }
-                        elif game_state.health <= 20:
-                            message += " You are badly injured!"
-
-                        print(f"{message}")
-                        combat_log.append(message)
+                    return FLEE
                 
                 elif choice == "3":
                     # Show inventory
                     from Functions.check_inventory import check_inventory
                     print(check_inventory(game_state.inventory))
                 
+                elif choice == "4" and auto_resolve:
+                    return AUTO_RESOLVE
+                
                 else:
-                    print("Invalid choice! Please choose 1, 2, or 3.")
+                    options = "1-4" if auto_resolve else "1-3"
+                    print(f"Invalid choice! Please choose {options}.")
                     
             except KeyboardInterrupt:
                 print("\nCombat interrupted!")
-                return {
-                    "victory": False,
-                    "fled": True,
-                    "combat_log": combat_log
-                }
+                return None
+    
+    @staticmethod
+    def _can_auto_resolve() -> bool:
+        """Check whether fights can be auto-resolved; the odds need NumPy."""
+        from combat_odds import HAVE_NUMPY
+        return HAVE_NUMPY
+    
+    def _auto_resolve(self, fight: Fight) -> str:
+        """
+        Settle the rest of a fight in one draw, with the best weapon that needs no ammunition.
+        
+        Args:
+            fight: Fight so far; its outcome and the player's health are set
+            
+        Returns:
+            Combat log message summarizing the fight
+        """
+        from combat_odds import AUTO_FLEE_BELOW, auto_resolve, get_odds
+        zombie = fight.zombie
+        melee = [weapon for weapon in fight.weapons if not self.get_weapon_info(weapon).get("ammo_type")]
+        weapon = max(melee or ["fists"], key=lambda w: get_odds(
+            w, zombie.type, fight.health, AUTO_FLEE_BELOW, zombie.health).probabilities[VICTORY])
+        fight.outcome, rounds, fight.health = auto_resolve(zombie, weapon, fight.health, random)
+        return f"You fight {zombie.description} with {weapon} for {rounds} rounds."
+    
+    def run_horde_encounter(self, horde: Any) -> Dict:
+        """
+        Run a complete fight against a horde, asking the player what to do each round.
+        
+        Args:
+            horde: The Horde to fight
+            
+        Returns:
+            Dictionary with encounter results, as from run_combat_encounter()
+        """
+        import numpy as np
+        from horde import describe_horde_event, resolve_horde
+        
+        counts = ", ".join(f"{count} {zombie_type}{'s' if count > 1 else ''}"
+                           for zombie_type, count in horde.counts().items())
+        print("\n🧟 HORDE ENCOUNTER! 🧟")
+        print(f"A horde of {len(horde)} zombies closes in: {counts}!")
+        print(f"Your Health: {game_state.health}/100")
+        
+        shown = 0
+        
+        def policy(fight) -> Optional[str]:
+            nonlocal shown
+            for event in fight.events[shown:]:
+                print(describe_horde_event(event))
+            shown = len(fight.events)
+            print(f"\nZombies standing: {fight.horde.remaining}/{len(fight.horde)}")
+            return self._prompt_action(fight)
+        
+        # Seeded from the random module, so seeding it repeats horde fights too
+        rng = np.random.default_rng(random.getrandbits(64))
+        fight = resolve_horde(horde, policy, rng, game_state.health,
+                              self.get_available_weapons(), self.ammunition)
+        for event in fight.events[shown:]:
+            print(describe_horde_event(event))
+        
+        # Apply the fight to the game state
+        if fight.health != game_state.health:
+            game_state.health = fight.health
+        self.ammunition.update(fight.ammunition)
+        if fight.kills:
+            game_state.zombie_kills += fight.kills
+            game_state.gain_experience(15 * fight.kills, "combat")
+        combat_log = [describe_horde_event(event) for event in fight.events]
+        
+        if fight.outcome == VICTORY:
+            print("You have wiped out the horde!")
+            return {
+                "victory": True,
+                "fled": False,
+                "combat_log": combat_log,
+                "result_message": f"🏆 VICTORY! You wiped out a horde of {len(horde)} zombies!"
+            }
+        
+        if fight.outcome == FLED:
+            game_state.gain_experience(8, "survival")
+            return {
+                "victory": False,
+                "fled": True,
+                "combat_log": combat_log,
+                "result_message": f"🏃 ESCAPED! You got away from the horde, killing {fight.kills}!"
+            }
+        
+        if fight.outcome == DEFEAT:
+            print("You have been defeated!")
+            return {
+                "victory": False,
+                "fled": False,
+                "combat_log": combat_log,
+                "player_died": True,
+                "result_message": f"💀 DEFEAT! You were overrun by a horde of {len(horde)} zombies!"
+            }
+        
+        # Interrupted by the player
+        return {
+            "victory": False,
+            "fled": True,
+            "combat_log": combat_log
+        }
+    
+    def run_combat_encounter(self, zombie: Any) -> Dict:
+        """
+        Run a complete combat encounter, asking the player what to do each round.
+        
+        The fight itself is decided by resolve(); this prints it as it goes
+        and applies the result to the game state.
+        
+        Args:
+            zombie: The zombie to fight, or a Horde (see run_horde_encounter())
+            
+        Returns:
+            Dictionary with encounter results
+        """
+        if not isinstance(zombie, Zombie):
+            return self.run_horde_encounter(zombie)
+        
+        print(f"\n🧟 ZOMBIE ENCOUNTER! 🧟")
+        print(f"You encounter {zombie.description}!")
+        print(f"Zombie Health: {zombie.health}/{zombie.max_health}")
+        print(f"Your Health: {game_state.health}/100")
+        
+        shown = 0
+        auto = False
+        
+        def policy(fight: Fight) -> Optional[str]:
+            nonlocal shown, auto
+            for event in fight.events[shown:]:
+                self._show_event(event, zombie)
+            shown = len(fight.events)
+            action = self._prompt_action(fight)
+            if action == AUTO_RESOLVE:
+                # Break off the round-by-round fight and settle it below
+                auto = True
+                return None
+            return action
+        
+        fight = resolve(zombie, policy, random, game_state.health, self.get_available_weapons(), self.ammunition)
+        for event in fight.events[shown:]:
+            self._show_event(event, zombie)
+        combat_log = [describe_event(event, zombie) for event in fight.events if event[0] != ESCAPE]
+        if auto:
+            summary = self._auto_resolve(fight)
+            print(f"\n{summary}")
+            combat_log.append(summary)
+        
+        # Apply the fight to the game state
+        if fight.health != game_state.health:
+            game_state.health = fight.health
+        self.ammunition.update(fight.ammunition)
+        
+        if fight.outcome == VICTORY:
+            print("You have defeated the zombie!")
+            game_state.zombie_kills += 1
+            # Gain combat experience for killing zombie
+            game_state.gain_experience(15, "combat")
+            return {
+                "victory": True,
+                "fled": False,
+                "combat_log": combat_log,
+                "result_message": f"🏆 VICTORY! You defeated {zombie.description}!"
+            }
+        
+        if fight.outcome == FLED:
+            # Gain survival experience for successful escape
+            game_state.gain_experience(8, "survival")
+            return {
+                "victory": False,
+                "fled": True,
+                "combat_log": combat_log,
+                "result_message": f"🏃 ESCAPED! You successfully fled from {zombie.description}!"
+            }
+        
+        if fight.outcome == DEFEAT:
+            if not auto and fight.events[-1][0] == CAUGHT:
+                result_message = f"💀 DEFEAT! You were killed while trying to escape from {zombie.description}!"
+            else:
+                print("You have been defeated!")
+                result_message = f"💀 DEFEAT! You were killed by {zombie.description}!"
+            return {
+                "victory": False,
+                "fled": False,
+                "combat_log": combat_log,
+                "player_died": True,
+                "result_message": result_message
+            }
         
-        # This shouldn't be reached, but just in case
+        # Interrupted by the player
         return {
-            "victory": zombie.is_alive == False,
-            "fled": False,
+            "victory": False,
+            "fled": True,
             "combat_log": combat_log
         }
 
@@ -7,22 +7,40 @@ action processing, and coordinates between different game systems.
 
 import os
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Tuple
 
+from action_dispatch import (BUY_GEAR, CLIMB_BELL_TOWER, DESCEND_TO_CEMETERY, INVENTORY, LOOK_AROUND,
+                             MOVE_LONG, MOVE_SHORT, REFUEL, REPAIR_VEHICLE, REST, SEARCH, USE_ITEM,
+                             action_table)
+from autosave import Autosaver
 from combat_system import combat_system
 from Functions.clear_screen import clear_screen
-from Functions.read_location_data import read_location_data
 from Functions.scroll_text_file import scroll_text_file
 from game_state import game_state
+from inventory import format_stack
+from item_catalog import item_catalog
+from location_graph import NO_NODE
+from loot_tables import loot_table
+from save_slots import SAVE_SUFFIX, SAVE_SUFFIXES, save_slots
+from save_store import SaveBackend
+from world_index import get_world
 
 
 class GameEngine:
     """Main game engine that handles the game loop and core mechanics."""
     
-    def __init__(self):
-        """Initialize the game engine."""
-        self.locations = read_location_data()
+    def __init__(self, autosaver: Optional[Autosaver] = None, saves: Optional[SaveBackend] = None):
+        """
+        Initialize the game engine.
+
+        Args:
+            autosaver: Background autosaver to tick once per turn, if any
+            saves: Save backend for the save and load menus; the save
+                files in the working directory if omitted
+        """
         self.running = True
+        self.autosaver = autosaver
+        self.saves = saves if saves is not None else save_slots
         self.last_encounter_result = None  # Store last encounter result for display
         self.commands = {
             'help': self.show_help,
@@ -33,6 +51,21 @@ class GameEngine:
             'quit': self.quit_game,
             'exit': self.quit_game
         }
+        # Handler IDs bound to world actions at load time (see action_dispatch.py)
+        self.action_handlers = {
+            LOOK_AROUND: lambda action: self.handle_look_around(),
+            MOVE_SHORT: lambda action: self.handle_move_short(),
+            MOVE_LONG: lambda action: self.handle_move_long(),
+            REPAIR_VEHICLE: lambda action: self.handle_repair_vehicle(),
+            INVENTORY: lambda action: self.show_inventory(),
+            SEARCH: lambda action: self.handle_search(action),
+            USE_ITEM: lambda action: self.handle_use_item(),
+            BUY_GEAR: lambda action: self.handle_buy_gear(),
+            REST: lambda action: self.handle_rest(),
+            REFUEL: lambda action: self.handle_refuel(),
+            CLIMB_BELL_TOWER: lambda action: self.handle_climb_bell_tower(),
+            DESCEND_TO_CEMETERY: lambda action: self.handle_descend_to_cemetery()
+        }
     
     def start_game(self):
         """Start the main game loop."""
@@ -46,6 +79,10 @@ class GameEngine:
                     self.handle_game_over(reason)
                     break
 
+                # Queue an autosave if one is due; written in the background
+                if self.autosaver is not None:
+                    self.autosaver.tick()
+
                 # Update survival stats
                 game_state.update_survival_stats()
 
@@ -126,7 +163,9 @@ class GameEngine:
         print()
 
         # Find current location data
-        location_data = self.get_location_data(game_state.current_location)
+        world = get_world()
+        world.activate(game_state.current_location)
+        location_data = world.get(game_state.current_location)
         if not location_data:
             print("Error: Location data not found!")
             return
@@ -149,12 +188,14 @@ class GameEngine:
         print()
         print("[0] Global Commands (status, inventory, save, load, help, quit)")
     
-    def get_location_data(self, location_name: str) -> Optional[Dict]:
+    @property
+    def locations(self) -> Tuple[Mapping, ...]:
+        """All locations in the shared world index."""
+        return get_world().locations
+
+    def get_location_data(self, location_name: str) -> Optional[Mapping]:
         """Get location data by name."""
-        for location in self.locations:
-            if location["name"] == location_name:
-                return location
-        return None
+        return get_world().get(location_name)
     
     def show_status_warnings(self):
         """Show warnings for low survival stats with visual indicators."""
@@ -320,46 +361,22 @@ class GameEngine:
     
     def execute_action(self, action: Dict):
         """Execute a specific action."""
-        action_name = action["name"].lower()
-
-        if "look around" in action_name:
-            self.handle_look_around()
-        elif "move" in action_name or "go" in action_name:
-            if "nearby" in action_name:
-                self.handle_move_short()
-            elif "distant" in action_name:
-                self.handle_move_long()
-            else:
-                self.handle_move_short()  # Default to short distance
-        elif "repair" in action_name and "vehicle" in action_name:
-            self.handle_repair_vehicle()
-        elif "travel" in action_name and "distant" in action_name:
-            self.handle_move_long()
-        elif "check your inventory" in action_name or action_name == "inventory":
-            self.show_inventory()
-        elif ("search" in action_name or "check" in action_name or
-              "explore" in action_name or "examine" in action_name):
-            self.handle_search(action)
-        elif "use" in action_name:
-            self.handle_use_item()
-        elif "buy" in action_name or "purchase" in action_name:
-            self.handle_buy_gear()
-        elif "rest" in action_name or "sleep" in action_name:
-            self.handle_rest()
-        elif "fuel" in action_name:
-            self.handle_refuel()
-        elif "climb" in action_name and "bell tower" in action_name:
-            self.handle_climb_bell_tower()
-        elif "descend" in action_name and "cemetery" in action_name:
-            self.handle_descend_to_cemetery()
-        else:
+        handler = self.action_handlers.get(action_table.resolve(action))
+        if handler is None:
             print(f"Action '{action['name']}' is not yet implemented.")
             input("Press Enter to continue...")
+            return
+        handler(action)
     
     def handle_look_around(self):
         """Handle looking around the current location."""
         from Functions.look_around import look_around
-        result = look_around(game_state.current_location, game_state.inventory)
+        # look_around appends finds to the list it is given; pick them up
+        # through add_item so they are weighed and journaled
+        carried = list(game_state.inventory)
+        result = look_around(game_state.current_location, carried)
+        for item in carried[len(game_state.inventory):]:
+            game_state.add_item(item)
         print(result)
         input("Press Enter to continue...")
     
@@ -371,23 +388,24 @@ class GameEngine:
             input("Press Enter to continue...")
             return
 
-        nearby_locations = location_data.get("nearby_short", []).copy()
+        graph = get_world().graph_for(game_state.current_location)
+        node = graph.id_of(game_state.current_location)
+        nearby_nodes = list(graph.neighbors_short(node))
 
         # Add discovered hidden locations that are accessible from current location
-        current_town = location_data.get("town", "")
-        for location in self.locations:
-            if (location.get("hidden", False) and
-                location["name"] in game_state.discovered_locations and
-                location.get("town", "") == current_town and
-                location["name"] not in nearby_locations):
-                nearby_locations.append(location["name"])
+        for hidden_node in graph.hidden_in_town(graph.town_of(node)):
+            if (graph.name_of(hidden_node) in game_state.discovered_locations and
+                hidden_node not in nearby_nodes):
+                nearby_nodes.append(hidden_node)
 
         # Also check if current location has a direct hidden_location connection
-        hidden_location = location_data.get("hidden_location")
-        if (hidden_location and
-            hidden_location in game_state.discovered_locations and
-            hidden_location not in nearby_locations):
-            nearby_locations.append(hidden_location)
+        hidden_node = graph.hidden_location[node]
+        if (hidden_node != NO_NODE and
+            graph.name_of(hidden_node) in game_state.discovered_locations and
+            hidden_node not in nearby_nodes):
+            nearby_nodes.append(hidden_node)
+
+        nearby_locations = [graph.name_of(nearby_node) for nearby_node in nearby_nodes]
 
         if not nearby_locations:
             print("There are no nearby locations you can walk to from here.")
@@ -399,14 +417,10 @@ class GameEngine:
         print("="*50)
         print("Where would you like to go?")
 
-        for i, location in enumerate(nearby_locations, 1):
+        for i, (nearby_node, location) in enumerate(zip(nearby_nodes, nearby_locations), 1):
             # Mark discovered hidden locations
-            if location in game_state.discovered_locations:
-                location_obj = self.get_location_data(location)
-                if location_obj and location_obj.get("hidden", False):
-                    print(f"[{i}] {location} 🗝️")
-                else:
-                    print(f"[{i}] {location}")
+            if graph.is_hidden(nearby_node) and location in game_state.discovered_locations:
+                print(f"[{i}] {location} 🗝️")
             else:
                 print(f"[{i}] {location}")
 
@@ -473,6 +487,9 @@ class GameEngine:
             elif 1 <= choice <= len(distant_locations):
                 new_location = distant_locations[choice - 1]
 
+                # Start loading the destination while the player decides
+                get_world().prefetch(new_location)
+
                 # Confirm the trip
                 print(f"\nTravel to {new_location}?")
                 print("This will permanently break down your vehicle!")
@@ -491,7 +508,7 @@ class GameEngine:
                     # Add new town to visited list
                     new_town = game_state.get_current_town()
                     if new_town not in game_state.towns_visited:
-                        game_state.towns_visited.append(new_town)
+                        game_state.add_town_visited(new_town)
                         print(f"\nWelcome to {new_town}! This is a new area to explore.")
 
                     print("You have arrived!")
@@ -596,18 +613,14 @@ class GameEngine:
             input("Press Enter to continue...")
             return
 
-        # Get action-specific search details
-        action_name = action["name"].lower() if action else "general search"
-        location_name = game_state.current_location.lower()
-
         print(f"\n🔍 {action['name'] if action else 'Searching the area'}...")
         print("="*50)
 
-        # Location-specific search results with rich descriptions
-        search_results = self.get_search_results(location_name, action_name)
+        # Location-specific search results with rich descriptions (see loot_tables.py)
+        search_results = loot_table.lookup(game_state.current_location, action)
 
         if search_results["description"]:
-            print(search_results["description"])
+            print(search_results["description"].replace("{location}", game_state.current_location))
 
         # Random chance of finding something
         success_chance = search_results.get("success_chance", 0.6)
@@ -615,13 +628,11 @@ class GameEngine:
             possible_items = search_results.get("items", location_data.get("items", []))
             if possible_items:
                 found_item = random.choice(possible_items)
-                weight = self.get_item_weight(found_item)
-
-                if game_state.add_item(found_item, weight):
+                if game_state.add_item(found_item):
                     print(f"\n✅ You found: {found_item}")
                     if search_results.get("item_description"):
                         print(f"   {search_results['item_description']}")
-                    game_state.discovered_items.add(found_item)
+                    game_state.discover_item(found_item)
 
                     # Check if this item unlocks a hidden location
                     self.check_for_hidden_location_unlock(found_item)
@@ -647,26 +658,29 @@ class GameEngine:
 
     def check_for_hidden_location_unlock(self, item: str):
         """Check if finding an item unlocks a hidden location."""
-        # Check all locations for hidden ones that require this item
-        for location in self.locations:
-            if (location.get("hidden", False) and
-                location.get("requires_item") == item and
-                location["name"] not in game_state.discovered_locations):
-
-                # Unlock the hidden location
-                game_state.discovered_locations.add(location["name"])
-                print(f"\n🗝️ DISCOVERY! The {item} unlocks access to: {location['name']}")
-                print("This location is now available for travel!")
-
-                # Add to nearby locations of the current area
-                current_town = self.get_location_data(game_state.current_location).get("town")
-                if location.get("town") == current_town:
-                    print(f"You can now access this location from nearby areas in {current_town}.")
+        world = get_world()
+        current_town = world.town_of(game_state.current_location)
+
+        for location_name in world.unlocked_by(item):
+            if location_name in game_state.discovered_locations:
+                continue
+
+            # Unlock the hidden location
+            game_state.discover_location(location_name)
+            print(f"\n🗝️ DISCOVERY! The {item} unlocks access to: {location_name}")
+            print("This location is now available for travel!")
+
+            # Add to nearby locations of the current area
+            if world.town_of(location_name) == current_town:
+                print(f"You can now access this location from nearby areas in {current_town}.")
 
     def check_dynamic_events(self):
         """Check and trigger dynamic events based on game state."""
         import random
 
+        # Timed events such as a horde warning last "duration" turns
+        game_state.count_down_events()
+
         # Reduce event cooldown
         if game_state.event_cooldown > 0:
             game_state.event_cooldown -= 1
@@ -765,172 +779,9 @@ class GameEngine:
             print("=" * 50)
             input("Press Enter to continue...")
 
-    def get_search_results(self, location_name: str, action_name: str) -> dict:
-        """Get detailed search results based on location and specific action."""
-
-        # Riverside locations
-        if "gas station" in location_name:
-            if "fuel" in action_name:
-                return {
-                    "description": "You check the fuel pumps and storage tanks. Most are empty, but you might find some residual fuel.",
-                    "items": ["motor oil", "diesel fuel", "gas can"],
-                    "success_chance": 0.4,
-                    "nothing_found": "The fuel systems are completely drained.",
-                    "item_description": "This could be useful for vehicles or generators."
-                }
-            elif "car" in action_name or "vehicle" in action_name:
-                return {
-                    "description": "You search through the abandoned vehicles in the parking lot. Keys dangle from ignitions, doors hang open.",
-                    "items": ["car battery", "spark plugs", "motor oil", "jumper cables", "road map", "sunglasses", "phone charger", "tire iron"],
-                    "success_chance": 0.8,
-                    "nothing_found": "The cars have been thoroughly picked over already.",
-                    "item_description": "Vehicle parts and supplies left behind in the chaos of evacuation."
-                }
-            else:
-                return {
-                    "description": "You search the convenience store area. Shelves are mostly empty, but there might be something in the back areas.",
-                    "items": ["energy drink", "flashlight", "batteries", "snack bar", "lighter", "crowbar"],
-                    "success_chance": 0.6
-                }
-
-        elif "sporting goods" in location_name:
-            if "weapon" in action_name:
-                return {
-                    "description": "You search the weapons section. Display cases are smashed, but some items might remain in the storage areas.",
-                    "items": ["hunting knife", "baseball bat", "crossbow bolts", "gun cleaning kit"],
-                    "success_chance": 0.5,
-                    "nothing_found": "The weapon displays have been completely cleaned out.",
-                    "item_description": "Could be useful for protection or hunting."
-                }
-            elif "camping" in action_name or "gear" in action_name:
-                return {
-                    "description": "You explore the camping and outdoor gear section. Tents are scattered, but useful equipment remains.",
-                    "items": ["sleeping bag", "camping backpack", "compass", "rope", "water purification tablets"],
-                    "success_chance": 0.8,
-                    "item_description": "Essential survival gear for the outdoors."
-                }
-            elif "storage" in action_name:
-                return {
-                    "description": "You check the employee storage room behind the counter. Boxes of inventory are stacked high.",
-                    "items": ["binoculars", "multi-tool", "emergency whistle", "camping stove", "fishing line"],
-                    "success_chance": 0.7,
-                    "item_description": "New inventory that never made it to the shelves."
-                }
-
-        elif "supermarket" in location_name:
-            if "pharmacy" in action_name:
-                return {
-                    "description": "You search the pharmacy section. Most prescription drugs are gone, but over-the-counter items remain.",
-                    "items": ["painkillers", "bandages", "antiseptic", "vitamins", "thermometer"],
-                    "success_chance": 0.6,
-                    "item_description": "Medical supplies that could save your life."
-                }
-            elif "storage" in action_name:
-                return {
-                    "description": "You explore the employee storage areas and loading dock. Pallets of goods sit unopened.",
-                    "items": ["canned food", "bottled water", "energy bars", "toilet paper", "soap"],
-                    "success_chance": 0.8,
-                    "item_description": "Supplies that were being restocked when everything went wrong."
-                }
-            elif "food" in action_name:
-                return {
-                    "description": "You search the food aisles. Most perishables are spoiled, but canned and packaged goods remain.",
-                    "items": ["canned food", "energy bar", "crackers", "peanut butter", "instant coffee"],
-                    "success_chance": 0.7,
-                    "item_description": "Non-perishable food that's still good to eat."
-                }
-
-        # Cemetery locations
-        elif "cemetery" in location_name:
-            if "church" in action_name:
-                return {
-                    "description": "You search the old church building. Dust motes dance in the colored light from stained glass windows.",
-                    "items": ["rusty church key", "holy water", "candles", "old bible"],
-                    "success_chance": 0.7,
-                    "nothing_found": "The church has been thoroughly searched already.",
-                    "item_description": "Religious artifacts and keys left behind by the congregation."
-                }
-            elif "mausoleum" in action_name:
-                return {
-                    "description": "You investigate the stone mausoleums. Heavy doors creak open to reveal dark chambers.",
-                    "items": ["rusty church key", "flowers", "jewelry", "coins"],
-                    "success_chance": 0.6,
-                    "nothing_found": "The burial chambers contain only dust and memories.",
-                    "item_description": "Items left by mourners and caretakers."
-                }
-            else:
-                return {
-                    "description": "You search among the weathered headstones and overgrown paths.",
-                    "items": ["rusty church key", "flowers", "candles", "holy water"],
-                    "success_chance": 0.5,
-                    "nothing_found": "The cemetery grounds have been picked clean.",
-                    "item_description": "Memorial items and forgotten belongings."
-                }
-
-        # Millbrook locations
-        elif "auto shop" in location_name:
-            if "car parts" in action_name or "parts" in action_name:
-                return {
-                    "description": "You search through the auto shop's parts inventory. Shelves are lined with automotive components.",
-                    "items": ["alternator", "radiator", "brake pads", "transmission fluid", "spark plugs", "car battery", "motor oil"],
-                    "success_chance": 0.9,
-                    "nothing_found": "The parts shelves have been completely cleaned out.",
-                    "item_description": "Professional automotive parts for vehicle repair."
-                }
-            elif "tool" in action_name:
-                return {
-                    "description": "You check the tool area. Wrenches, jacks, and diagnostic equipment are scattered about.",
-                    "items": ["wrench set", "car jack", "tire iron", "jumper cables", "diagnostic scanner"],
-                    "success_chance": 0.8,
-                    "item_description": "Professional automotive tools."
-                }
-            else:
-                return {
-                    "description": "You search the general auto shop area. Oil stains and scattered parts tell the story of interrupted work.",
-                    "items": ["motor oil", "brake fluid", "coolant", "air freshener", "shop rags", "spark plugs"],
-                    "success_chance": 0.7,
-                    "item_description": "Automotive fluids and supplies."
-                }
-
-        # Default search for any location
-        return {
-            "description": f"You search around {game_state.current_location}. The area shows signs of hasty evacuation.",
-            "items": ["coins", "keys", "newspaper", "pen", "tissues"],
-            "success_chance": 0.4,
-            "nothing_found": "You find only debris and signs of the chaos that occurred here.",
-            "failure_message": "Your search turns up nothing of value."
-        }
-
     def get_item_weight(self, item: str) -> float:
         """Get the weight of an item for inventory management."""
-        weights = {
-            # Light items
-            "coins": 0.1, "keys": 0.1, "pen": 0.1, "lighter": 0.1,
-            "painkillers": 0.2, "bandages": 0.2, "vitamins": 0.2,
-            "energy bar": 0.2, "crackers": 0.3, "batteries": 0.3,
-
-            # Medium items
-            "energy drink": 0.5, "water bottle": 0.5, "canned food": 0.6,
-            "flashlight": 0.7, "road map": 0.2, "newspaper": 0.1,
-            "first aid kit": 1.0, "rope": 1.2, "compass": 0.3,
-
-            # Heavy items
-            "hunting knife": 0.8, "baseball bat": 1.5, "sleeping bag": 2.0,
-            "camping backpack": 1.8, "car battery": 15.0, "motor oil": 2.0,
-            "jumper cables": 3.0, "tire iron": 2.5, "binoculars": 1.0,
-
-            # Car parts
-            "spark plugs": 0.5, "alternator": 8.0, "radiator": 12.0,
-            "brake pads": 3.0, "transmission fluid": 2.5, "brake fluid": 1.0,
-            "coolant": 2.0, "wrench set": 4.0, "car jack": 8.0,
-            "diagnostic scanner": 1.5, "shop rags": 0.3,
-
-            # Weapons
-            "crowbar": 2.0, "kitchen knife": 0.5, "meat cleaver": 1.0,
-            "police baton": 1.2, "tactical vest": 3.0, "scalpel": 0.3,
-            "hammer": 1.5, "pipe wrench": 2.0, "pistol": 1.0, "ammunition": 0.5
-        }
-        return weights.get(item, 1.0)  # Default 1kg for unknown items
+        return item_catalog.weight(item)
 
     def handle_use_item(self):
         """Handle using an item from inventory."""
@@ -939,14 +790,15 @@ class GameEngine:
             input("Press Enter to continue...")
             return
         
+        stacks = game_state.inventory.stacks()
         print("Which item do you want to use?")
-        for i, item in enumerate(game_state.inventory, 1):
-            print(f"[{i}] {item}")
+        for i, (item, count) in enumerate(stacks, 1):
+            print(f"[{i}] {format_stack(item, count)}")
         
         try:
             choice = int(input("Enter item number: "))
-            if 1 <= choice <= len(game_state.inventory):
-                item = game_state.inventory[choice - 1]
+            if 1 <= choice <= len(stacks):
+                item = stacks[choice - 1][0]
                 result = game_state.use_item(item)
                 print(result["message"])
             else:
@@ -1063,7 +915,7 @@ class GameEngine:
         # Add the bell tower to discovered locations
         bell_tower_name = "Riverside Church Bell Tower"
         if bell_tower_name not in game_state.discovered_locations:
-            game_state.discovered_locations.add(bell_tower_name)
+            game_state.discover_location(bell_tower_name)
             print(f"\n🏰 LOCATION DISCOVERED: {bell_tower_name}")
             print("This secure location is now available for travel!")
 
@@ -1224,16 +1076,17 @@ or see how long you can survive in this dangerous world.
         print("USE ITEM - Select an item to use:")
         print("="*50)
 
-        # Show numbered list of items
+        # Show numbered list of item stacks
+        stacks = game_state.inventory.stacks()
         usable_items = []
-        for i, item in enumerate(game_state.inventory, 1):
+        for i, (item, count) in enumerate(stacks, 1):
             # Check if item is usable (without actually using it)
             is_usable = self.can_use_item(item)
             if is_usable:
                 usable_items.append((i, item))
-                print(f"[{i}] {item}")
+                print(f"[{i}] {format_stack(item, count)}")
             else:
-                print(f"[{i}] {item} (not usable)")
+                print(f"[{i}] {format_stack(item, count)} (not usable)")
 
         if not usable_items:
             print("\nNo usable items in your inventory!")
@@ -1243,12 +1096,12 @@ or see how long you can survive in this dangerous world.
         print("[0] Cancel")
 
         try:
-            choice = int(input(f"\nEnter item number (1-{len(game_state.inventory)}): "))
+            choice = int(input(f"\nEnter item number (1-{len(stacks)}): "))
 
             if choice == 0:
                 return
-            elif 1 <= choice <= len(game_state.inventory):
-                item = game_state.inventory[choice - 1]
+            elif 1 <= choice <= len(stacks):
+                item = stacks[choice - 1][0]
 
                 # Confirm usage
                 print(f"\nUse {item}?")
@@ -1283,21 +1136,21 @@ or see how long you can survive in this dangerous world.
         print("ITEM DETAILS - Select an item to view:")
         print("="*50)
 
-        for i, item in enumerate(game_state.inventory, 1):
-            print(f"[{i}] {item}")
+        stacks = game_state.inventory.stacks()
+        for i, (item, count) in enumerate(stacks, 1):
+            print(f"[{i}] {format_stack(item, count)}")
 
         print("[0] Cancel")
 
         try:
-            choice = int(input(f"\nEnter item number (1-{len(game_state.inventory)}): "))
+            choice = int(input(f"\nEnter item number (1-{len(stacks)}): "))
 
             if choice == 0:
                 return
-            elif 1 <= choice <= len(game_state.inventory):
-                item = game_state.inventory[choice - 1]
+            elif 1 <= choice <= len(stacks):
+                item = stacks[choice - 1][0]
 
-                from Functions.check_inventory import get_item_info
-                info = get_item_info(item)
+                info = item_catalog.info(item)
 
                 print(f"\n" + "="*50)
                 print(f"📋 {item.upper()}")
@@ -1324,40 +1177,25 @@ or see how long you can survive in this dangerous world.
 
     def can_use_item(self, item: str) -> bool:
         """Check if an item can be used without actually using it."""
-        # Define usable items and their conditions
-        usable_items = {
-            "water bottle", "energy drink", "soda", "beer", "coffee",
-            "energy bar", "canned food", "mre", "granola bar", "beef jerky",
-            "first aid kit", "bandages", "painkillers", "antibiotics",
-            "can of motor oil"
-        }
-
-        return item.lower() in usable_items
+        return item_catalog.is_usable(item)
 
     def save_game(self):
         """Save the current game state with multiple slot support."""
-        import glob
-        import os
         from datetime import datetime
 
         print("\n" + "="*50)
         print("💾 SAVE GAME")
         print("="*50)
 
-        # Show existing save files
-        save_files = glob.glob("*.json")
-        save_files = [f for f in save_files if f.startswith("save_")]
+        # Show existing save files, from the save manifest
+        slots = self.saves.slots()
+        save_files = [slot.filename for slot in slots]
 
-        if save_files:
+        if slots:
             print("Existing save files:")
-            for i, save_file in enumerate(save_files, 1):
-                try:
-                    # Get file modification time
-                    mod_time = os.path.getmtime(save_file)
-                    mod_date = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
-                    print(f"[{i}] {save_file} (Last saved: {mod_date})")
-                except:
-                    print(f"[{i}] {save_file}")
+            for i, slot in enumerate(slots, 1):
+                mod_date = datetime.fromtimestamp(slot.mtime).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{i}] {slot.filename} (Last saved: {mod_date})")
             print()
 
         print("Save options:")
@@ -1376,12 +1214,15 @@ or see how long you can survive in this dangerous world.
             elif choice == "1":
                 filename = "save_quicksave.json"
             elif choice == "2":
-                custom_name = input("Enter save file name: ").strip()
+                custom_name = input("Enter save file name (end it with .sav for a compact save): ").strip()
                 if not custom_name:
                     print("Invalid filename!")
                     input("Press Enter to continue...")
                     return
-                filename = f"save_{custom_name}.json"
+                # A name ending in .sav picks the compact binary format
+                if not custom_name.endswith(SAVE_SUFFIXES):
+                    custom_name += SAVE_SUFFIX
+                filename = f"save_{custom_name}"
             elif choice == "3":
                 if not save_files:
                     print("No existing save files to overwrite!")
@@ -1405,7 +1246,7 @@ or see how long you can survive in this dangerous world.
                 return
 
             # Perform the save
-            if game_state.save_to_file(filename):
+            if self.saves.save(game_state, filename):
                 print(f"✅ Game saved successfully to {filename}")
                 print(f"📊 Game stats: Day {game_state.days_survived}, Turn {game_state.turn_count}")
                 print(f"📍 Location: {game_state.current_location}")
@@ -1421,49 +1262,29 @@ or see how long you can survive in this dangerous world.
 
     def load_game(self):
         """Load a saved game state with multiple slot support."""
-        import glob
-        import os
         from datetime import datetime
 
         print("\n" + "="*50)
         print("📁 LOAD GAME")
         print("="*50)
 
-        # Find all save files
-        save_files = glob.glob("*.json")
-        save_files = [f for f in save_files if f.startswith("save_")]
+        # Find all save files, from the save manifest
+        slots = self.saves.slots()
+        save_files = [slot.filename for slot in slots]
 
-        if not save_files:
+        if not slots:
             print("No save files found!")
             input("Press Enter to continue...")
             return
 
         print("Available save files:")
-        for i, save_file in enumerate(save_files, 1):
-            try:
-                # Get file modification time and size
-                mod_time = os.path.getmtime(save_file)
-                mod_date = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M:%S")
-                file_size = os.path.getsize(save_file)
-
-                # Try to get some game info from the file
-                try:
-                    import json
-                    with open(save_file, 'r') as f:
-                        save_data = json.load(f)
-                    location = save_data.get("current_location", "Unknown")
-                    days = save_data.get("days_survived", 0)
-                    health = save_data.get("health", 0)
-
-                    print(f"[{i}] {save_file}")
-                    print(f"    📅 Saved: {mod_date}")
-                    print(f"    📍 Location: {location}")
-                    print(f"    🗓️  Day {days}, ❤️  Health: {health}/100")
-                    print()
-                except:
-                    print(f"[{i}] {save_file} (Last saved: {mod_date})")
-            except:
-                print(f"[{i}] {save_file}")
+        for i, slot in enumerate(slots, 1):
+            mod_date = datetime.fromtimestamp(slot.mtime).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{i}] {slot.filename}")
+            print(f"    📅 Saved: {mod_date}")
+            print(f"    📍 Location: {slot.location}")
+            print(f"    🗓️  Day {slot.days}, ❤️  Health: {slot.health}/100")
+            print()
 
         print("[0] Cancel")
 
@@ -1485,7 +1306,7 @@ or see how long you can survive in this dangerous world.
                     return
 
                 # Perform the load
-                if game_state.load_from_file(filename):
+                if self.saves.load(game_state, filename):
                     print(f"✅ Game loaded successfully from {filename}")
                     print(f"📊 Loaded stats: Day {game_state.days_survived}, Turn {game_state.turn_count}")
                     print(f"📍 Current location: {game_state.current_location}")
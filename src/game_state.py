@@ -5,18 +5,102 @@ This module handles all game state including player stats, inventory, location,
 and game progression.
 """
 
-import json
 import os
+from array import array
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from inventory import Inventory
+from item_catalog import item_catalog
+from journal import JournaledField, journaled, record_assignment, unjournaled
+from save_codec import codec_for, dump_save, load_save
+from snapshots import GameSnapshot
+from symbols import SymbolField, SymbolList, SymbolListDict, SymbolSet
+
+# Survival stats, in their order in GameState's stats array
+STATS = ("health", "hunger", "thirst", "fatigue", "fuel")
+STAT_TYPECODE = 'd'
+
+# Items whose add_item weight has already been reported as ignored
+_weight_mismatches = set()
+
+
+class StatField:
+    """
+    Survival stat stored in its slot of the owner's `_stats` array.
+
+    Whole values read back as int, so a stat that was never changed by a
+    fractional amount still prints as "100" rather than "100.0".
+    """
+
+    def __init__(self, index: int):
+        """
+        Args:
+            index: Position of the stat in the stats array
+        """
+        self.index = index
+        self.name = STATS[index]
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Union[int, float]:
+        if obj is None:
+            return self
+        value = obj._stats[self.index]
+        return int(value) if value.is_integer() else value
+
+    def __set__(self, obj: Any, value: Union[int, float]):
+        obj._stats[self.index] = value
+        record_assignment(obj, self.name, value)
 
 
 class GameState:
     """Manages the complete game state including player data and world state."""
-    
+
+    # Fixed attribute layout: no per-instance __dict__, so one session costs
+    # only its slots and the containers they point to
+    __slots__ = (
+        "_stats", "_inventory", "_visited_locations", "_discovered_items", "_discovered_locations",
+        "_vehicle_parts_collected", "_vehicle_parts_installed", "_towns_visited", "_weapons", "_armor",
+        "_completed_events", "max_inventory_weight", "current_location", "_game_intro_shown",
+        "story_flags", "turn_count", "game_start_time", "_zombie_kills", "days_survived",
+        "survivor_rank", "experience_points", "skill_points", "skills", "active_events",
+        "_event_cooldown", "current_vehicle", "vehicle_condition", "_current_location_data", "_journal"
+    )
+
+    # Survival stats live in one typed array (see StatField)
+    health = StatField(STATS.index("health"))
+    hunger = StatField(STATS.index("hunger"))
+    thirst = StatField(STATS.index("thirst"))
+    fatigue = StatField(STATS.index("fatigue"))
+    fuel = StatField(STATS.index("fuel"))
+
+    # Item, location and event names are held as interned symbol IDs (see
+    # symbols.py); assigning a plain list, set or dict converts it. The
+    # inventory is a counted multiset that keeps its own total weight (see
+    # inventory.py).
+    inventory = SymbolField(Inventory)
+    visited_locations = SymbolField(SymbolSet)
+    discovered_items = SymbolField(SymbolSet)
+    discovered_locations = SymbolField(SymbolSet)
+    vehicle_parts_collected = SymbolField(SymbolList)
+    vehicle_parts_installed = SymbolField(SymbolListDict)
+    towns_visited = SymbolField(SymbolList)
+    weapons = SymbolField(SymbolList)
+    armor = SymbolField(SymbolList)
+    completed_events = SymbolField(SymbolSet)
+
+    # Fields the engine and combat system assign directly; assignments are
+    # journaled (see journal.py), as are calls to the @journaled methods
+    game_intro_shown = JournaledField()
+    zombie_kills = JournaledField()
+    event_cooldown = JournaledField()
+
     def __init__(self):
         """Initialize a new game state with default values."""
+        # Change journal, if one is attached (see journal.py)
+        self._journal = None
+
         # Player stats
+        self._stats = array(STAT_TYPECODE, [0.0] * len(STATS))
         self.health = 100
         self.hunger = 100
         self.thirst = 100
@@ -26,7 +110,6 @@ class GameState:
         # Player inventory
         self.inventory = ['can of motor oil']
         self.max_inventory_weight = 50
-        self.current_weight = 2  # motor oil weight
         
         # Location and world state
         self.current_location = "Abandoned Gas Station"
@@ -68,45 +151,67 @@ class GameState:
         self.vehicle_parts_collected = []
         self.vehicle_parts_installed = {}  # Track parts installed per location
         self.towns_visited = ["Riverside"]  # Starting town
+
+        # Data for the current location, set by the game engine when available
+        self._current_location_data: Optional[Dict[str, Any]] = None
         
-    def add_item(self, item: str, weight: float = 1.0) -> bool:
+    @property
+    def current_weight(self) -> float:
+        """Total weight carried, kept up to date by the inventory."""
+        return self.inventory.weight
+
+    @current_weight.setter
+    def current_weight(self, value: float):
+        self.inventory.weight = value
+
+    @journaled
+    def add_item(self, item: str, weight: Optional[float] = None) -> bool:
         """
         Add an item to inventory if there's space.
         
         Args:
             item: Name of the item to add
-            weight: Weight of the item
+            weight: Weight of the item; the catalog weight if omitted. Further
+                units of an item already carried weigh the same as the first,
+                whatever weight is passed.
             
         Returns:
             True if item was added, False if inventory is full
         """
+        if item in self.inventory:
+            carried = self.inventory.unit_weight(item)
+            if weight is not None and weight != carried and item not in _weight_mismatches:
+                # Only the first disagreement per item is reported
+                _weight_mismatches.add(item)
+                print(f"Warning: {item} is carried at {carried} per unit; ignoring weight {weight}")
+            weight = carried
+        elif weight is None:
+            weight = self.inventory.unit_weight(item)
         if self.current_weight + weight <= self.max_inventory_weight:
-            self.inventory.append(item)
-            self.current_weight += weight
+            self.inventory.add(item, weight=weight)
             return True
         return False
     
-    def remove_item(self, item: str, weight: float = 1.0) -> bool:
+    @journaled
+    def remove_item(self, item: str, weight: Optional[float] = None) -> bool:
         """
         Remove an item from inventory.
         
         Args:
             item: Name of the item to remove
-            weight: Weight of the item
+            weight: Ignored; an item is always removed at the weight it was
+                added with. Kept for existing callers.
             
         Returns:
             True if item was removed, False if item not found
         """
-        if item in self.inventory:
-            self.inventory.remove(item)
-            self.current_weight = max(0, self.current_weight - weight)
-            return True
-        return False
+        return self.inventory.discard(item) > 0
     
     def has_item(self, item: str) -> bool:
         """Check if player has a specific item."""
         return item in self.inventory
     
+    @journaled
     def use_item(self, item: str) -> Dict[str, Any]:
         """
         Use an item and apply its effects.
@@ -120,18 +225,10 @@ class GameState:
         if not self.has_item(item):
             return {"success": False, "message": f"You don't have {item}"}
         
-        # Define item effects
-        item_effects = {
-            "water bottle": {"thirst": 30, "weight": 0.5, "consumable": True},
-            "food rations": {"hunger": 40, "weight": 1.0, "consumable": True},
-            "first aid kit": {"health": 25, "weight": 2.0, "consumable": True},
-            "energy drink": {"fatigue": -20, "weight": 0.3, "consumable": True},
-        }
-        
-        if item not in item_effects:
+        effects = item_catalog.effects(item)
+        if effects is None:
             return {"success": False, "message": f"You can't use {item}"}
         
-        effects = item_effects[item]
         result_messages = []
         
         # Apply effects
@@ -161,7 +258,7 @@ class GameState:
         
         # Remove item if consumable
         if effects.get("consumable", False):
-            self.remove_item(item, effects.get("weight", 1.0))
+            self.remove_item(item)
             result_messages.append(f"Used {item}")
         
         return {
@@ -169,6 +266,7 @@ class GameState:
             "message": ". ".join(result_messages)
         }
     
+    @journaled
     def move_to_location(self, location: str) -> bool:
         """
         Move player to a new location.
@@ -184,6 +282,7 @@ class GameState:
         self.turn_count += 1
         return True
     
+    @journaled
     def update_survival_stats(self, turns_passed: int = 1):
         """Update hunger, thirst, and fatigue based on time passed."""
         # More balanced stat degradation
@@ -259,6 +358,9 @@ class GameState:
         """
         Check if player collapses from exhaustion and handle the consequences.
 
+        Not journaled as a call, since the outcome is random; the stat changes
+        and item loss it makes are journaled individually.
+
         Returns:
             Dictionary with collapse information and results
         """
@@ -288,7 +390,7 @@ class GameState:
         danger_chance = 0.6  # 60% base chance of danger
 
         # Check if we're in a relatively safe location
-        if hasattr(self, '_current_location_data'):
+        if self._current_location_data is not None:
             location_data = self._current_location_data
             if location_data.get("secure_location", False):
                 danger_chance = 0.1  # Very safe
@@ -323,7 +425,7 @@ class GameState:
             elif event_roll < 0.7:  # 30% chance of being robbed/losing items
                 if len(self.inventory) > 1:  # Don't take the last item
                     lost_item = random.choice([item for item in self.inventory if item != "can of motor oil"])
-                    self.remove_item(lost_item, self.get_item_weight(lost_item))
+                    self.remove_item(lost_item)
                     collapse_result["message"] = (
                         f"🎒 While unconscious, scavengers found you and took your {lost_item}. "
                         f"At least they left you alive..."
@@ -359,20 +461,9 @@ class GameState:
 
     def get_item_weight(self, item: str) -> float:
         """Get the weight of an item."""
-        # Basic weight system - can be expanded
-        weights = {
-            "can of motor oil": 2.0,
-            "water bottle": 1.0,
-            "food rations": 1.5,
-            "first aid kit": 2.0,
-            "rusty church key": 0.1,
-            "holy water": 0.5,
-            "candles": 0.3,
-            "old bible": 1.0,
-            "flowers": 0.1
-        }
-        return weights.get(item, 1.0)  # Default weight
+        return item_catalog.weight(item)
 
+    @journaled
     def gain_experience(self, amount: int, skill_type: str = None):
         """Gain experience points and potentially level up skills."""
         self.experience_points += amount
@@ -409,62 +500,185 @@ class GameState:
         if old_rank != self.survivor_rank:
             print(f"\n🏆 RANK UP! You are now a {self.survivor_rank}!")
 
+    @journaled
+    def discover_item(self, item: str):
+        """Record that an item has been found."""
+        self.discovered_items.add(item)
+
+    @journaled
+    def discover_location(self, location: str):
+        """Unlock a hidden location for travel."""
+        self.discovered_locations.add(location)
+
+    @journaled
+    def add_town_visited(self, town: str):
+        """Record the first visit to a town."""
+        if town not in self.towns_visited:
+            self.towns_visited.append(town)
+
+    @journaled
     def add_event(self, event_data: dict):
         """Add a dynamic event to the active events list."""
         self.active_events.append(event_data)
 
+    @journaled
     def remove_event(self, event_id: str):
         """Remove an event from active events."""
         self.active_events = [e for e in self.active_events if e.get("id") != event_id]
         self.completed_events.add(event_id)
 
-    def save_to_file(self, filename: str) -> bool:
+    @journaled
+    def count_down_events(self):
+        """Count timed events down by one turn, removing those whose duration has run out."""
+        events = []
+        expired = []
+        for event in self.active_events:
+            if "duration" in event:
+                # Replaced rather than edited, since snapshots share the dicts
+                event = dict(event, duration=event["duration"] - 1)
+                if event["duration"] <= 0:
+                    expired.append(event.get("id"))
+            events.append(event)
+        self.active_events = events
+        for event_id in expired:
+            self.remove_event(event_id)
+
+    def snapshot(self) -> GameSnapshot:
+        """Take an in-memory snapshot of the state (see snapshots.py)."""
+        return GameSnapshot(self)
+
+    def restore(self, snapshot: GameSnapshot):
+        """Put the state back as it was when a snapshot was taken."""
+        with unjournaled(self):
+            snapshot.restore(self)
+
+    def fork(self) -> 'GameState':
+        """
+        Make an independent copy of the state, e.g. for look-ahead simulation.
+
+        Unchanged parts stay shared with this state's snapshot until the copy
+        modifies them, so forking is cheap enough to do thousands of times.
+
+        Returns:
+            New GameState
+        """
+        return GameState.from_snapshot(GameSnapshot(self))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GameSnapshot) -> 'GameState':
+        """Create a state from a snapshot, without a journal attached."""
+        state = cls.__new__(cls)
+        state._journal = None
+        snapshot.restore(state)
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the state as plain JSON-compatible data, as written to save files.
+
+        Returns:
+            Save data dictionary
+        """
+        return {
+            "health": self.health,
+            "hunger": self.hunger,
+            "thirst": self.thirst,
+            "fatigue": self.fatigue,
+            "fuel": self.fuel,
+            "inventory": list(self.inventory),
+            "current_weight": self.current_weight,
+            "current_location": self.current_location,
+            "visited_locations": list(self.visited_locations),
+            "discovered_items": list(self.discovered_items),
+            "discovered_locations": list(self.discovered_locations),
+            "game_intro_shown": self.game_intro_shown,
+            "story_flags": self.story_flags,
+            "turn_count": self.turn_count,
+            "weapons": list(self.weapons),
+            "armor": list(self.armor),
+            "zombie_kills": self.zombie_kills,
+            "days_survived": self.days_survived,
+            "current_vehicle": self.current_vehicle,
+            "vehicle_condition": self.vehicle_condition,
+            "vehicle_parts_collected": list(self.vehicle_parts_collected),
+            "vehicle_parts_installed": self.vehicle_parts_installed.to_dict(),
+            "towns_visited": list(self.towns_visited),
+            "survivor_rank": self.survivor_rank,
+            "experience_points": self.experience_points,
+            "skill_points": self.skill_points,
+            "skills": self.skills,
+            "active_events": self.active_events,
+            "completed_events": list(self.completed_events),
+            "event_cooldown": self.event_cooldown,
+            "save_time": datetime.now().isoformat()
+        }
+
+    def from_dict(self, data: Dict[str, Any]):
+        """
+        Overwrite the state with save data from to_dict().
+
+        Args:
+            data: Save data dictionary
         """
-        Save game state to a JSON file.
+        self.health = data.get("health", 100)
+        self.hunger = data.get("hunger", 100)
+        self.thirst = data.get("thirst", 100)
+        self.fatigue = data.get("fatigue", 0)
+        self.fuel = data.get("fuel", 100)
+        # The weight is rebuilt from the catalog; saved "current_weight" is
+        # still written for older versions but no longer read
+        self.inventory = data.get("inventory", [])
+        self.current_location = data.get("current_location", "Abandoned Gas Station")
+        self.visited_locations = set(data.get("visited_locations", []))
+        self.discovered_items = set(data.get("discovered_items", []))
+        self.discovered_locations = set(data.get("discovered_locations", []))
+        self.game_intro_shown = data.get("game_intro_shown", False)
+        self.story_flags = data.get("story_flags", {})
+        self.turn_count = data.get("turn_count", 0)
+        self.weapons = data.get("weapons", [])
+        self.armor = data.get("armor", [])
+        self.zombie_kills = data.get("zombie_kills", 0)
+        self.days_survived = data.get("days_survived", 0)
+
+        # Load vehicle system data
+        self.current_vehicle = data.get("current_vehicle", None)
+        self.vehicle_condition = data.get("vehicle_condition", 0)
+        self.vehicle_parts_collected = data.get("vehicle_parts_collected", [])
+        self.vehicle_parts_installed = data.get("vehicle_parts_installed", {})
+        self.towns_visited = data.get("towns_visited", ["Riverside"])
+
+        # Load progression system data
+        self.survivor_rank = data.get("survivor_rank", "Rookie")
+        self.experience_points = data.get("experience_points", 0)
+        self.skill_points = data.get("skill_points", 0)
+        self.skills = data.get("skills", {"combat": 0, "scavenging": 0, "crafting": 0, "survival": 0})
+
+        # Load dynamic events data
+        self.active_events = data.get("active_events", [])
+        self.completed_events = data.get("completed_events", [])
+        self.event_cooldown = data.get("event_cooldown", 0)
+
+    def save_to_file(self, filename: str, codec: Optional[str] = None) -> bool:
+        """
+        Save game state to a file.
         
         Args:
             filename: Path to save file
+            codec: save_codec.JSON or save_codec.BINARY; picked from the
+                file suffix if omitted
             
         Returns:
             True if save was successful
         """
+        # Imported here: the Functions package imports this module
+        from Functions.atomic_write import atomic_write
+
         try:
-            save_data = {
-                "health": self.health,
-                "hunger": self.hunger,
-                "thirst": self.thirst,
-                "fatigue": self.fatigue,
-                "fuel": self.fuel,
-                "inventory": self.inventory,
-                "current_weight": self.current_weight,
-                "current_location": self.current_location,
-                "visited_locations": list(self.visited_locations),
-                "discovered_items": list(self.discovered_items),
-                "discovered_locations": list(self.discovered_locations),
-                "game_intro_shown": self.game_intro_shown,
-                "story_flags": self.story_flags,
-                "turn_count": self.turn_count,
-                "weapons": self.weapons,
-                "armor": self.armor,
-                "zombie_kills": self.zombie_kills,
-                "days_survived": self.days_survived,
-                "current_vehicle": self.current_vehicle,
-                "vehicle_condition": self.vehicle_condition,
-                "vehicle_parts_collected": self.vehicle_parts_collected,
-                "vehicle_parts_installed": self.vehicle_parts_installed,
-                "towns_visited": self.towns_visited,
-                "survivor_rank": self.survivor_rank,
-                "experience_points": self.experience_points,
-                "skill_points": self.skill_points,
-                "skills": self.skills,
-                "active_events": self.active_events,
-                "completed_events": list(self.completed_events),
-                "event_cooldown": self.event_cooldown,
-                "save_time": datetime.now().isoformat()
-            }
+            save_data = self.to_dict()
             
-            with open(filename, 'w') as f:
-                json.dump(save_data, f, indent=2)
+            # Write a temp file and rename it over the save, so a crash
+            # mid-write cannot leave a half-written slot
+            atomic_write(filename, dump_save(save_data, codec or codec_for(filename)))
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
@@ -472,7 +686,7 @@ class GameState:
     
     def load_from_file(self, filename: str) -> bool:
         """
-        Load game state from a JSON file.
+        Load game state from a save file, in either the JSON or binary format.
         
         Args:
             filename: Path to save file
@@ -484,52 +698,35 @@ class GameState:
             if not os.path.exists(filename):
                 return False
             
-            with open(filename, 'r') as f:
-                save_data = json.load(f)
+            with open(filename, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            print(f"Error loading game: {e}")
+            return False
+        return self.load_from_bytes(data)
+
+    def load_from_bytes(self, data: bytes) -> bool:
+        """
+        Load game state from the contents of a save, in either the JSON or binary format.
+
+        Args:
+            data: Save file contents
+
+        Returns:
+            True if load was successful
+        """
+        try:
+            save_data = load_save(data)
             
             # Restore all saved data
-            self.health = save_data.get("health", 100)
-            self.hunger = save_data.get("hunger", 100)
-            self.thirst = save_data.get("thirst", 100)
-            self.fatigue = save_data.get("fatigue", 0)
-            self.fuel = save_data.get("fuel", 100)
-            self.inventory = save_data.get("inventory", [])
-            self.current_weight = save_data.get("current_weight", 0)
-            self.current_location = save_data.get("current_location", "Abandoned Gas Station")
-            self.visited_locations = set(save_data.get("visited_locations", []))
-            self.discovered_items = set(save_data.get("discovered_items", []))
-            self.discovered_locations = set(save_data.get("discovered_locations", []))
-            self.game_intro_shown = save_data.get("game_intro_shown", False)
-            self.story_flags = save_data.get("story_flags", {})
-            self.turn_count = save_data.get("turn_count", 0)
-            self.weapons = save_data.get("weapons", [])
-            self.armor = save_data.get("armor", [])
-            self.zombie_kills = save_data.get("zombie_kills", 0)
-            self.days_survived = save_data.get("days_survived", 0)
-
-            # Load vehicle system data
-            self.current_vehicle = save_data.get("current_vehicle", None)
-            self.vehicle_condition = save_data.get("vehicle_condition", 0)
-            self.vehicle_parts_collected = save_data.get("vehicle_parts_collected", [])
-            self.vehicle_parts_installed = save_data.get("vehicle_parts_installed", {})
-            self.towns_visited = save_data.get("towns_visited", ["Riverside"])
-
-            # Load progression system data
-            self.survivor_rank = save_data.get("survivor_rank", "Rookie")
-            self.experience_points = save_data.get("experience_points", 0)
-            self.skill_points = save_data.get("skill_points", 0)
-            self.skills = save_data.get("skills", {"combat": 0, "scavenging": 0, "crafting": 0, "survival": 0})
-
-            # Load dynamic events data
-            self.active_events = save_data.get("active_events", [])
-            self.completed_events = set(save_data.get("completed_events", []))
-            self.event_cooldown = save_data.get("event_cooldown", 0)
-
+            with unjournaled(self):
+                self.from_dict(save_data)
             return True
         except Exception as e:
             print(f"Error loading game: {e}")
             return False
 
+    @journaled
     def repair_vehicle(self, parts_used: list, location: str) -> dict:
         """
         Attempt to repair a vehicle using collected parts.
@@ -574,7 +771,7 @@ class GameState:
 
         # Remove used parts from inventory and track installation
         for part in parts_consumed:
-            self.remove_item(part, 1.0)  # Assume 1kg weight for parts
+            self.remove_item(part)
             self.vehicle_parts_installed[location].append(part)
 
         # Set vehicle condition
@@ -592,6 +789,7 @@ class GameState:
         """Check if player can travel to distant locations."""
         return self.current_vehicle is not None and self.vehicle_condition >= 30
 
+    @journaled
     def use_vehicle_for_travel(self) -> dict:
         """Use vehicle for long-distance travel, potentially breaking it down."""
         if not self.can_travel_long_distance():
@@ -611,13 +809,12 @@ class GameState:
         return "Unknown"
 
     def get_location_data(self, location_name: str) -> dict:
-        """Get location data from the locations file."""
+        """Get location data from the shared world index."""
         try:
-            from Functions.read_location_data import read_location_data
-            locations = read_location_data()
-            for location in locations:
-                if location["name"] == location_name:
-                    return location
+            from world_index import get_world
+            location = get_world().get(location_name)
+            if location is not None:
+                return location
         except Exception:
             pass
         return {}
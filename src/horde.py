@@ -0,0 +1,314 @@
+"""
+Horde - Fights against many zombies at once
+
+A Zombie is one Python object per zombie, which is fine for the one-on-one
+fights of combat_system.resolve() but slow once a fight has hundreds of
+them. A Horde keeps its zombies as a structure of arrays instead: one
+NumPy array each for type, health, damage, speed and an alive flag,
+indexed by zombie and ordered fastest first. Every step of a round is a
+batched operation over those arrays:
+
+    targeting     the player attacks the weakest of the living zombies at
+                  the front of the horde (the first HORDE_FRONT still alive)
+    area damage   weapons with an "area" stat, like the shotgun, also hit
+                  the next area - 1 living zombies for half damage
+    attack phase  the zombies at the front all bite at once; a player
+                  caught running away takes half damage from each
+
+resolve_horde() plays a horde fight out the way resolve() plays a single
+one, with a policy picking each action, and returns a HordeFight with
+the outcome, health, ammunition and rounds the combat simulator reads.
+A round against hundreds of zombies takes microseconds.
+
+Randomness comes from a numpy.random.Generator, which draws the damage
+of a whole volley in one call. NumPy is an optional dependency; without
+it, HAVE_NUMPY is False and encounters are always with single zombies.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from combat_system import (ABANDONED, BITE, CAUGHT, DEFEAT, ESCAPE, ESCAPE_CHANCE, FAST_ZOMBIE_PENALTY,
+                           FAST_ZOMBIE_SPEED, FLED, FLEE, HIT, KILL, MISS, NO_AMMO, VICTORY, ZOMBIE_STATS)
+from item_catalog import item_catalog
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+# Zombie types, in the order of Horde.types codes
+ZOMBIE_TYPES = tuple(ZOMBIE_STATS)
+
+# Living zombies at the front of the horde, which the player can reach and which bite back
+HORDE_FRONT = 2
+
+# Share of weapon damage dealt to the other zombies caught by an area attack
+AREA_DAMAGE = 0.5
+
+# numpy.random.Generator
+Generator = Any
+
+# (kind, weapon, damage, kills, zombies left, player health) after the event;
+# damage is the total over every zombie hit or biting
+HordeEvent = Tuple[str, Optional[str], int, int, int, float]
+
+if HAVE_NUMPY:
+    # Stats by type code
+    _TYPE_HEALTH = np.array([ZOMBIE_STATS[t]["health"] for t in ZOMBIE_TYPES], dtype=np.int32)
+    _TYPE_DAMAGE = np.array([ZOMBIE_STATS[t]["damage"] for t in ZOMBIE_TYPES], dtype=np.int32)
+    _TYPE_SPEED = np.array([ZOMBIE_STATS[t]["speed"] for t in ZOMBIE_TYPES], dtype=np.int32)
+
+
+class Horde:
+    """A group of zombies stored as parallel arrays, ordered fastest first."""
+
+    __slots__ = ("types", "health", "max_health", "damage", "speed", "alive", "remaining")
+
+    def __init__(self, zombie_types: Sequence[str]):
+        """
+        Args:
+            zombie_types: Type of each zombie
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+            ValueError: If there are no zombies or a type is unknown
+        """
+        if not HAVE_NUMPY:
+            raise RuntimeError("Hordes need NumPy; install it with 'pip install numpy'")
+        if not zombie_types:
+            raise ValueError("A horde needs at least one zombie")
+        try:
+            codes = np.array([ZOMBIE_TYPES.index(t) for t in zombie_types], dtype=np.int8)
+        except ValueError:
+            unknown = next(t for t in zombie_types if t not in ZOMBIE_STATS)
+            raise ValueError(f"Unknown zombie type '{unknown}'") from None
+        # The fastest zombies reach the player first
+        self.types = codes[np.argsort(-_TYPE_SPEED[codes], kind="stable")]
+        self.health = _TYPE_HEALTH[self.types]
+        self.max_health = self.health.copy()
+        self.damage = _TYPE_DAMAGE[self.types]
+        self.speed = _TYPE_SPEED[self.types]
+        self.alive = np.ones(len(self.types), dtype=bool)
+        # Number of zombies still standing, kept up to date by take_damage()
+        self.remaining = len(self.types)
+
+    @classmethod
+    def random(cls, size: int, zombie_types: Sequence[str], rng: Generator) -> 'Horde':
+        """
+        Make a horde of zombies of random types.
+
+        Args:
+            size: Number of zombies
+            zombie_types: Types to pick from, equally likely
+            rng: Random number source
+
+        Returns:
+            New horde
+        """
+        return cls([zombie_types[i] for i in rng.integers(0, len(zombie_types), size)])
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def counts(self, living_only: bool = True) -> Dict[str, int]:
+        """Get the number of zombies of each type, the living ones only by default."""
+        types = self.types[self.alive] if living_only else self.types
+        counts = np.bincount(types, minlength=len(ZOMBIE_TYPES))
+        return {t: int(n) for t, n in zip(ZOMBIE_TYPES, counts) if n}
+
+    def front(self) -> Any:
+        """Get the indices of the living zombies the player can reach and that can bite."""
+        return self.alive.nonzero()[0][:HORDE_FRONT]
+
+    def target(self) -> int:
+        """Get the index of the zombie the player attacks: the weakest at the front."""
+        front = self.front()
+        return int(front[np.argmin(self.health[front])])
+
+    def take_damage(self, indices: Any, damage: Any) -> int:
+        """
+        Damage zombies.
+
+        Args:
+            indices: Indices of living zombies
+            damage: Damage to each
+
+        Returns:
+            Number of zombies killed
+        """
+        health = np.maximum(0, self.health[indices] - damage)
+        self.health[indices] = health
+        killed = indices[health <= 0]
+        self.alive[killed] = False
+        self.remaining -= len(killed)
+        return len(killed)
+
+    def attack(self, rng: Generator, halved: bool = False) -> int:
+        """
+        Let the zombies at the front bite the player.
+
+        Args:
+            rng: Random number source
+            halved: Whether each bite does half damage, as when catching a fleeing player
+
+        Returns:
+            Total damage dealt
+        """
+        front = self.front()
+        bites = np.maximum(1, self.damage[front] + rng.integers(-5, 6, len(front)))
+        if halved:
+            bites = np.maximum(1, bites // 2)
+        return int(bites.sum())
+
+    def escape_chance(self) -> float:
+        """Get the chance of running away, which the fastest living zombie decides."""
+        if self.speed[self.alive].max() > FAST_ZOMBIE_SPEED:
+            return ESCAPE_CHANCE - FAST_ZOMBIE_PENALTY
+        return ESCAPE_CHANCE
+
+    def __repr__(self) -> str:
+        return f"Horde({self.remaining}/{len(self)} standing, {self.counts()})"
+
+
+class HordeFight:
+    """State and log of one horde fight, as seen by a policy and returned by resolve_horde()."""
+
+    __slots__ = ("horde", "health", "weapons", "ammunition", "events", "outcome", "kills")
+
+    def __init__(self, horde: Horde, health: float, weapons: Sequence[str], ammunition: Dict[str, int]):
+        """
+        Args:
+            horde: Zombies being fought; damaged as the fight goes on
+            health: Player health
+            weapons: Weapons the player can pick
+            ammunition: Rounds left by ammunition type; used up as the fight goes on
+        """
+        self.horde = horde
+        self.health = health
+        self.weapons = weapons
+        self.ammunition = ammunition
+        self.events: List[HordeEvent] = []
+        self.outcome: Optional[str] = None
+        self.kills = 0
+
+    @property
+    def rounds(self) -> int:
+        """Number of actions the player has taken."""
+        return sum(1 for event in self.events if event[0] != BITE)
+
+    def __repr__(self) -> str:
+        return f"HordeFight({self.horde!r}, outcome={self.outcome!r}, health={self.health})"
+
+
+def _player_attack(fight: HordeFight, weapon: str, rng: Generator) -> HordeEvent:
+    """Resolve one player attack on the horde, updating the fight."""
+    horde = fight.horde
+    weapon_info = item_catalog.weapons.get(weapon)
+    if weapon_info is None:
+        raise ValueError(f"Unknown weapon: {weapon}")
+    ammo_type = weapon_info.get("ammo_type")
+    if ammo_type is not None and fight.ammunition.get(ammo_type, 0) <= 0:
+        event = (NO_AMMO, weapon, 0, 0, horde.remaining, fight.health)
+    elif rng.random() > weapon_info["accuracy"]:
+        event = (MISS, weapon, 0, 0, horde.remaining, fight.health)
+    else:
+        target = horde.target()
+        hit = np.array([target])
+        area = weapon_info.get("area", 1)
+        if area > 1:
+            living = horde.alive.nonzero()[0]
+            hit = np.concatenate((hit, living[living != target][:area - 1]))
+        damage = np.maximum(1, weapon_info["damage"] + rng.integers(-3, 4, len(hit)))
+        damage[1:] = np.maximum(1, (damage[1:] * AREA_DAMAGE).astype(damage.dtype))
+        kills = horde.take_damage(hit, damage)
+        fight.kills += kills
+        if ammo_type is not None:
+            fight.ammunition[ammo_type] = max(0, fight.ammunition[ammo_type] - 1)
+        event = (KILL if kills else HIT, weapon, int(damage.sum()), kills, horde.remaining, fight.health)
+    fight.events.append(event)
+    return event
+
+
+def _horde_attack(fight: HordeFight, rng: Generator, kind: str = BITE) -> HordeEvent:
+    """Resolve the horde's attack phase, updating the fight; CAUGHT bites do half damage."""
+    damage = fight.horde.attack(rng, halved=kind == CAUGHT)
+    fight.health = max(0, fight.health - damage)
+    event = (kind, None, damage, 0, fight.horde.remaining, fight.health)
+    fight.events.append(event)
+    return event
+
+
+def resolve_horde(horde: Horde, policy: Callable[[HordeFight], Optional[str]], rng: Generator,
+                  health: float = 100, weapons: Sequence[str] = ("fists",),
+                  ammunition: Optional[Dict[str, int]] = None) -> HordeFight:
+    """
+    Fight a horde to the end without any input or output.
+
+    Each round the policy is called with the fight so far and returns
+    FLEE, a weapon to attack with, or None to break the fight off. Unless
+    the attack leaves no zombie standing, the front of the horde bites
+    back; a failed escape is punished with half-damage bites.
+
+    Args:
+        horde: Zombies to fight; damaged by the fight
+        policy: Picks the player's action each round
+        rng: Random number source, a numpy.random.Generator
+        health: Player health at the start
+        weapons: Weapons the policy may pick
+        ammunition: Rounds by ammunition type; copied, see HordeFight.ammunition for what is left
+
+    Returns:
+        The finished fight, with its outcome, events and the player's health
+    """
+    fight = HordeFight(horde, health, weapons, dict(ammunition) if ammunition else {})
+    while fight.outcome is None:
+        action = policy(fight)
+        if action is None:
+            fight.outcome = ABANDONED
+        elif action == FLEE:
+            if rng.random() < horde.escape_chance():
+                fight.events.append((ESCAPE, None, 0, 0, horde.remaining, fight.health))
+                fight.outcome = FLED
+            elif _horde_attack(fight, rng, CAUGHT)[5] <= 0:
+                fight.outcome = DEFEAT
+        elif _player_attack(fight, action, rng)[4] == 0:
+            fight.outcome = VICTORY
+        elif _horde_attack(fight, rng)[5] <= 0:
+            fight.outcome = DEFEAT
+    return fight
+
+
+def describe_horde_event(event: HordeEvent) -> str:
+    """
+    Get the combat log message for a horde fight event.
+
+    Args:
+        event: Event from HordeFight.events
+
+    Returns:
+        Message text
+    """
+    kind, weapon, damage, kills, remaining, player_health = event
+    if kind in (BITE, CAUGHT):
+        if kind == BITE:
+            message = f"The horde claws at you for {damage} damage!"
+        else:
+            message = f"The horde catches you while running and deals {damage} damage!"
+        if player_health <= 0:
+            message += " You have been killed!"
+        elif player_health <= 20:
+            message += " You are badly injured!"
+        return message
+    if kind == ESCAPE:
+        return "You break away from the horde!"
+    weapon_info = item_catalog.weapons.get(weapon, {})
+    if kind == NO_AMMO:
+        return f"Cannot use {weapon}: No {weapon_info.get('ammo_type')} remaining"
+    if kind == MISS:
+        return f"You swing {weapon_info['description']} but hit nothing!"
+    message = f"You hit the horde with {weapon_info['description']} for {damage} damage"
+    if kills:
+        message += f", killing {kills}" if kills > 1 else ", killing one"
+    return f"{message}. {remaining} zombie{'' if remaining == 1 else 's'} remaining."
@@ -0,0 +1,219 @@
+"""
+Inventory - Counted multiset of carried items
+
+This module keeps the player's items as one stack per item name, with a
+count and the weight of one unit, and maintains the total weight as items
+come and go. Adding, removing and checking for an item are O(1), stacks
+stay in the order they were first picked up, and the total weight can no
+longer drift because an item is always removed at the weight it was added
+with. Iterating still yields one entry per unit, so code and save files
+that treat the inventory as a list of names keep working.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from item_catalog import ItemCatalog, item_catalog
+from symbols import SymbolTable, symbols
+
+# Immutable copy of an inventory: ((symbol, count, unit weight), ...), item weight, adjustment
+FrozenInventory = Tuple[Tuple[Tuple[int, int, float], ...], float, float]
+
+
+def format_stack(item: str, count: int) -> str:
+    """Format an item stack for menus, e.g. "bandages x3"."""
+    return item if count == 1 else f"{item} x{count}"
+
+
+class Inventory:
+    """Item stacks with cached counts and total weight."""
+
+    __slots__ = ("_catalog", "_table", "_stacks", "_count", "_weight", "_adjustment", "_version",
+                 "_frozen", "_frozen_version")
+
+    def __init__(self, items: Iterable[str] = (), catalog: ItemCatalog = item_catalog,
+                 table: SymbolTable = symbols):
+        """
+        Create an inventory.
+
+        Args:
+            items: Item names to start with, one entry per unit (as in a save file)
+            catalog: Item catalog that supplies unit weights
+            table: Symbol table that item names are interned in
+        """
+        self._catalog = catalog
+        self._table = table
+        # Stacks by symbol ID, in pickup order: [count, unit weight]
+        self._stacks: Dict[int, List[float]] = {}
+        self._count = 0
+        self._weight = 0.0
+        self._adjustment = 0.0
+        self._version = 0
+        self._frozen: Optional[FrozenInventory] = None
+        self._frozen_version = -1
+        for item in items:
+            self.add(item)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every change, for caching views of the inventory."""
+        return self._version
+
+    @property
+    def weight(self) -> float:
+        """Total weight of everything carried."""
+        return self._weight + self._adjustment
+
+    @weight.setter
+    def weight(self, value: float):
+        """
+        Override the total weight.
+
+        Kept for callers that used to track the weight by hand; the
+        difference from the carried items' weight is kept as an adjustment.
+        """
+        self._adjustment = value - self._weight
+        self._version += 1
+
+    def add(self, item: str, count: int = 1, weight: Optional[float] = None):
+        """
+        Add units of an item.
+
+        Args:
+            item: Item name
+            count: Number of units
+            weight: Weight of one unit; the catalog weight if omitted. A stack
+                keeps the unit weight it was started with.
+        """
+        symbol = self._table.intern(item)
+        stack = self._stacks.get(symbol)
+        if stack is None:
+            unit_weight = weight if weight is not None else self._catalog.weight(item)
+            stack = self._stacks[symbol] = [0, unit_weight]
+        stack[0] += count
+        self._count += count
+        self._weight += stack[1] * count
+        self._version += 1
+
+    def discard(self, item: str, count: int = 1) -> int:
+        """
+        Remove up to count units of an item.
+
+        Args:
+            item: Item name
+            count: Number of units
+
+        Returns:
+            Number of units removed
+        """
+        symbol = self._table.lookup(item)
+        stack = self._stacks.get(symbol) if symbol is not None else None
+        if stack is None:
+            return 0
+        removed = min(count, int(stack[0]))
+        stack[0] -= removed
+        self._count -= removed
+        self._weight -= stack[1] * removed
+        self._version += 1
+        if not stack[0]:
+            del self._stacks[symbol]
+            if not self._stacks:
+                # Clear float rounding once the inventory is empty
+                self._weight = 0.0
+        return removed
+
+    def freeze(self) -> FrozenInventory:
+        """Get an immutable copy of the inventory, shared until it changes."""
+        if self._frozen_version != self._version:
+            stacks = tuple((symbol, int(stack[0]), stack[1]) for symbol, stack in self._stacks.items())
+            self._frozen = (stacks, self._weight, self._adjustment)
+            self._frozen_version = self._version
+        return self._frozen
+
+    @classmethod
+    def thaw(cls, frozen: FrozenInventory, catalog: ItemCatalog = item_catalog,
+             table: SymbolTable = symbols) -> 'Inventory':
+        """Rebuild an inventory from freeze() output."""
+        stacks, weight, adjustment = frozen
+        inventory = cls.__new__(cls)
+        inventory._catalog = catalog
+        inventory._table = table
+        inventory._stacks = {symbol: [count, unit_weight] for symbol, count, unit_weight in stacks}
+        inventory._count = sum(count for _, count, _ in stacks)
+        inventory._weight = weight
+        inventory._adjustment = adjustment
+        inventory._version = 0
+        inventory._frozen = frozen
+        inventory._frozen_version = 0
+        return inventory
+
+    def unit_weight(self, item: str) -> float:
+        """Get the weight of one unit of an item, as carried or from the catalog."""
+        symbol = self._table.lookup(item)
+        stack = self._stacks.get(symbol) if symbol is not None else None
+        return stack[1] if stack is not None else self._catalog.weight(item)
+
+    def count(self, item: str) -> int:
+        """Get the number of units of an item."""
+        symbol = self._table.lookup(item)
+        stack = self._stacks.get(symbol) if symbol is not None else None
+        return int(stack[0]) if stack is not None else 0
+
+    def stacks(self) -> List[Tuple[str, int]]:
+        """Get (item, count) for each stack, in pickup order."""
+        name = self._table.name
+        return [(name(symbol), int(stack[0])) for symbol, stack in self._stacks.items()]
+
+    @property
+    def ids(self) -> Tuple[int, ...]:
+        """Symbol IDs of the carried items, one per stack."""
+        return tuple(self._stacks)
+
+    def contains_id(self, symbol: int) -> bool:
+        """Check membership by symbol ID."""
+        return symbol in self._stacks
+
+    # List-compatible interface
+
+    def append(self, item: str):
+        """Add one unit of an item at its catalog weight."""
+        self.add(item)
+
+    def remove(self, item: str):
+        """Remove one unit of an item, raising ValueError if there is none."""
+        if not self.discard(item):
+            raise ValueError(f"{item!r} is not in inventory")
+
+    def __contains__(self, item: object) -> bool:
+        symbol = self._table.lookup(item)
+        return symbol is not None and symbol in self._stacks
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        name = self._table.name
+        for symbol, stack in self._stacks.items():
+            item = name(symbol)
+            for _ in range(int(stack[0])):
+                yield item
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("inventory index out of range")
+        for symbol, stack in self._stacks.items():
+            if index < stack[0]:
+                return self._table.name(symbol)
+            index -= int(stack[0])
+        raise IndexError("inventory index out of range")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Inventory):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Inventory({self.stacks()!r}, weight={self.weight:.1f})"
@@ -0,0 +1,200 @@
+"""
+Item Catalog - Single registry of item facts
+
+This module loads Assets/items.json once and answers every question about
+an item: its weight, inventory category, use effects, weapon stats and
+display info. The game state, engine, combat system and inventory screens
+all read from the same catalog, so an item weighs the same when it is
+picked up, dropped and used.
+"""
+
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+ITEMS_FILE = 'items.json'
+
+DEFAULT_WEIGHT = 1.0
+DEFAULT_CATEGORY = "Miscellaneous"
+
+# Always available, even if the items file cannot be read
+FISTS = MappingProxyType({"damage": 8, "accuracy": 0.7, "durability": 999, "description": "your bare hands"})
+
+
+def find_items_file() -> Optional[str]:
+    """
+    Locate the items.json assets file.
+
+    Returns:
+        Path to the first candidate file that exists, or None if none do
+    """
+    possible_paths = [
+        os.path.join('Assets', ITEMS_FILE),
+        os.path.join('..', 'Assets', ITEMS_FILE),
+        os.path.join(os.path.dirname(__file__), 'Assets', ITEMS_FILE)
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class Item:
+    """Read-only facts about one item."""
+
+    __slots__ = ("name", "weight", "category", "info", "effects", "weapon")
+
+    def __init__(self, name: str, weight: float, category: str, info: str = "",
+                 effects: Optional[Mapping[str, Any]] = None, weapon: Optional[Mapping[str, Any]] = None):
+        """
+        Args:
+            name: Item name
+            weight: Weight in kg
+            category: Inventory category
+            info: One-line description shown in the inventory
+            effects: Stat changes when used (health, hunger, thirst, fatigue, consumable)
+            weapon: Combat stats if the item is a weapon
+        """
+        self.name = name
+        self.weight = weight
+        self.category = category
+        self.info = info
+        self.effects = effects
+        self.weapon = weapon
+
+    @property
+    def usable(self) -> bool:
+        """True if using the item has an effect."""
+        return self.effects is not None
+
+    def __repr__(self) -> str:
+        return f"Item({self.name!r}, weight={self.weight}, category={self.category!r})"
+
+
+class ItemCatalog:
+    """All known items, loaded once."""
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None):
+        """
+        Set up a catalog.
+
+        Args:
+            data: Parsed items file; Assets/items.json is read on first use if omitted
+        """
+        self._data = data
+        self._items: Optional[Dict[str, Item]] = None
+        self._unknown: Dict[str, Item] = {}
+        self._default_weight = DEFAULT_WEIGHT
+        self._default_category = DEFAULT_CATEGORY
+        self._categories: Tuple[Tuple[str, str], ...] = ()
+        self._weapons: Mapping[str, Mapping[str, Any]] = MappingProxyType({"fists": FISTS})
+
+    def _load(self) -> Dict[str, Item]:
+        """Read and index the items file."""
+        data = self._data
+        if data is None:
+            path = find_items_file()
+            data = {}
+            if path is None:
+                print("Warning: items.json not found, using default item properties")
+            else:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Error reading item data: {e}")
+
+        self._default_weight = data.get("default_weight", DEFAULT_WEIGHT)
+        self._default_category = data.get("default_category", DEFAULT_CATEGORY)
+        self._categories = tuple((category["name"], category.get("icon", ""))
+                                 for category in data.get("categories", []))
+
+        items = {}
+        weapons = {"fists": FISTS}
+        for name, entry in data.get("items", {}).items():
+            effects = entry.get("effects")
+            weapon = entry.get("weapon")
+            items[name] = Item(
+                name,
+                entry.get("weight", self._default_weight),
+                entry.get("category", self._default_category),
+                entry.get("info", ""),
+                MappingProxyType(dict(effects)) if effects is not None else None,
+                MappingProxyType(dict(weapon)) if weapon is not None else None
+            )
+            if weapon is not None:
+                weapons[name] = items[name].weapon
+        # Items in a category the file does not list still get shown, after the listed ones
+        listed = {name for name, _ in self._categories}
+        for item in items.values():
+            if item.category not in listed:
+                listed.add(item.category)
+                self._categories += ((item.category, ""),)
+        if self._default_category not in listed:
+            self._categories += ((self._default_category, ""),)
+
+        self._weapons = MappingProxyType(weapons)
+        self._items = items
+        return items
+
+    def get(self, name: str) -> Item:
+        """
+        Get an item's facts; unknown items get the default weight and category.
+
+        Args:
+            name: Item name
+
+        Returns:
+            Item record
+        """
+        items = self._items if self._items is not None else self._load()
+        item = items.get(name)
+        if item is None:
+            item = self._unknown.get(name)
+            if item is None:
+                item = self._unknown[name] = Item(name, self._default_weight, self._default_category)
+        return item
+
+    def weight(self, name: str) -> float:
+        """Get an item's weight in kg."""
+        return self.get(name).weight
+
+    def category(self, name: str) -> str:
+        """Get an item's inventory category."""
+        return self.get(name).category
+
+    def info(self, name: str) -> str:
+        """Get an item's one-line description, or an empty string."""
+        return self.get(name).info
+
+    def effects(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get an item's use effects, or None if it cannot be used."""
+        return self.get(name).effects
+
+    def is_usable(self, name: str) -> bool:
+        """Check if using an item has an effect."""
+        return self.get(name).usable
+
+    @property
+    def weapons(self) -> Mapping[str, Mapping[str, Any]]:
+        """Weapon stats by item name, including fists."""
+        if self._items is None:
+            self._load()
+        return self._weapons
+
+    @property
+    def categories(self) -> Tuple[Tuple[str, str], ...]:
+        """(name, icon) of each inventory category, in display order."""
+        if self._items is None:
+            self._load()
+        return self._categories
+
+    def names(self) -> List[str]:
+        """Get the names of all catalogued items."""
+        items = self._items if self._items is not None else self._load()
+        return list(items)
+
+
+# Global item catalog instance
+item_catalog = ItemCatalog()
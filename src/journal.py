@@ -0,0 +1,342 @@
+"""
+Journal - Append-only record of game state changes
+
+Every change to a journaled GameState is recorded as a compact
+(turn, operation, args, kwargs) tuple: a call to one of the methods marked
+@journaled, or an assignment to a journaled field such as health. Calls
+made from inside another journaled method are covered by the outer record
+and not recorded again. Together with the RNG seed the session started
+with, the records are enough to rebuild the state at any turn.
+
+Every checkpoint_every records the journal takes a snapshot (see
+snapshots.py) and drops records older than the oldest snapshot it keeps,
+so replaying to a turn never applies more than checkpoint_every records.
+If given a path, the journal also appends each record to a JSON lines
+file, rewriting it from the latest checkpoint each time one is taken, so
+a crashed session can be recovered with recover(). A journal file left
+over from an earlier session is moved aside to <path>.prev rather than
+overwritten, and a cleanly detached journal moves its own file there, so a
+file still at the path on startup means the last session crashed (see
+unfinished_session()).
+
+File layout:
+    {"journal": 1, "seed": <seed>}
+    {"checkpoint": <GameState.to_dict() data>}
+    [<turn>, "<operation>", [<args>], {<kwargs>}]
+    ...
+
+Usage: python journal.py game_journal.jsonl
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import random
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+JOURNAL_FORMAT = 1
+JOURNAL_FILE = 'game_journal.jsonl'
+# Suffix for the journal of the previous session
+PREVIOUS_SUFFIX = '.prev'
+
+# Operation name for assignments to journaled fields; args are (field, value)
+SET = "set"
+
+# (turn, operation, args, kwargs)
+Record = Tuple[int, str, Tuple[Any, ...], Dict[str, Any]]
+
+
+def journaled(method: Callable) -> Callable:
+    """
+    Mark a GameState method as a journaled operation.
+
+    The call is recorded after it returns, with the turn it started on.
+    """
+    operation = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        journal = self._journal
+        if journal is None or journal.depth:
+            return method(self, *args, **kwargs)
+        turn = self.turn_count
+        journal.depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            journal.depth -= 1
+        journal.record(self, turn, operation, args, kwargs)
+        return result
+
+    return wrapper
+
+
+def record_assignment(state: Any, name: str, value: Any):
+    """Record an assignment to a journaled field, unless a journaled method is running."""
+    journal = state._journal
+    if journal is not None and not journal.depth:
+        journal.record(state, state.turn_count, SET, (name, value), {})
+
+
+class JournaledField:
+    """Attribute stored in the slot `_<name>` whose assignments are journaled."""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+        self.attr = "_" + name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self.attr)
+
+    def __set__(self, obj: Any, value: Any):
+        setattr(obj, self.attr, value)
+        record_assignment(obj, self.name, value)
+
+
+@contextlib.contextmanager
+def unjournaled(state: Any) -> Iterator[None]:
+    """
+    Replace a state wholesale without journaling each change.
+
+    Used for loads and undo; the journal takes a checkpoint afterwards, so
+    replay starts from the replaced state.
+    """
+    journal = state._journal
+    state._journal = None
+    try:
+        yield
+    finally:
+        state._journal = journal
+    if journal is not None:
+        journal.checkpoint(state)
+
+
+def apply_record(state: Any, record: Record):
+    """
+    Apply one journal record to a state.
+
+    Args:
+        state: GameState to change; should not have a journal attached
+        record: Record to apply
+    """
+    _, operation, args, kwargs = record
+    if operation == SET:
+        setattr(state, *args)
+    else:
+        getattr(state, operation)(*args, **kwargs)
+
+
+class Journal:
+    """Append-only record of changes to one game state, with periodic checkpoints."""
+
+    def __init__(self, seed: Optional[int] = None, path: Optional[str] = None,
+                 checkpoint_every: int = 200, keep_checkpoints: int = 4):
+        """
+        Set up a journal.
+
+        Args:
+            seed: Seed for the random module; a fresh one is picked if omitted
+            path: JSON lines file to mirror the journal to, if any
+            checkpoint_every: Records between checkpoints
+            keep_checkpoints: Checkpoints kept in memory; older records are dropped
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.keep_checkpoints = keep_checkpoints
+        self.records: List[Record] = []
+        # (index into records, earliest turn it can start a replay of, snapshot)
+        self._checkpoints: List[Tuple[int, int, Any]] = []
+        self._file = None
+        # Nesting level of journaled calls in progress
+        self.depth = 0
+
+    def attach(self, state: Any):
+        """
+        Start journaling a state and seed the random module.
+
+        Args:
+            state: GameState to journal
+        """
+        random.seed(self.seed)
+        if self.path is not None and self._file is None:
+            # Keep an earlier session's journal for recover() instead of overwriting it
+            _move_aside(self.path)
+        state._journal = self
+        self.checkpoint(state)
+
+    def detach(self, state: Any):
+        """Stop journaling a state, close the journal file and move it aside as finished."""
+        state._journal = None
+        self.close()
+        if self.path is not None:
+            _move_aside(self.path)
+
+    def record(self, state: Any, turn: int, operation: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        """
+        Append a record, taking a checkpoint if one is due.
+
+        Args:
+            state: State the change was made to
+            turn: Turn the change started on
+            operation: Method name, or SET
+            args: Positional arguments
+            kwargs: Keyword arguments
+        """
+        record = (turn, operation, args, kwargs)
+        self.records.append(record)
+        if self._file is not None:
+            self._file.write(json.dumps([turn, operation, list(args), kwargs]) + "\n")
+            self._file.flush()
+        if len(self.records) - self._checkpoints[-1][0] >= self.checkpoint_every:
+            # Taken part way through a turn, the checkpoint can only stand
+            # for the start of the next one
+            self.checkpoint(state, state.turn_count + 1 if turn == state.turn_count else state.turn_count)
+
+    def checkpoint(self, state: Any, turn: Optional[int] = None):
+        """
+        Snapshot a state and drop records no kept checkpoint needs.
+
+        Args:
+            state: Journaled GameState
+            turn: Earliest turn whose start replay may begin from this
+                checkpoint; the state's current turn if omitted
+        """
+        turn = state.turn_count if turn is None else turn
+        self._checkpoints.append((len(self.records), turn, state.snapshot()))
+        if len(self._checkpoints) > self.keep_checkpoints:
+            del self._checkpoints[:-self.keep_checkpoints]
+            dropped = self._checkpoints[0][0]
+            if dropped:
+                del self.records[:dropped]
+                self._checkpoints = [(index - dropped, turn, snapshot)
+                                     for index, turn, snapshot in self._checkpoints]
+        if self.path is not None:
+            self._rewrite(state)
+
+    def _rewrite(self, state: Any):
+        """Start the journal file over from the current state."""
+        self.close()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"journal": JOURNAL_FORMAT, "seed": self.seed}) + "\n")
+            f.write(json.dumps({"checkpoint": state.to_dict()}) + "\n")
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        """Close the journal file, if open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def first_turn(self) -> int:
+        """Earliest turn that can still be replayed."""
+        return self._checkpoints[0][1]
+
+    def replay(self, turn: Optional[int] = None) -> Any:
+        """
+        Rebuild the state as it was at the start of a turn.
+
+        Args:
+            turn: Turn to rebuild; the current state if omitted
+
+        Returns:
+            New GameState, without a journal attached
+
+        Raises:
+            ValueError: If the turn is older than the oldest kept checkpoint
+        """
+        for index, checkpoint_turn, snapshot in reversed(self._checkpoints):
+            if turn is None or checkpoint_turn <= turn:
+                break
+        else:
+            raise ValueError(f"Turn {turn} is older than the journal (first turn {self.first_turn})")
+
+        from game_state import GameState
+        state = GameState.from_snapshot(snapshot)
+        # Journaled methods print as they run; a replay should be silent
+        with contextlib.redirect_stdout(io.StringIO()):
+            for record in self.records[index:]:
+                if turn is not None and record[0] >= turn:
+                    break
+                apply_record(state, record)
+        return state
+
+
+def _move_aside(path: str):
+    """Rename a journal file to its PREVIOUS_SUFFIX name, if it exists."""
+    if os.path.exists(path):
+        os.replace(path, path + PREVIOUS_SUFFIX)
+
+
+def unfinished_session(path: str = JOURNAL_FILE) -> bool:
+    """
+    Check whether a journal file was left behind by a session that did not end cleanly.
+
+    Args:
+        path: Journal file written by a Journal with a path
+
+    Returns:
+        True if the file exists and records changes that recover() can apply
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            # Header and checkpoint, then at least one record
+            return sum(1 for _ in zip(range(3), f)) == 3
+    except OSError:
+        return False
+
+
+def recover(path: str = JOURNAL_FILE, state: Any = None) -> Tuple[Any, int]:
+    """
+    Rebuild the latest state from a journal file, e.g. after a crash.
+
+    Args:
+        path: Journal file written by a Journal with a path
+        state: GameState to restore into; a new one if omitted
+
+    Returns:
+        (state, seed) tuple
+
+    Raises:
+        ValueError: If the file is not a journal
+    """
+    from game_state import GameState
+    if state is None:
+        state = GameState()
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("journal") != JOURNAL_FORMAT:
+            raise ValueError(f"{path} is not a version {JOURNAL_FORMAT} journal")
+        checkpoint = json.loads(f.readline())["checkpoint"]
+        with unjournaled(state):
+            state.from_dict(checkpoint)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn write from a crash
+                turn, operation, args, kwargs = json.loads(line)
+                apply_record(state, (turn, operation, tuple(args), kwargs))
+    return state, header["seed"]
+
+
+def main():
+    """Command-line entry point: show the state recovered from a journal file."""
+    parser = argparse.ArgumentParser(description="Recover a game state from a journal file")
+    parser.add_argument("path", nargs="?", default=JOURNAL_FILE, help="journal file")
+    args = parser.parse_args()
+
+    state, seed = recover(args.path)
+    print(f"Seed: {seed}, turn {state.turn_count}")
+    print(state.get_status_summary())
+
+
+if __name__ == "__main__":
+    main()
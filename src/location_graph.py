@@ -0,0 +1,164 @@
+"""
+Location Graph - Precomputed movement and unlock indexes
+
+This module compiles the location list into integer node IDs with adjacency
+arrays, so movement menus and hidden-location unlock checks cost O(degree)
+instead of a scan over the whole world.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+NO_NODE = -1
+
+
+class CsrAdjacency:
+    """Adjacency lists packed into offset/target arrays (compressed sparse rows)."""
+
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int]):
+        """
+        Wrap packed adjacency arrays.
+
+        Args:
+            offsets: Start of each node's neighbours in targets, plus a final end offset
+            targets: Neighbour node IDs for all nodes, back to back
+        """
+        self.offsets = offsets
+        self.targets = targets
+
+    def __getitem__(self, node: int) -> Tuple[int, ...]:
+        return tuple(self.targets[self.offsets[node]:self.offsets[node + 1]])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class LocationGraph:
+    """Integer-indexed adjacency and lookup tables for a set of locations."""
+
+    def __init__(self, locations: Iterable[Mapping[str, Any]]):
+        """
+        Compile the graph for a list of locations.
+
+        Node IDs are assigned in file order. Names that are only referenced
+        from a nearby list (and have no location entry) still get an ID so
+        menus can show them, but they have no town and no neighbours.
+
+        Args:
+            locations: Location data as stored in the world index
+        """
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        locations = list(locations)
+
+        # Every location entry gets the node ID of its position; if a name is
+        # repeated, lookups resolve to the first entry
+        for node, location in enumerate(locations):
+            self.ids.setdefault(location["name"], node)
+            self.names.append(location["name"])
+        self.location_count = len(self.names)
+
+        self.towns: List[str] = []
+        self.hidden = bytearray(self.location_count)
+        self.nearby_short: List[Tuple[int, ...]] = []
+        self.nearby_long: List[Tuple[int, ...]] = []
+        self.hidden_location: List[int] = []
+        self.hidden_by_town: Dict[str, Tuple[int, ...]] = {}
+        self.unlocks_by_item: Dict[str, Tuple[int, ...]] = {}
+
+        hidden_by_town: Dict[str, List[int]] = {}
+        unlocks_by_item: Dict[str, List[int]] = {}
+
+        for node, location in enumerate(locations):
+            town = location.get("town", "")
+            self.towns.append(town)
+            self.nearby_short.append(self._intern_all(location.get("nearby_short", ())))
+            self.nearby_long.append(self._intern_all(location.get("nearby_long", ())))
+
+            hidden_location = location.get("hidden_location")
+            self.hidden_location.append(self._intern(hidden_location) if hidden_location else NO_NODE)
+
+            if location.get("hidden", False):
+                self.hidden[node] = 1
+                hidden_by_town.setdefault(town, []).append(node)
+                required_item = location.get("requires_item")
+                if required_item:
+                    unlocks_by_item.setdefault(required_item, []).append(node)
+
+        self.hidden_by_town = {town: tuple(nodes) for town, nodes in hidden_by_town.items()}
+        self.unlocks_by_item = {item: tuple(nodes) for item, nodes in unlocks_by_item.items()}
+
+    @classmethod
+    def from_arrays(cls, names: List[str], location_count: int, towns: Sequence[str],
+                    hidden: Sequence[int], nearby_short: Sequence[Tuple[int, ...]],
+                    nearby_long: Sequence[Tuple[int, ...]], hidden_location: Sequence[int],
+                    hidden_by_town: Dict[str, Tuple[int, ...]],
+                    unlocks_by_item: Dict[str, Tuple[int, ...]]) -> 'LocationGraph':
+        """
+        Build a graph from precomputed tables, e.g. those stored in a compiled world.
+
+        Returns:
+            A LocationGraph that uses the given tables directly
+        """
+        graph = cls.__new__(cls)
+        graph.names = names
+        graph.ids = {}
+        for node, name in enumerate(names):
+            graph.ids.setdefault(name, node)
+        graph.location_count = location_count
+        graph.towns = towns
+        graph.hidden = hidden
+        graph.nearby_short = nearby_short
+        graph.nearby_long = nearby_long
+        graph.hidden_location = hidden_location
+        graph.hidden_by_town = hidden_by_town
+        graph.unlocks_by_item = unlocks_by_item
+        return graph
+
+    def _intern(self, name: str) -> int:
+        """Get the node ID for a name, assigning a new one if needed."""
+        node = self.ids.get(name)
+        if node is None:
+            node = len(self.names)
+            self.names.append(name)
+            self.ids[name] = node
+        return node
+
+    def _intern_all(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Get the node IDs for a list of names."""
+        return tuple(self._intern(name) for name in names)
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Get the node ID for a location name, or None if unknown."""
+        return self.ids.get(name)
+
+    def name_of(self, node: int) -> str:
+        """Get the location name for a node ID."""
+        return self.names[node]
+
+    def has_location(self, node: Optional[int]) -> bool:
+        """Check if a node has a location entry (rather than a dangling reference)."""
+        return node is not None and 0 <= node < self.location_count
+
+    def is_hidden(self, node: Optional[int]) -> bool:
+        """Check if a node is a hidden location."""
+        return self.has_location(node) and bool(self.hidden[node])
+
+    def town_of(self, node: Optional[int]) -> str:
+        """Get the town a node belongs to."""
+        return self.towns[node] if self.has_location(node) else ""
+
+    def neighbors_short(self, node: Optional[int]) -> Tuple[int, ...]:
+        """Get the nodes within walking distance of a node."""
+        return self.nearby_short[node] if self.has_location(node) else ()
+
+    def neighbors_long(self, node: Optional[int]) -> Tuple[int, ...]:
+        """Get the nodes reachable by vehicle from a node."""
+        return self.nearby_long[node] if self.has_location(node) else ()
+
+    def hidden_in_town(self, town: str) -> Tuple[int, ...]:
+        """Get the hidden locations in a town, in file order."""
+        return self.hidden_by_town.get(town, ())
+
+    def unlocked_by(self, item: str) -> Tuple[int, ...]:
+        """Get the hidden locations that an item unlocks."""
+        return self.unlocks_by_item.get(item, ())
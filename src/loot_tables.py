@@ -0,0 +1,164 @@
+"""
+Loot Tables - Data-driven search outcomes
+
+This module reads Assets/loot.json, which describes what each kind of
+search finds: the description, item pool, success chance and failure
+text. Outcomes are resolved once per (location, action) pair, ahead of
+play for every search action in the world, so a search in the game is a
+single dict lookup. An action in the world data can also carry its own
+"loot" entry, which takes precedence over the loot file.
+
+Loot file layout:
+    {
+        "locations": [
+            {"match": "<substring of location name>",
+             "searches": [{"actions": ["<substring of action name>", ...], ...outcome},
+                          {...outcome without "actions" matches any search here}]}
+        ],
+        "default": {...outcome used when nothing else matches}
+    }
+
+Location groups are tried in order and the first group whose "match"
+occurs in the location name decides; within it, the first search whose
+action keywords occur in the action name wins, falling back to "default".
+"""
+
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from action_dispatch import SEARCH, action_table
+
+LOOT_FILE = 'loot.json'
+
+# Used if the loot file is missing; "{location}" is replaced with the location name
+DEFAULT_OUTCOME = {
+    "description": "You search around {location}. The area shows signs of hasty evacuation.",
+    "items": ["coins", "keys", "newspaper", "pen", "tissues"],
+    "success_chance": 0.4,
+    "nothing_found": "You find only debris and signs of the chaos that occurred here.",
+    "failure_message": "Your search turns up nothing of value."
+}
+
+
+def find_loot_file() -> Optional[str]:
+    """
+    Locate the loot.json assets file.
+
+    Returns:
+        Path to the first candidate file that exists, or None if none do
+    """
+    possible_paths = [
+        os.path.join('Assets', LOOT_FILE),
+        os.path.join('..', 'Assets', LOOT_FILE),
+        os.path.join(os.path.dirname(__file__), 'Assets', LOOT_FILE)
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _freeze_outcome(outcome: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Make a read-only copy of an outcome, without its matching keywords."""
+    frozen = {key: value for key, value in outcome.items() if key != "actions"}
+    if "items" in frozen:
+        frozen["items"] = tuple(frozen["items"])
+    return MappingProxyType(frozen)
+
+
+class LootTable:
+    """Search outcomes resolved once per (location, action) pair."""
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None):
+        """
+        Set up a loot table.
+
+        Args:
+            data: Parsed loot file; Assets/loot.json is read on first use if omitted
+        """
+        self._data = data
+        self._groups: Optional[List[Tuple[str, List[Tuple[Tuple[str, ...], Mapping[str, Any]]]]]] = None
+        self._default: Mapping[str, Any] = _freeze_outcome(DEFAULT_OUTCOME)
+        self._outcomes: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+
+    def _compile(self):
+        """Read and compile the loot rules."""
+        data = self._data
+        if data is None:
+            path = find_loot_file()
+            data = {}
+            if path is None:
+                print("Warning: loot.json not found, using default search results")
+            else:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Error reading loot data: {e}")
+
+        groups = []
+        for group in data.get("locations", []):
+            searches = [(tuple(keyword.lower() for keyword in search.get("actions", ())), _freeze_outcome(search))
+                        for search in group.get("searches", [])]
+            groups.append((group["match"].lower(), searches))
+        if "default" in data:
+            self._default = _freeze_outcome(data["default"])
+        self._groups = groups
+
+    def _match(self, location_key: str, action_key: str) -> Mapping[str, Any]:
+        """Apply the loot rules to a lowercased location and action name."""
+        if self._groups is None:
+            self._compile()
+        for match, searches in self._groups:
+            if match not in location_key:
+                continue
+            for keywords, outcome in searches:
+                if not keywords or any(keyword in action_key for keyword in keywords):
+                    return outcome
+            break
+        return self._default
+
+    def lookup(self, location_name: str, action: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
+        """
+        Get the outcome of a search.
+
+        Args:
+            location_name: Location being searched
+            action: The search action; a general search if omitted
+
+        Returns:
+            Read-only outcome with description, items, success_chance and
+            optional nothing_found, failure_message and item_description
+        """
+        if action is not None and action.get("loot"):
+            return action["loot"]
+        action_name = action["name"] if action is not None else "general search"
+        key = (location_name.lower(), action_name.lower())
+        outcome = self._outcomes.get(key)
+        if outcome is None:
+            outcome = self._outcomes[key] = self._match(*key)
+        return outcome
+
+    def bind(self, locations: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Resolve the outcome of every search action in a set of locations ahead of play.
+
+        Args:
+            locations: Location data
+
+        Returns:
+            Number of search actions resolved
+        """
+        count = 0
+        for location in locations:
+            for action in location.get("actions", ()):
+                if action_table.resolve(action) == SEARCH:
+                    self.lookup(location["name"], action)
+                    count += 1
+        return count
+
+
+# Global loot table instance
+loot_table = LootTable()
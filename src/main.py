@@ -4,7 +4,12 @@ Text Adventure Game - Main Entry Point
 A zombie survival text-based adventure game.
 """
 
+from autosave import Autosaver
 from game_engine import GameEngine
+from game_state import game_state
+from journal import JOURNAL_FILE, Journal, recover, unfinished_session
+from save_store import open_saves
+from world_watcher import WorldWatcher
 
 
 def main():
@@ -12,8 +17,39 @@ def main():
     print("Welcome to Zombie Survival Story!")
     print("=" * 40)
 
-    game = GameEngine()
-    game.start_game()
+    # Pick up edits to locations.json without restarting the game
+    watcher = WorldWatcher()
+    watcher.start()
+
+    # A journal still on disk means the last session crashed
+    if unfinished_session(JOURNAL_FILE):
+        choice = input("\nYour last session ended unexpectedly. Recover it? (y/n): ").strip().lower()
+        if choice == 'y':
+            try:
+                recover(JOURNAL_FILE, game_state)
+                print(f"Recovered your game at {game_state.current_location}.")
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not recover the last session ({e})")
+
+    # Record every state change so a crashed session can be recovered; the
+    # previous session's journal is kept as game_journal.jsonl.prev
+    journal = Journal(path=JOURNAL_FILE)
+    journal.attach(game_state)
+
+    # Save files in the working directory, or a SQLite database when hosted
+    saves = open_saves()
+
+    # Save in the background every few turns and on every move
+    autosaver = Autosaver(game_state, saves)
+    autosaver.start()
+
+    game = GameEngine(autosaver, saves)
+    try:
+        game.start_game()
+    finally:
+        watcher.stop()
+        autosaver.stop()
+        journal.detach(game_state)
 
 if __name__ == "__main__":
     main()
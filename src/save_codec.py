@@ -0,0 +1,372 @@
+"""
+Save Codec - Compact binary save format
+
+Save files used to be indented JSON only, repeating every item name in
+full for each unit in the inventory. This module adds a binary encoding
+of the same save data (GameState.to_dict()):
+
+    header: magic "ZSSV", format version, flags, CRC-32 and length of the body
+    body:   string count, NUL-separated string table, then the save data
+            as tagged values
+
+Every distinct string is stored once in the string table and referenced
+by ID. Integers, which is what the survival stats usually are, are
+zigzag varints, and lists made up only of strings, such as the inventory,
+are packed as an array of string IDs. With FLAG_ZLIB set the body is
+zlib-compressed; the CRC covers the body as stored, so a damaged file is
+rejected before it is decompressed or decoded.
+
+A binary save can be followed by deltas: further encoded saves, flagged
+FLAG_DELTA, holding only the fields that changed since the previous
+one. Decoding applies them in order over the full save they follow (see
+SaveSlots.write_delta()).
+
+Which codec a save is written with follows the file suffix: .sav files
+are binary, anything else is JSON. Loading detects the format from the
+file contents, so old JSON saves keep loading.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Tuple
+
+MAGIC = b"ZSSV"
+FORMAT_VERSION = 1
+
+# Header flags
+FLAG_ZLIB = 1
+FLAG_DELTA = 2
+
+# Fastest zlib level; higher levels barely shrink a save further
+ZLIB_LEVEL = 1
+
+JSON = "json"
+BINARY = "binary"
+BINARY_SUFFIX = ".sav"
+
+# magic, version, flags, CRC-32 of the body, body length
+_HEADER = struct.Struct("<4sHHII")
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _STRLIST = range(9)
+_DOUBLE = struct.Struct("<d")
+
+# Array typecodes for string ID lists, by the largest ID they can hold
+_ID_TYPECODES = (("B", 0xFF), ("H", 0xFFFF), ("I", 0xFFFFFFFF))
+
+
+class SaveFormatError(ValueError):
+    """Raised when a binary save is corrupt, truncated or from another version."""
+
+
+def codec_for(filename: str) -> str:
+    """Get the codec a save file name is written with."""
+    return BINARY if filename.endswith(BINARY_SUFFIX) else JSON
+
+
+def _write_varint(out: bytearray, value: int):
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint, returning (value, new position)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Encoder:
+    """Encodes save data against a string table built along the way."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+        self.out = bytearray()
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def value(self, value: Any):
+        out = self.out
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self.intern(value))
+        elif isinstance(value, (list, tuple)):
+            if value and set(map(type, value)) == {str}:
+                ids = self.ids
+                new = [item for item in dict.fromkeys(value) if item not in ids]
+                ids.update(zip(new, range(len(self.strings), len(self.strings) + len(new))))
+                self.strings += new
+                largest = len(self.strings) - 1
+                typecode = next(code for code, limit in _ID_TYPECODES if largest <= limit)
+                ids = array(typecode, map(ids.__getitem__, value))
+                if sys.byteorder != "little":
+                    ids.byteswap()
+                out.append(_STRLIST)
+                out += typecode.encode("ascii")
+                _write_varint(out, len(ids))
+                out += ids.tobytes()
+                return
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self.intern(key))
+                self.value(item)
+        else:
+            raise SaveFormatError(f"Cannot encode value of type {type(value).__name__}")
+
+
+class _Decoder:
+    """Decodes the values of one binary save body."""
+
+    def __init__(self, buf: bytes, pos: int, strings: List[str]):
+        self.buf = buf
+        self.pos = pos
+        self.strings = strings
+
+    def value(self) -> Any:
+        buf = self.buf
+        tag = buf[self.pos]
+        self.pos += 1
+        if tag == _INT:
+            raw, self.pos = _read_varint(buf, self.pos)
+            return (raw >> 1) ^ -(raw & 1)
+        if tag == _STR:
+            string_id, self.pos = _read_varint(buf, self.pos)
+            return self.strings[string_id]
+        if tag == _STRLIST:
+            typecode = chr(buf[self.pos])
+            count, pos = _read_varint(buf, self.pos + 1)
+            ids = array(typecode)
+            end = pos + count * ids.itemsize
+            ids.frombytes(buf[pos:end])
+            if sys.byteorder != "little":
+                ids.byteswap()
+            self.pos = end
+            return list(map(self.strings.__getitem__, ids))
+        if tag == _DICT:
+            count, self.pos = _read_varint(buf, self.pos)
+            result = {}
+            for _ in range(count):
+                key_id, self.pos = _read_varint(buf, self.pos)
+                result[self.strings[key_id]] = self.value()
+            return result
+        if tag == _LIST:
+            count, self.pos = _read_varint(buf, self.pos)
+            return [self.value() for _ in range(count)]
+        if tag == _FLOAT:
+            value = _DOUBLE.unpack_from(buf, self.pos)[0]
+            self.pos += _DOUBLE.size
+            return value
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _NONE:
+            return None
+        raise SaveFormatError(f"Unknown value tag {tag}")
+
+
+def encode_save(save_data: Dict[str, Any], compress: bool = True) -> bytes:
+    """
+    Encode save data in the binary format.
+
+    Args:
+        save_data: Data from GameState.to_dict()
+        compress: Whether to zlib-compress the body
+
+    Returns:
+        Encoded save file contents
+    """
+    encoder = _Encoder()
+    encoder.value(save_data)
+
+    # The string table is one NUL-separated block, split in one call on load
+    table = "\0".join(encoder.strings).encode("utf-8")
+    if table.count(0) != len(encoder.strings) - 1:
+        raise SaveFormatError("Cannot encode strings containing NUL characters")
+    body = bytearray()
+    _write_varint(body, len(encoder.strings))
+    _write_varint(body, len(table))
+    body += table
+    body += encoder.out
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, ZLIB_LEVEL)
+        flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, flags, zlib.crc32(body), len(body)) + body
+
+
+def _decode_frame(data: bytes, offset: int) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Decode one encoded save starting at an offset.
+
+    Returns:
+        (save data, header flags, offset just past it) tuple
+    """
+    if len(data) - offset < _HEADER.size:
+        raise SaveFormatError("Save file is truncated")
+    magic, version, flags, crc, length = _HEADER.unpack_from(data, offset)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a binary save file")
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"Unsupported save format version {version} (expected {FORMAT_VERSION})")
+    start = offset + _HEADER.size
+    body = data[start:start + length]
+    if len(body) != length:
+        raise SaveFormatError("Save file is truncated")
+    if zlib.crc32(body) != crc:
+        raise SaveFormatError("Save file checksum mismatch")
+
+    try:
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        count, pos = _read_varint(body, 0)
+        size, pos = _read_varint(body, pos)
+        strings = str(body[pos:pos + size], "utf-8").split("\0") if count else []
+        if len(strings) != count:
+            raise SaveFormatError("Save file string table is corrupt")
+        pos += size
+        save_data = _Decoder(body, pos, strings).value()
+    except (IndexError, ValueError, zlib.error) as e:
+        raise SaveFormatError(f"Save file is corrupt: {e}") from e
+    if not isinstance(save_data, dict):
+        raise SaveFormatError("Save file does not hold a game state")
+    return save_data, flags, start + length
+
+
+def decode_save(data: bytes) -> Dict[str, Any]:
+    """
+    Decode a binary save, applying any deltas appended to it.
+
+    A delta that is cut short or damaged, as a crash part way through
+    appending one leaves it, is dropped along with anything after it.
+
+    Args:
+        data: Save file contents written by encode_save(), optionally
+            followed by deltas written by encode_delta()
+
+    Returns:
+        Save data dictionary
+
+    Raises:
+        SaveFormatError: If the base save is corrupt, truncated or from another version
+    """
+    save_data, flags, offset = _decode_frame(data, 0)
+    if flags & FLAG_DELTA:
+        raise SaveFormatError("Save file starts with a delta instead of a full save")
+    while offset < len(data):
+        try:
+            delta, flags, offset = _decode_frame(data, offset)
+        except SaveFormatError:
+            break
+        save_data.update(delta)
+    return save_data
+
+
+def save_delta(previous: Dict[str, Any], save_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the fields of save data that differ from an earlier save.
+
+    Args:
+        previous: Save data the delta will be applied to
+        save_data: New save data
+
+    Returns:
+        Changed fields, with their new values
+    """
+    missing = object()
+    return {key: value for key, value in save_data.items() if previous.get(key, missing) != value}
+
+
+def encode_delta(delta: Dict[str, Any]) -> bytes:
+    """
+    Encode changed fields for appending to a binary save.
+
+    Args:
+        delta: Fields from save_delta()
+
+    Returns:
+        Encoded delta
+    """
+    encoded = bytearray(encode_save(delta, compress=False))
+    _, version, flags, crc, length = _HEADER.unpack_from(encoded)
+    _HEADER.pack_into(encoded, 0, MAGIC, version, flags | FLAG_DELTA, crc, length)
+    return bytes(encoded)
+
+
+def dump_save(save_data: Dict[str, Any], codec: str = JSON, indent: Any = 2) -> bytes:
+    """
+    Encode save data with a codec.
+
+    Args:
+        save_data: Data from GameState.to_dict()
+        codec: JSON or BINARY
+        indent: JSON indentation; None writes compact JSON. Ignored for BINARY.
+
+    Returns:
+        Save file contents
+    """
+    if codec == BINARY:
+        return encode_save(save_data)
+    separators = (',', ':') if indent is None else None
+    return json.dumps(save_data, indent=indent, separators=separators).encode("utf-8")
+
+
+def load_save(data: bytes) -> Any:
+    """
+    Decode save file contents in either format.
+
+    Args:
+        data: Save file contents
+
+    Returns:
+        Decoded save data
+
+    Raises:
+        ValueError: If the contents cannot be decoded
+    """
+    if data[:len(MAGIC)] == MAGIC:
+        return decode_save(data)
+    return json.loads(data)
+
+
+def read_save_file(path: str) -> Any:
+    """Read and decode a save file in either format."""
+    with open(path, 'rb') as f:
+        return load_save(f.read())
@@ -0,0 +1,284 @@
+"""
+Save Slots - Manifest of save files for the save and load menus
+
+The menus used to glob the working directory and parse every save file
+just to show its location, day and health. This module keeps that summary
+for every slot in one small manifest file, saves_manifest.json, which is
+rewritten atomically whenever a save is written through it.
+
+Listing the slots reads the manifest and the directory listing, and
+compares each file's size and modification time against the manifest. A
+save file is parsed only if it is new or was changed behind the
+manifest's back; if the manifest is missing or unreadable, every save is
+scanned once and the manifest rebuilt.
+
+Binary slots can also be saved as deltas (write_delta()): only the fields
+that changed since the last save are appended to the file, with a full
+save written every DELTA_BASE_EVERY deltas to keep loading quick.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from Functions.atomic_write import atomic_write
+from save_codec import (BINARY_SUFFIX, codec_for, dump_save, encode_delta, encode_save, read_save_file,
+                        save_delta)
+
+MANIFEST_FILE = 'saves_manifest.json'
+MANIFEST_VERSION = 2
+
+# Deltas appended to a binary slot between full saves
+DELTA_BASE_EVERY = 20
+
+SAVE_PREFIX = 'save_'
+SAVE_SUFFIX = '.json'
+SAVE_SUFFIXES = (SAVE_SUFFIX, BINARY_SUFFIX)
+
+
+def is_save_file(filename: str) -> bool:
+    """Check if a file name is a save slot, in either save format."""
+    return filename.startswith(SAVE_PREFIX) and filename.endswith(SAVE_SUFFIXES)
+
+
+class SlotInfo:
+    """Summary of one save slot, as shown in the menus."""
+
+    __slots__ = ("filename", "mtime", "size", "location", "days", "health", "turn", "rank")
+
+    def __init__(self, filename: str, mtime: float, size: int, location: str = "Unknown",
+                 days: int = 0, health: float = 0, turn: int = 0, rank: str = "Rookie"):
+        """
+        Args:
+            filename: Save file name
+            mtime: File modification time
+            size: File size in bytes
+            location: Current location in the save
+            days: Days survived
+            health: Player health
+            turn: Turn count
+            rank: Survivor rank
+        """
+        self.filename = filename
+        self.mtime = mtime
+        self.size = size
+        self.location = location
+        self.days = days
+        self.health = health
+        self.turn = turn
+        self.rank = rank
+
+    @classmethod
+    def from_save_data(cls, filename: str, stat: os.stat_result, save_data: Dict[str, Any]) -> 'SlotInfo':
+        """Summarize a save from its data."""
+        return cls(filename, stat.st_mtime, stat.st_size,
+                   save_data.get("current_location", "Unknown"),
+                   save_data.get("days_survived", 0),
+                   save_data.get("health", 0),
+                   save_data.get("turn_count", 0),
+                   save_data.get("survivor_rank", "Rookie"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to manifest data."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"SlotInfo({self.filename!r}, location={self.location!r}, days={self.days})"
+
+
+class SaveSlots:
+    """
+    Save slots in a directory, summarized by a manifest file.
+
+    Other save backends (see save_store.py) provide the same slots(),
+    load(), save(), write() and write_delta() methods.
+    """
+
+    def __init__(self, directory: str = '.'):
+        """
+        Args:
+            directory: Directory holding the save files and manifest
+        """
+        self.directory = directory
+        # Saves can be written from the autosave thread as well as the menus
+        self._lock = threading.Lock()
+        # Slot name -> (last save data, deltas since its full save, file size)
+        self._delta_bases: Dict[str, Tuple[Dict[str, Any], int, int]] = {}
+
+    @property
+    def manifest_path(self) -> str:
+        """Path of the manifest file."""
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def path(self, filename: str) -> str:
+        """Get the path of a save file."""
+        return os.path.join(self.directory, filename)
+
+    def _read_manifest(self) -> Optional[Dict[str, SlotInfo]]:
+        """Read the manifest, or None if it is missing or unreadable."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            return {filename: SlotInfo(**entry) for filename, entry in data["slots"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_manifest(self, slots: Dict[str, SlotInfo]):
+        """Atomically replace the manifest."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "slots": {filename: info.to_dict() for filename, info in sorted(slots.items())}
+        }
+        atomic_write(self.manifest_path, json.dumps(data, indent=1))
+
+    def _scan(self, filename: str, stat: os.stat_result) -> SlotInfo:
+        """Summarize a save file by parsing it."""
+        try:
+            save_data = read_save_file(self.path(filename))
+        except (OSError, ValueError):
+            save_data = {}
+        if not isinstance(save_data, dict):
+            save_data = {}
+        return SlotInfo.from_save_data(filename, stat, save_data)
+
+    def slots(self) -> List[SlotInfo]:
+        """
+        Get every save slot, sorted by file name.
+
+        Entries that do not match the file on disk are refreshed, and the
+        manifest is rewritten if anything changed.
+
+        Returns:
+            Slot summaries
+        """
+        with self._lock:
+            manifest = self._read_manifest()
+            stale = manifest is None
+            slots = manifest or {}
+
+            current = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not is_save_file(entry.name) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    info = slots.get(entry.name)
+                    if info is None or info.mtime != stat.st_mtime or info.size != stat.st_size:
+                        info = self._scan(entry.name, stat)
+                        stale = True
+                    current[entry.name] = info
+
+            if stale or len(current) != len(slots):
+                self._write_manifest(current)
+        return [current[filename] for filename in sorted(current)]
+
+    def record(self, filename: str, save_data: Dict[str, Any]):
+        """
+        Update the manifest after a save has been written.
+
+        Args:
+            filename: Save file name, relative to the directory
+            save_data: The data that was saved
+        """
+        with self._lock:
+            slots = self._read_manifest()
+            if slots is not None:
+                slots[filename] = SlotInfo.from_save_data(filename, os.stat(self.path(filename)), save_data)
+                self._write_manifest(slots)
+                return
+        # Rebuild from a scan; that picks up the new save as well
+        self.slots()
+
+    def load(self, state: Any, filename: str) -> bool:
+        """
+        Load a slot into a game state.
+
+        Args:
+            state: GameState to overwrite
+            filename: Save file name, relative to the directory
+
+        Returns:
+            True if the save was loaded
+        """
+        return state.load_from_file(self.path(filename))
+
+    def save(self, state: Any, filename: str) -> bool:
+        """
+        Save a game state to a slot and record it in the manifest.
+
+        Args:
+            state: GameState to save
+            filename: Save file name, relative to the directory
+
+        Returns:
+            True if the save was written
+        """
+        return self.write(filename, state.to_dict())
+
+    def write(self, filename: str, save_data: Dict[str, Any], indent: Optional[int] = 2) -> bool:
+        """
+        Atomically write save data to a slot and record it in the manifest.
+
+        Args:
+            filename: Save file name, relative to the directory
+            save_data: Data from GameState.to_dict()
+            indent: JSON indentation; None writes compact JSON
+
+        Returns:
+            True if the save was written; the codec follows the file suffix
+        """
+        self._delta_bases.pop(filename, None)
+        try:
+            atomic_write(self.path(filename), dump_save(save_data, codec_for(filename), indent))
+        except Exception as e:
+            print(f"Error saving game: {e}")
+            return False
+        self.record(filename, save_data)
+        return True
+
+    def write_delta(self, filename: str, save_data: Dict[str, Any], base_every: int = DELTA_BASE_EVERY) -> bool:
+        """
+        Save to a binary slot by appending only the fields changed since the last save.
+
+        A full save is written instead for the first save to a slot in
+        this session, every base_every deltas, and whenever the file was
+        changed by anything else since the last delta.
+
+        Args:
+            filename: Save file name ending in .sav, relative to the directory
+            save_data: Data from GameState.to_dict(); kept to compare the
+                next save against, so it must not change afterwards
+            base_every: Deltas appended before the next full save
+
+        Returns:
+            True if the save was written
+        """
+        path = self.path(filename)
+        base = self._delta_bases.pop(filename, None)
+        try:
+            if base is not None:
+                previous, deltas, size = base
+                if deltas < base_every and os.path.getsize(path) == size:
+                    encoded = encode_delta(save_delta(previous, save_data))
+                    with open(path, 'ab') as f:
+                        f.write(encoded)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._delta_bases[filename] = (save_data, deltas + 1, size + len(encoded))
+                    self.record(filename, save_data)
+                    return True
+            encoded = encode_save(save_data)
+            atomic_write(path, encoded)
+        except Exception as e:
+            print(f"Error saving game: {e}")
+            return False
+        self._delta_bases[filename] = (save_data, 0, len(encoded))
+        self.record(filename, save_data)
+        return True
+
+
+# Global save slots for the working directory
+save_slots = SaveSlots()
@@ -0,0 +1,243 @@
+"""
+Save Store - SQLite save backend for hosted games
+
+SaveSlots keeps saves as loose files in one directory. For a server
+hosting many players, SqliteSaveStore keeps every save in one SQLite
+database instead: one row per (player, slot), with the slot summary in
+indexed columns and the state itself as a binary save (see
+save_codec.py) in a blob. Listing, filtering, sorting and pruning slots
+are indexed queries that never touch the blobs.
+
+The store offers the same slots(), load(), save(), write() and
+write_delta() methods as SaveSlots, so the game engine and the autosaver
+can use either.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from save_codec import encode_save
+from save_slots import SaveSlots, SlotInfo, save_slots
+
+SAVE_DB_FILE = 'saves.db'
+
+# Player the slots belong to when a store is not opened for a specific one
+DEFAULT_PLAYER = 'local'
+
+# Environment variables a hosted deployment sets to use the SQLite store
+SAVE_DB_ENV = 'SURVIVAL_SAVE_DB'
+SAVE_PLAYER_ENV = 'SURVIVAL_PLAYER'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    player TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    location TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    health REAL NOT NULL,
+    turn INTEGER NOT NULL,
+    rank TEXT NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (player, filename)
+);
+CREATE INDEX IF NOT EXISTS saves_by_time ON saves (player, saved_at);
+CREATE INDEX IF NOT EXISTS saves_by_days ON saves (player, days);
+CREATE INDEX IF NOT EXISTS saves_by_location ON saves (player, location);
+CREATE INDEX IF NOT EXISTS saves_by_rank ON saves (player, rank);
+"""
+
+# Columns slots() can sort by
+ORDER_COLUMNS = ("filename", "saved_at", "days", "location", "rank", "turn")
+
+# Summary columns, in SlotInfo argument order after the size
+_SUMMARY = "filename, saved_at, length(state), location, days, health, turn, rank"
+
+
+class SqliteSaveStore:
+    """Save slots for one player, stored in a SQLite database."""
+
+    def __init__(self, path: str = SAVE_DB_FILE, player: str = DEFAULT_PLAYER):
+        """
+        Open a save store, creating the database if needed.
+
+        Args:
+            path: Database file, or ":memory:"
+            player: Player whose slots this store reads and writes
+        """
+        self.path = path
+        self.player = player
+        # Written from the autosave thread as well as the menus
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def slots(self, order_by: str = "filename", descending: bool = False, location: Optional[str] = None,
+              rank: Optional[str] = None, min_days: Optional[int] = None,
+              limit: Optional[int] = None) -> List[SlotInfo]:
+        """
+        Get this player's save slots.
+
+        Args:
+            order_by: Column to sort by, one of ORDER_COLUMNS
+            descending: Sort from highest to lowest
+            location: Only slots saved at this location
+            rank: Only slots with this survivor rank
+            min_days: Only slots that survived at least this many days
+            limit: Return at most this many slots
+
+        Returns:
+            Slot summaries; mtime is the time the slot was saved
+
+        Raises:
+            ValueError: If order_by is not a sortable column
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot sort save slots by {order_by!r}")
+        query = f"SELECT {_SUMMARY} FROM saves WHERE player = ?"
+        params: List[Any] = [self.player]
+        if location is not None:
+            query += " AND location = ?"
+            params.append(location)
+        if rank is not None:
+            query += " AND rank = ?"
+            params.append(rank)
+        if min_days is not None:
+            query += " AND days >= ?"
+            params.append(min_days)
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, filename"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [SlotInfo(*row) for row in rows]
+
+    def load(self, state: Any, filename: str) -> bool:
+        """
+        Load a slot into a game state.
+
+        Args:
+            state: GameState to overwrite
+            filename: Slot name
+
+        Returns:
+            True if the save was loaded
+        """
+        with self._lock:
+            row = self._db.execute("SELECT state FROM saves WHERE player = ? AND filename = ?",
+                                   (self.player, filename)).fetchone()
+        if row is None:
+            return False
+        return state.load_from_bytes(row[0])
+
+    def save(self, state: Any, filename: str) -> bool:
+        """
+        Save a game state to a slot.
+
+        Args:
+            state: GameState to save
+            filename: Slot name
+
+        Returns:
+            True if the save was written
+        """
+        return self.write(filename, state.to_dict())
+
+    def write(self, filename: str, save_data: Dict[str, Any], indent: Optional[int] = None) -> bool:
+        """
+        Write save data to a slot, replacing any earlier save in it.
+
+        Args:
+            filename: Slot name
+            save_data: Data from GameState.to_dict()
+            indent: Unused; saves are always stored in the binary format
+
+        Returns:
+            True if the save was written
+        """
+        row = (self.player, filename, time.time(),
+               save_data.get("current_location", "Unknown"),
+               save_data.get("days_survived", 0),
+               save_data.get("health", 0),
+               save_data.get("turn_count", 0),
+               save_data.get("survivor_rank", "Rookie"),
+               encode_save(save_data))
+        try:
+            with self._lock, self._db:
+                self._db.execute("INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.Error as e:
+            print(f"Error saving game: {e}")
+            return False
+        return True
+
+    def write_delta(self, filename: str, save_data: Dict[str, Any], base_every: int = 0) -> bool:
+        """
+        Write save data to a slot; the store always replaces the whole row.
+
+        Args:
+            filename: Slot name
+            save_data: Data from GameState.to_dict()
+            base_every: Unused
+
+        Returns:
+            True if the save was written
+        """
+        return self.write(filename, save_data)
+
+    def delete(self, filename: str) -> bool:
+        """
+        Delete a slot.
+
+        Returns:
+            True if the slot existed
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM saves WHERE player = ? AND filename = ?",
+                                      (self.player, filename))
+        return cursor.rowcount > 0
+
+    def prune(self, keep: int) -> int:
+        """
+        Delete all but the most recently saved slots.
+
+        Args:
+            keep: Number of slots to keep
+
+        Returns:
+            Number of slots deleted
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM saves WHERE player = ? AND filename NOT IN ("
+                "SELECT filename FROM saves WHERE player = ? ORDER BY saved_at DESC, filename LIMIT ?)",
+                (self.player, self.player, keep))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+# Either save backend; both have the SaveSlots methods
+SaveBackend = Union[SaveSlots, SqliteSaveStore]
+
+
+def open_saves() -> SaveBackend:
+    """
+    Get the save backend for this process.
+
+    Returns:
+        A SqliteSaveStore if SURVIVAL_SAVE_DB names a database, for the
+        player named by SURVIVAL_PLAYER; otherwise the save files in the
+        working directory
+    """
+    path = os.environ.get(SAVE_DB_ENV)
+    if not path:
+        return save_slots
+    return SqliteSaveStore(path, os.environ.get(SAVE_PLAYER_ENV) or DEFAULT_PLAYER)
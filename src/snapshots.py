@@ -0,0 +1,128 @@
+"""
+Snapshots - In-memory copies of a game state for undo and look-ahead
+
+A GameSnapshot holds a game state as immutable values: survival stats as
+bytes, sets as bitmasks, lists as packed ID bytes, the inventory as a
+tuple of stacks. Nothing in a snapshot can change, so snapshots share
+those values freely. Consecutive snapshots of a state share every part
+that did not change in between, and a state restored or forked from a
+snapshot keeps sharing them until it is modified. UndoHistory keeps the
+last N turns of snapshots for a live state.
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Deque, Tuple
+
+from inventory import Inventory
+from symbols import SymbolList, SymbolListDict, SymbolSet
+
+# Fields copied as they are; each holds an immutable value or shared read-only data
+PLAIN_FIELDS = (
+    "max_inventory_weight", "current_location", "game_intro_shown", "turn_count", "game_start_time",
+    "zombie_kills", "days_survived", "survivor_rank", "experience_points", "skill_points",
+    "event_cooldown", "current_vehicle", "vehicle_condition", "_current_location_data"
+)
+SET_FIELDS = ("visited_locations", "discovered_items", "discovered_locations", "completed_events")
+LIST_FIELDS = ("vehicle_parts_collected", "towns_visited", "weapons", "armor")
+
+
+class GameSnapshot:
+    """Immutable copy of a game state."""
+
+    __slots__ = ("_stats", "_plain", "_inventory", "_sets", "_lists", "_parts_installed",
+                 "_skills", "_story_flags", "_active_events")
+
+    def __init__(self, state: Any):
+        """
+        Capture a game state.
+
+        Args:
+            state: GameState to copy
+        """
+        stats = state._stats
+        self._stats = (stats.typecode, stats.tobytes())
+        self._plain = tuple(getattr(state, name) for name in PLAIN_FIELDS)
+        self._inventory = state.inventory.freeze()
+        self._sets = tuple(getattr(state, name).freeze() for name in SET_FIELDS)
+        self._lists = tuple(getattr(state, name).freeze() for name in LIST_FIELDS)
+        self._parts_installed = state.vehicle_parts_installed.freeze()
+        self._skills = tuple(state.skills.items())
+        self._story_flags = tuple(state.story_flags.items())
+        # Events are replaced, never edited in place, so the dicts can be shared
+        self._active_events = tuple(state.active_events)
+
+    def restore(self, state: Any):
+        """
+        Overwrite a game state with this snapshot.
+
+        Args:
+            state: GameState to restore into; may be a fresh GameState.__new__() instance
+        """
+        typecode, stats = self._stats
+        state._stats = array(typecode)
+        state._stats.frombytes(stats)
+        for name, value in zip(PLAIN_FIELDS, self._plain):
+            setattr(state, name, value)
+        state.inventory = Inventory.thaw(self._inventory)
+        for name, frozen in zip(SET_FIELDS, self._sets):
+            setattr(state, name, SymbolSet.thaw(frozen))
+        for name, frozen in zip(LIST_FIELDS, self._lists):
+            setattr(state, name, SymbolList.thaw(frozen))
+        state.vehicle_parts_installed = SymbolListDict.thaw(self._parts_installed)
+        state.skills = dict(self._skills)
+        state.story_flags = dict(self._story_flags)
+        state.active_events = list(self._active_events)
+
+    @property
+    def turn_count(self) -> int:
+        """Turn the snapshot was taken on."""
+        return self._plain[PLAIN_FIELDS.index("turn_count")]
+
+
+class UndoHistory:
+    """Snapshots of the last few turns of a game state."""
+
+    def __init__(self, state: Any, depth: int = 10):
+        """
+        Set up an undo history.
+
+        Args:
+            state: GameState to record and restore
+            depth: Number of turns that can be undone
+        """
+        self.state = state
+        self._snapshots: Deque[GameSnapshot] = deque(maxlen=depth)
+
+    def record(self):
+        """Snapshot the state at the start of a turn."""
+        self._snapshots.append(self.state.snapshot())
+
+    def undo(self, turns: int = 1) -> bool:
+        """
+        Put the state back as it was at the start of an earlier turn.
+
+        Args:
+            turns: Number of recorded turns to go back
+
+        Returns:
+            True if the state was restored, False if not enough turns are recorded
+        """
+        if not 1 <= turns <= len(self._snapshots):
+            return False
+        for _ in range(turns - 1):
+            self._snapshots.pop()
+        self.state.restore(self._snapshots.pop())
+        return True
+
+    def clear(self):
+        """Forget all recorded turns, e.g. after loading a save."""
+        self._snapshots.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def turns(self) -> Tuple[int, ...]:
+        """Turn numbers that can be returned to, oldest first."""
+        return tuple(snapshot.turn_count for snapshot in self._snapshots)
@@ -0,0 +1,308 @@
+"""
+Symbols - Interned integer IDs for item and location names
+
+This module maps item and location names to small integers that are shared
+by every session in the process. GameState keeps its inventory, visited
+and discovered sets, vehicle parts and towns as these integers, and only
+turns them back into names when they are displayed or saved. The collections below keep the name-based interface
+of the list, set and dict they replace, so callers can keep writing
+`item in game_state.inventory`.
+"""
+
+import collections.abc
+import threading
+from array import array
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Array typecode for stored IDs (unsigned 32-bit)
+ID_TYPECODE = 'I'
+
+
+class SymbolTable:
+    """Two-way mapping between names and small integer IDs."""
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, name: str) -> int:
+        """
+        Get the ID for a name, assigning the next free one if it is new.
+
+        Args:
+            name: Item or location name
+
+        Returns:
+            The name's ID
+        """
+        symbol = self._ids.get(name)
+        if symbol is not None:
+            return symbol
+        with self._lock:
+            symbol = self._ids.get(name)
+            if symbol is None:
+                symbol = len(self._names)
+                self._names.append(name)
+                self._ids[name] = symbol
+            return symbol
+
+    def lookup(self, name: Any) -> Optional[int]:
+        """Get the ID for a name without assigning one, or None if it was never interned."""
+        return self._ids.get(name) if isinstance(name, str) else None
+
+    def name(self, symbol: int) -> str:
+        """Get the name for an ID."""
+        return self._names[symbol]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Global symbol table shared by every session
+symbols = SymbolTable()
+
+
+class SymbolList(collections.abc.MutableSequence):
+    """List of names stored as a compact array of symbol IDs."""
+
+    __slots__ = ("_table", "_ids", "_frozen")
+
+    def __init__(self, names: Iterable[str] = (), table: SymbolTable = symbols):
+        self._table = table
+        self._ids = array(ID_TYPECODE, (table.intern(name) for name in names))
+        self._frozen: Optional[bytes] = None
+
+    def freeze(self) -> bytes:
+        """Get an immutable copy of the IDs, shared until the list changes."""
+        if self._frozen is None:
+            self._frozen = self._ids.tobytes()
+        return self._frozen
+
+    @classmethod
+    def thaw(cls, frozen: bytes, table: SymbolTable = symbols) -> 'SymbolList':
+        """Rebuild a list from freeze() output."""
+        names = cls.__new__(cls)
+        names._table = table
+        names._ids = array(ID_TYPECODE)
+        names._ids.frombytes(frozen)
+        names._frozen = frozen
+        return names
+
+    @property
+    def ids(self) -> array:
+        """The underlying symbol IDs."""
+        return self._ids
+
+    def contains_id(self, symbol: int) -> bool:
+        """Check membership by symbol ID."""
+        return symbol in self._ids
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._table.name(symbol) for symbol in self._ids[index]]
+        return self._table.name(self._ids[index])
+
+    def __setitem__(self, index, value):
+        self._frozen = None
+        if isinstance(index, slice):
+            self._ids[index] = array(ID_TYPECODE, (self._table.intern(name) for name in value))
+        else:
+            self._ids[index] = self._table.intern(value)
+
+    def __delitem__(self, index):
+        self._frozen = None
+        del self._ids[index]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        name = self._table.name
+        return (name(symbol) for symbol in self._ids)
+
+    def __contains__(self, name: object) -> bool:
+        symbol = self._table.lookup(name)
+        return symbol is not None and symbol in self._ids
+
+    def insert(self, index: int, value: str):
+        self._frozen = None
+        self._ids.insert(index, self._table.intern(value))
+
+    def append(self, value: str):
+        self._frozen = None
+        self._ids.append(self._table.intern(value))
+
+    def remove(self, value: str):
+        symbol = self._table.lookup(value)
+        if symbol is None:
+            raise ValueError(f"{value!r} is not in list")
+        self._frozen = None
+        self._ids.remove(symbol)
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        symbol = self._table.lookup(value)
+        if symbol is None:
+            raise ValueError(f"{value!r} is not in list")
+        return self._ids.index(symbol, start, len(self._ids) if stop is None else stop)
+
+    def count(self, value: Any) -> int:
+        symbol = self._table.lookup(value)
+        return 0 if symbol is None else self._ids.count(symbol)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SymbolList):
+            return self._table is other._table and self._ids == other._ids
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SymbolList({list(self)!r})"
+
+
+class SymbolSet(collections.abc.MutableSet):
+    """Set of names stored as a set of symbol IDs."""
+
+    __slots__ = ("_table", "_ids")
+
+    def __init__(self, names: Iterable[str] = (), table: SymbolTable = symbols):
+        self._table = table
+        intern = table.intern
+        # A plain set of IDs, not a bitset: its size and lookup cost depend on
+        # the members alone, not on how many names the process has interned
+        self._ids: Set[int] = {intern(name) for name in names}
+
+    @classmethod
+    def _from_iterable(cls, names: Iterable[str]) -> 'SymbolSet':
+        return cls(names)
+
+    def freeze(self) -> FrozenSet[int]:
+        """Get the set as an immutable set of IDs."""
+        return frozenset(self._ids)
+
+    @classmethod
+    def thaw(cls, frozen: FrozenSet[int], table: SymbolTable = symbols) -> 'SymbolSet':
+        """Rebuild a set from freeze() output."""
+        names = cls.__new__(cls)
+        names._table = table
+        names._ids = set(frozen)
+        return names
+
+    @property
+    def ids(self) -> Tuple[int, ...]:
+        """The member symbol IDs, in ascending order."""
+        return tuple(sorted(self._ids))
+
+    def contains_id(self, symbol: int) -> bool:
+        """Check membership by symbol ID."""
+        return symbol in self._ids
+
+    def __contains__(self, name: object) -> bool:
+        symbol = self._table.lookup(name)
+        return symbol is not None and symbol in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        # Ascending IDs, i.e. the order names were first seen, so saves are stable
+        name = self._table.name
+        return (name(symbol) for symbol in sorted(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, value: str):
+        self._ids.add(self._table.intern(value))
+
+    def discard(self, value: str):
+        symbol = self._table.lookup(value)
+        if symbol is not None:
+            self._ids.discard(symbol)
+
+    def __repr__(self) -> str:
+        return f"SymbolSet({set(self)!r})"
+
+
+class SymbolListDict(collections.abc.MutableMapping):
+    """Dict from names to lists of names, e.g. vehicle parts installed per location."""
+
+    __slots__ = ("_table", "_lists")
+
+    def __init__(self, items: Optional[Dict[str, Iterable[str]]] = None, table: SymbolTable = symbols):
+        self._table = table
+        self._lists: Dict[int, SymbolList] = {}
+        for key, names in (items or {}).items():
+            self[key] = names
+
+    def __getitem__(self, key: str) -> SymbolList:
+        symbol = self._table.lookup(key)
+        if symbol is None or symbol not in self._lists:
+            raise KeyError(key)
+        return self._lists[symbol]
+
+    def __setitem__(self, key: str, names: Iterable[str]):
+        if not isinstance(names, SymbolList):
+            names = SymbolList(names, self._table)
+        self._lists[self._table.intern(key)] = names
+
+    def __delitem__(self, key: str):
+        symbol = self._table.lookup(key)
+        if symbol is None or symbol not in self._lists:
+            raise KeyError(key)
+        del self._lists[symbol]
+
+    def __iter__(self) -> Iterator[str]:
+        name = self._table.name
+        return (name(symbol) for symbol in self._lists)
+
+    def __len__(self) -> int:
+        return len(self._lists)
+
+    def freeze(self) -> Tuple[Tuple[int, bytes], ...]:
+        """Get an immutable copy as (key ID, frozen list) pairs."""
+        return tuple((symbol, names.freeze()) for symbol, names in self._lists.items())
+
+    @classmethod
+    def thaw(cls, frozen: Tuple[Tuple[int, bytes], ...], table: SymbolTable = symbols) -> 'SymbolListDict':
+        """Rebuild a dict from freeze() output."""
+        lists = cls.__new__(cls)
+        lists._table = table
+        lists._lists = {symbol: SymbolList.thaw(names, table) for symbol, names in frozen}
+        return lists
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Convert back to plain names, e.g. for saving."""
+        return {key: list(names) for key, names in self.items()}
+
+    def __repr__(self) -> str:
+        return f"SymbolListDict({self.to_dict()!r})"
+
+
+class SymbolField:
+    """
+    Attribute that stores its value as a symbol collection.
+
+    Assigning a plain list, set or dict converts it, so code like
+    `state.inventory = save_data.get("inventory", [])` keeps working.
+    """
+
+    def __init__(self, factory: Callable[[Any], Any]):
+        """
+        Args:
+            factory: Symbol collection class to convert assigned values with
+        """
+        self.factory = factory
+        self.attr = ""
+
+    def __set_name__(self, owner: type, name: str):
+        self.attr = "_" + name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self.attr)
+
+    def __set__(self, obj: Any, value: Any):
+        if not isinstance(value, self.factory):
+            value = self.factory(value)
+        setattr(obj, self.attr, value)
@@ -9,13 +9,37 @@ import unittest
 import tempfile
 import os
 import json
+import sys
+import time
+import io
 from unittest.mock import patch, MagicMock
 
 # Import game modules
 from game_state import GameState
-from combat_system import CombatSystem, Zombie
-from Functions.read_location_data import read_location_data, get_default_locations
+from combat_system import (ABANDONED, BITE, CAUGHT, DEFEAT, ESCAPE, FLED, FLEE, HIT, KILL, MISS, NO_AMMO, VICTORY,
+                           CombatSystem, Zombie, resolve)
+from Functions.read_location_data import read_location_data, get_default_locations, validate_location_data
 from Functions.check_inventory import check_inventory, get_item_info
+from location_graph import NO_NODE, LocationGraph
+from world_compiler import CompiledWorld, WorldFormatError, compile_world, load_compiled_world
+from world_index import WorldCache, WorldIndex
+from world_shards import ShardedWorld, compile_sharded_world
+from world_generator import CANNED_WORLDS, generate_world
+from world_watcher import WorldWatcher, apply_diff, diff_world
+from symbols import SymbolList, SymbolListDict, SymbolSet, SymbolTable, symbols
+from action_dispatch import MOVE_LONG, MOVE_SHORT, REST, SEARCH, ActionTable, match_action_name
+from loot_tables import LootTable, loot_table
+from item_catalog import ItemCatalog, item_catalog
+from inventory import Inventory
+from snapshots import UndoHistory
+from journal import PREVIOUS_SUFFIX, Journal, recover, unfinished_session
+from save_slots import MANIFEST_FILE, SaveSlots
+from autosave import Autosaver
+from combat_odds import HAVE_NUMPY, OUTCOMES, auto_resolve, clear_cache, compute_odds, get_odds
+from horde import HAVE_NUMPY as HAVE_HORDES, Horde, resolve_horde
+from combat_simulator import main as simulator_main, mean_interval, simulate_grid, wilson_interval
+from save_store import SqliteSaveStore
+from save_codec import BINARY, JSON, MAGIC, SaveFormatError, decode_save, encode_save, save_delta
 
 
 class TestGameState(unittest.TestCase):
@@ -238,6 +262,280 @@ class TestCombatSystem(unittest.TestCase):
         self.assertTrue(can_use)
 
 
+class TestCombatResolver(unittest.TestCase):
+    """Test fighting without a terminal."""
+
+    def test_resolve_is_deterministic_and_pure(self):
+        """Test that a seeded fight repeats exactly and leaves the game state alone."""
+        import random
+        with patch("combat_system.game_state") as mock_game_state:
+            fights = [resolve(Zombie("brute"), lambda fight: "fists", random.Random(7), health=100)
+                      for _ in range(2)]
+            self.assertEqual(mock_game_state.mock_calls, [])
+        self.assertEqual(fights[0].events, fights[1].events)
+        self.assertIn(fights[0].outcome, (VICTORY, DEFEAT))
+
+        fight = fights[0]
+        self.assertEqual({event[0] for event in fight.events} - {MISS, HIT, KILL, BITE}, set())
+        self.assertEqual(fight.health, max(0, 100 - sum(event[2] for event in fight.events if event[0] == BITE)))
+        self.assertEqual(fight.health, fight.events[-1][4])
+
+    def test_policies_flee_abandon_and_ammunition(self):
+        """Test fleeing, breaking off, and weapons that use ammunition."""
+        import random
+        rng = random.Random(3)
+        for _ in range(20):
+            fight = resolve(Zombie("runner"), lambda fight: FLEE, rng)
+            self.assertIn(fight.outcome, (FLED, DEFEAT))
+            self.assertEqual({event[0] for event in fight.events} - {ESCAPE, CAUGHT}, set())
+            for event in fight.events:
+                if event[0] == CAUGHT:
+                    self.assertLessEqual(event[2], 12)
+
+        self.assertEqual(resolve(Zombie(), lambda fight: None, rng).outcome, ABANDONED)
+
+        fight = resolve(Zombie("brute"), lambda fight: "pistol" if fight.rounds < 2 else None, rng,
+                        weapons=("fists", "pistol"), ammunition={"bullets": 0})
+        self.assertEqual([event[0] for event in fight.events if event[0] != BITE], [NO_AMMO, NO_AMMO])
+        self.assertEqual(fight.outcome, ABANDONED)
+
+        ammunition = {"bullets": 10}
+        fight = resolve(Zombie("brute"), lambda fight: "pistol", rng, health=1000, ammunition=ammunition)
+        shots = sum(1 for event in fight.events if event[0] in (HIT, KILL))
+        self.assertEqual(fight.ammunition["bullets"], 10 - shots)
+        self.assertEqual(ammunition, {"bullets": 10})
+
+    def test_interactive_encounter_applies_result(self):
+        """Test that the terminal encounter is a UI over resolve()."""
+        import random
+        state = GameState()
+        system = CombatSystem()
+        with patch("combat_system.game_state", state), patch("combat_system.random", random.Random(5)), \
+                patch("builtins.input", side_effect=["3", "9", "1", "1"] * 20), patch("builtins.print"):
+            result = system.run_combat_encounter(Zombie("crawler"))
+        self.assertTrue(result["victory"])
+        self.assertEqual(state.zombie_kills, 1)
+        self.assertEqual(state.experience_points, 15)
+        self.assertIn("kill it", result["combat_log"][-1])
+        bites = [line for line in result["combat_log"] if "attacks you" in line]
+        self.assertEqual(state.health, 100 - sum(int(line.split(" for ")[1].split()[0]) for line in bites))
+
+
+class TestCombatSimulator(unittest.TestCase):
+    """Test the Monte Carlo combat simulator."""
+
+    def test_confidence_intervals(self):
+        """Test the Wilson and mean intervals against known values."""
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(low, 0.2366, places=4)
+        self.assertAlmostEqual(high, 0.7634, places=4)
+        low, high = wilson_interval(0, 10)
+        self.assertEqual(low, 0.0)
+        self.assertAlmostEqual(high, 0.2775, places=4)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+        values = [2, 4, 4, 4, 5, 5, 7, 9]
+        mean, low, high = mean_interval(sum(values), sum(v * v for v in values), len(values))
+        self.assertEqual(mean, 5)
+        self.assertAlmostEqual(high - mean, 1.959964 * (32 / 7 / 8) ** 0.5)
+
+    def test_grid_is_reproducible(self):
+        """Test that a sweep covers every cell, accounts for every fight and repeats exactly."""
+        args = (["fists", "pistol"], ["walker", "brute"], [100, 40], 300)
+        cells = simulate_grid(*args, seed=4, workers=1, chunk_size=128)
+        self.assertEqual(len(cells), 8)
+        for cell in cells:
+            self.assertEqual(cell.fights, 300)
+            self.assertEqual(cell.wins + cell.fled + cell.deaths, 300)
+            summary = cell.to_dict()
+            rate, low, high = summary["win_rate"]
+            self.assertLessEqual(low, rate)
+            self.assertLessEqual(rate, high)
+            self.assertGreater(summary["rounds"][0], 0)
+        again = simulate_grid(*args, seed=4, workers=1, chunk_size=128)
+        self.assertEqual([cell.to_dict() for cell in cells], [cell.to_dict() for cell in again])
+
+        by_cell = {cell.key: cell for cell in cells}
+        self.assertGreater(by_cell["pistol", "walker", 100].wins, by_cell["fists", "walker", 100].wins)
+        with self.assertRaises(ValueError):
+            simulate_grid(["laser"], ["walker"], [100], 10, workers=1)
+
+    def test_process_pool_matches_single_process(self):
+        """Test that the worker count does not change the results."""
+        args = (["axe"], ["runner", "crawler"], [60], 200)
+        local = simulate_grid(*args, seed=1, workers=1, chunk_size=50)
+        pooled = simulate_grid(*args, seed=1, workers=2, chunk_size=50)
+        self.assertEqual([cell.to_dict() for cell in local], [cell.to_dict() for cell in pooled])
+
+        with patch("sys.stdout", new_callable=io.StringIO) as out, \
+                patch("sys.stderr"):
+            self.assertEqual(simulator_main(["--fights", "20", "--weapons", "axe", "--zombies", "walker",
+                                             "--health", "100", "--workers", "1", "--json"]), 0)
+        self.assertEqual(json.loads(out.getvalue())[0]["fights"], 20)
+
+
+@unittest.skipIf(not HAVE_NUMPY, "NumPy is not installed")
+class TestCombatOdds(unittest.TestCase):
+    """Test the exact combat outcome distributions."""
+
+    def test_odds_match_simulation(self):
+        """Test that the exact odds add up and agree with simulated fights."""
+        odds = compute_odds("axe", "brute", 100, flee_below=25)
+        self.assertAlmostEqual(sum(odds.probabilities.values()), 1.0)
+        self.assertAlmostEqual(odds.rounds_distribution().sum(), 1.0)
+        self.assertEqual(odds.rounds_distribution()[0], 0)
+
+        cell = simulate_grid(["axe"], ["brute"], [100], 4000, seed=2, flee_below=25, workers=1)[0]
+        for outcome, count in zip(OUTCOMES, (cell.wins, cell.fled, cell.deaths)):
+            self.assertAlmostEqual(odds.probabilities[outcome], count / cell.fights, delta=0.03)
+        self.assertAlmostEqual(odds.mean_rounds(), cell.rounds / cell.fights, delta=0.15)
+
+        # Fists never get through a brute before it kills a player who will not run
+        never_run = compute_odds("fists", "brute", 100)
+        self.assertAlmostEqual(never_run.probabilities[DEFEAT], 1.0)
+
+    def test_cache_buckets_health(self):
+        """Test that odds are cached per setup, with health rounded up to whole points."""
+        clear_cache()
+        odds = get_odds("hunting knife", "runner", 72.5, 25)
+        self.assertIs(get_odds("hunting knife", "runner", 73, 25), odds)
+        self.assertIsNot(get_odds("hunting knife", "runner", 73, 0), odds)
+        self.assertEqual(odds.health, 73)
+        self.assertEqual(odds.zombie_health, 25)
+        clear_cache()
+        self.assertIsNot(get_odds("hunting knife", "runner", 73, 25), odds)
+        with self.assertRaises(ValueError):
+            get_odds("laser", "runner", 50)
+
+    def test_auto_resolve(self):
+        """Test that auto-resolved fights follow the odds and update the zombie."""
+        import random
+        rng = random.Random(7)
+        odds = get_odds("baseball bat", "walker", 60, 25)
+        counts = {outcome: 0 for outcome in OUTCOMES}
+        for _ in range(5000):
+            outcome, rounds, health = odds.sample(rng)
+            counts[outcome] += 1
+            self.assertGreater(rounds, 0)
+            self.assertEqual(health == 0, outcome == DEFEAT)
+        for outcome in OUTCOMES:
+            self.assertAlmostEqual(counts[outcome] / 5000, odds.probabilities[outcome], delta=0.03)
+
+        zombie = Zombie("crawler")
+        outcome, _, _ = auto_resolve(zombie, "axe", 100, rng, flee_below=0)
+        self.assertEqual(outcome, VICTORY)
+        self.assertFalse(zombie.is_alive)
+
+        # Fractional health is not rounded up in the result
+        for _ in range(200):
+            outcome, _, health = auto_resolve(Zombie("walker"), "baseball bat", 47.3, rng)
+            self.assertLessEqual(health, 47.3)
+            if outcome != DEFEAT:
+                self.assertAlmostEqual(health % 1, 0.3)
+
+
+@unittest.skipIf(not HAVE_HORDES, "NumPy is not installed")
+class TestHorde(unittest.TestCase):
+    """Test fights against hordes of zombies."""
+
+    def test_horde_arrays_and_area_damage(self):
+        """Test the parallel zombie arrays, targeting and area attacks."""
+        import numpy as np
+        horde = Horde(["walker", "crawler", "runner", "brute", "walker"])
+        self.assertEqual(list(horde.speed), [3, 2, 1, 1, 1])
+        self.assertEqual(list(horde.health), [25, 15, 30, 60, 30])
+        self.assertEqual(horde.counts(), {"walker": 2, "runner": 1, "brute": 1, "crawler": 1})
+        self.assertAlmostEqual(horde.escape_chance(), 0.6)
+
+        # The weakest zombie the player can reach is the crawler
+        self.assertEqual(horde.target(), 1)
+        self.assertEqual(horde.take_damage(np.array([0, 1]), np.array([10, 15])), 1)
+        self.assertEqual(horde.remaining, 4)
+        self.assertEqual(list(horde.front()), [0, 2])
+        self.assertAlmostEqual(horde.escape_chance(), 0.6)
+        horde.take_damage(np.array([0]), np.array([15]))
+        self.assertAlmostEqual(horde.escape_chance(), 0.75)
+
+        # A shotgun blast hits the target and three more for half damage
+        horde = Horde(["walker"] * 6)
+        fight = resolve_horde(horde, lambda fight: "shotgun" if not fight.events else None,
+                              np.random.default_rng(0), ammunition={"shells": 1})
+        kind, _, damage, kills, remaining, _ = fight.events[0]
+        self.assertEqual((kind, kills, remaining), (KILL, 1, 5))
+        self.assertEqual(min(horde.health), 0)
+        self.assertTrue(42 + 3 * 21 <= damage <= 48 + 3 * 24)
+        for health in sorted(horde.health)[1:4]:
+            self.assertTrue(30 - 24 <= health <= 30 - 21)
+        self.assertEqual(list(horde.health).count(30), 2)
+        self.assertEqual(fight.ammunition["shells"], 0)
+        with self.assertRaises(ValueError):
+            Horde(["walker", "ghoul"])
+
+    def test_resolve_horde(self):
+        """Test that horde fights repeat with a seed and account for every zombie."""
+        import numpy as np
+        fights = [resolve_horde(Horde(["walker", "runner"] * 100), lambda fight: "axe",
+                                np.random.default_rng(3), health=10 ** 6) for _ in range(2)]
+        self.assertEqual(fights[0].events, fights[1].events)
+        fight = fights[0]
+        self.assertEqual(fight.outcome, VICTORY)
+        self.assertEqual(fight.kills, 200)
+        self.assertFalse(fight.horde.alive.any())
+        self.assertEqual(fight.health, 10 ** 6 - sum(event[2] for event in fight.events if event[0] == BITE))
+        # No more than the front of the horde bites at once
+        self.assertLessEqual(max(event[2] for event in fight.events if event[0] == BITE), 2 * 25)
+
+        fight = resolve_horde(Horde(["brute"] * 50), lambda fight: FLEE, np.random.default_rng(1))
+        self.assertIn(fight.outcome, (FLED, DEFEAT))
+        cells = simulate_grid(["shotgun", "axe"], ["walker"], [100], 200, seed=2, workers=1, horde=6)
+        self.assertGreater(cells[0].wins, cells[1].wins)
+        self.assertEqual([cell.fights for cell in cells], [200, 200])
+
+    def test_horde_warning_encounters(self):
+        """Test that a horde warning makes encounters likelier and turns them into hordes."""
+        import random
+        state = GameState()
+        system = CombatSystem()
+        rng = random.Random(2)
+        rng.random = lambda: 0.15
+        with patch("combat_system.game_state", state), patch("combat_system.random", rng):
+            self.assertIsNone(system.check_for_zombie_encounter("Abandoned Gas Station"))
+            state.add_event({"id": "horde_warning", "effect": "increased_zombie_chance"})
+            horde = system.check_for_zombie_encounter("Abandoned Gas Station")
+        self.assertIsInstance(horde, Horde)
+        self.assertTrue(4 <= len(horde) <= 10)
+
+    def test_horde_warning_ends_after_duration(self):
+        """Test that hordes stop once the warning's duration has been counted down."""
+        import random
+        state = GameState()
+        system = CombatSystem()
+        rng = random.Random(2)
+        rng.random = lambda: 0.15
+        state.add_event({"id": "horde_warning", "effect": "increased_zombie_chance", "duration": 2})
+        state.count_down_events()
+        self.assertEqual(state.active_events[0]["duration"], 1)
+        with patch("combat_system.game_state", state), patch("combat_system.random", rng):
+            self.assertIsInstance(system.check_for_zombie_encounter("Abandoned Gas Station"), Horde)
+            state.count_down_events()
+            self.assertIsNone(system.check_for_zombie_encounter("Abandoned Gas Station"))
+        self.assertEqual(state.active_events, [])
+        self.assertIn("horde_warning", state.completed_events)
+
+        state.add_item("shotgun")
+        system.ammunition["shells"] = 20
+        with patch("combat_system.game_state", state), patch("combat_system.random", random.Random(5)), \
+                patch("builtins.input", side_effect=["1", "2"] * 40), patch("builtins.print"):
+            result = system.run_combat_encounter(Horde(["crawler"] * 5))
+        self.assertTrue(result["victory"])
+        self.assertEqual(state.zombie_kills, 5)
+        self.assertEqual(state.experience_points, 75)
+        self.assertEqual(system.ammunition["shells"], 18)
+        self.assertIn("0 zombies remaining", result["combat_log"][-1])
+        bites = [line for line in result["combat_log"] if "claws at you" in line]
+        self.assertEqual(state.health, 100 - sum(int(line.split(" for ")[1].split()[0]) for line in bites))
+
+
 class TestLocationData(unittest.TestCase):
     """Test location data functions."""
     
@@ -295,6 +593,1238 @@ class TestLocationData(unittest.TestCase):
                 os.unlink(temp_filename)
 
 
+class TestWorldIndex(unittest.TestCase):
+    """Test the shared world index and its cache."""
+
+    def setUp(self):
+        """Set up a temporary locations file."""
+        self.test_data = [
+            {"name": "Alpha", "description": "First", "nearby_short": ["Beta"]},
+            {"name": "Beta", "description": "Second", "nearby_short": ["Alpha"]}
+        ]
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(self.test_data, f)
+            self.temp_filename = f.name
+
+    def tearDown(self):
+        """Remove the temporary locations file."""
+        if os.path.exists(self.temp_filename):
+            os.unlink(self.temp_filename)
+
+    def test_lookup_by_name(self):
+        """Test O(1) lookup and read-only location data."""
+        world = WorldIndex(self.test_data)
+
+        self.assertEqual(len(world), 2)
+        self.assertEqual(world.get("Beta")["description"], "Second")
+        self.assertIsNone(world.get("Gamma"))
+        self.assertIn("Alpha", world)
+        self.assertEqual(world.get("Alpha")["nearby_short"], ("Beta",))
+        with self.assertRaises(TypeError):
+            world.get("Alpha")["description"] = "Changed"
+
+    def test_cache_loads_once(self):
+        """Test that repeated access does not reload the file."""
+        cache = WorldCache()
+        with patch('world_index.find_location_file', return_value=self.temp_filename):
+            first = cache.get()
+            for _ in range(5):
+                self.assertIs(cache.get(), first)
+
+        stats = cache.stats()
+        self.assertEqual(stats["loads"], 1)
+        self.assertEqual(stats["hits"], 5)
+        self.assertEqual(stats["locations"], 2)
+
+    def test_refresh_on_mtime_change(self):
+        """Test that refresh only reloads when the file changes."""
+        cache = WorldCache()
+        with patch('world_index.find_location_file', return_value=self.temp_filename):
+            cache.get()
+            self.assertFalse(cache.refresh())
+
+            self.test_data.append({"name": "Gamma", "description": "Third"})
+            with open(self.temp_filename, 'w') as f:
+                json.dump(self.test_data, f)
+            stat = os.stat(self.temp_filename)
+            os.utime(self.temp_filename, (stat.st_atime, stat.st_mtime + 10))
+
+            self.assertTrue(cache.refresh())
+            self.assertIn("Gamma", cache.get())
+        self.assertEqual(cache.loads, 2)
+
+
+class TestLocationGraph(unittest.TestCase):
+    """Test the compiled location graph."""
+
+    def setUp(self):
+        """Set up a small two-town world."""
+        self.graph = LocationGraph([
+            {"name": "Square", "description": "", "town": "A",
+             "nearby_short": ["Store", "Farm"], "nearby_long": ["Depot"],
+             "hidden_location": "Vault"},
+            {"name": "Store", "description": "", "town": "A", "nearby_short": ["Square"]},
+            {"name": "Vault", "description": "", "town": "A", "hidden": True,
+             "requires_item": "old key", "nearby_short": ["Square"]},
+            {"name": "Depot", "description": "", "town": "B", "nearby_short": []}
+        ])
+
+    def test_node_ids_and_adjacency(self):
+        """Test ID assignment and adjacency arrays."""
+        graph = self.graph
+        square = graph.id_of("Square")
+
+        self.assertEqual(square, 0)
+        self.assertEqual([graph.name_of(n) for n in graph.neighbors_short(square)], ["Store", "Farm"])
+        self.assertEqual([graph.name_of(n) for n in graph.neighbors_long(square)], ["Depot"])
+        self.assertEqual(graph.name_of(graph.hidden_location[square]), "Vault")
+        self.assertEqual(graph.hidden_location[graph.id_of("Store")], NO_NODE)
+
+    def test_dangling_reference(self):
+        """Test that names without a location entry get an empty node."""
+        farm = self.graph.id_of("Farm")
+
+        self.assertIsNotNone(farm)
+        self.assertFalse(self.graph.has_location(farm))
+        self.assertEqual(self.graph.neighbors_short(farm), ())
+        self.assertEqual(self.graph.town_of(farm), "")
+
+    def test_hidden_and_unlock_indexes(self):
+        """Test the town->hidden and item->unlock indexes."""
+        vault = self.graph.id_of("Vault")
+
+        self.assertEqual(self.graph.hidden_in_town("A"), (vault,))
+        self.assertEqual(self.graph.hidden_in_town("B"), ())
+        self.assertEqual(self.graph.unlocked_by("old key"), (vault,))
+        self.assertEqual(self.graph.unlocked_by("flowers"), ())
+        self.assertTrue(self.graph.is_hidden(vault))
+
+
+class TestWorldCompiler(unittest.TestCase):
+    """Test the compiled binary world format."""
+
+    def setUp(self):
+        """Set up a temporary output directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "locations.zworld")
+        self.test_data = [
+            {"name": "Square", "description": "Town square", "town": "A",
+             "nearby_short": ["Vault", "Farm"], "zombie_chance": 0.25, "rest_bonus": -3,
+             "actions": [{"name": "Look around", "description": "Look"}]},
+            {"name": "Vault", "description": "A vault", "town": "A", "hidden": True,
+             "requires_item": "old key", "nearby_short": ["Square"], "shelter": True}
+        ]
+
+    def tearDown(self):
+        """Remove the temporary output directory."""
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that compiled locations and graph match the source data."""
+        stats = compile_world(self.test_data, self.output)
+        world = load_compiled_world(self.output)
+
+        self.assertEqual(stats["locations"], 2)
+        self.assertEqual(len(world), 2)
+        square = world.get("Square")
+        self.assertEqual(square["zombie_chance"], 0.25)
+        self.assertEqual(square["rest_bonus"], -3)
+        self.assertEqual(square["actions"][0]["name"], "Look around")
+        self.assertIsNone(world.get("Farm"))
+
+        graph = world.graph
+        self.assertEqual([graph.name_of(n) for n in graph.neighbors_short(0)], ["Vault", "Farm"])
+        self.assertEqual(graph.unlocked_by("old key"), (graph.id_of("Vault"),))
+        self.assertEqual(graph.hidden_in_town("A"), (graph.id_of("Vault"),))
+        self.assertTrue(graph.is_hidden(graph.id_of("Vault")))
+
+    def test_lazy_descriptions(self):
+        """Test that long text is decoded on access through a bounded cache."""
+        locations = [
+            {"name": f"Place {i}", "description": f"A long description of place number {i}. " * 3,
+             "actions": [{"name": "Look around", "description": "Look"}]}
+            for i in range(10)
+        ]
+        compile_world(locations, self.output)
+        compiled = CompiledWorld(self.output)
+        compiled.texts.cache_size = 3
+
+        self.assertEqual(compiled.texts.misses, 0)
+        for i, location in enumerate(compiled.locations):
+            self.assertEqual(location["description"], locations[i]["description"])
+            self.assertEqual(dict(location["actions"][0]), locations[i]["actions"][0])
+
+        self.assertLessEqual(len(compiled.texts), 3)
+        self.assertEqual(compiled.texts.misses, 10)
+
+    def test_rejects_invalid_data(self):
+        """Test that the compiler validates the world."""
+        with self.assertRaises(ValueError):
+            compile_world([{"name": "No description"}], self.output)
+
+    def test_rejects_other_versions(self):
+        """Test that files from another format version are refused."""
+        compile_world(self.test_data, self.output)
+        with open(self.output, 'r+b') as f:
+            f.seek(4)
+            f.write(b"\xff\x00")
+
+        with self.assertRaises(WorldFormatError):
+            load_compiled_world(self.output)
+
+
+class TestShardedWorld(unittest.TestCase):
+    """Test per-town shard loading and eviction."""
+
+    def setUp(self):
+        """Compile a four-town world into shards."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "locations.zshards")
+        locations = []
+        for town in ["A", "B", "C", "D"]:
+            locations.append({"name": f"{town} Square", "description": f"Square of {town}", "town": town,
+                              "nearby_short": [f"{town} Store"], "nearby_long": []})
+            locations.append({"name": f"{town} Store", "description": f"Store of {town}", "town": town,
+                              "nearby_short": [f"{town} Square"], "actions": [{"name": "Search the store"}]})
+        locations[0]["nearby_long"] = ["B Square"]
+        locations.append({"name": "A Cellar", "description": "Cellar", "town": "A", "hidden": True,
+                          "requires_item": "cellar key"})
+        self.stats = compile_sharded_world(locations, self.output)
+        self.manifest = os.path.join(self.output, "manifest.json")
+
+    def tearDown(self):
+        """Remove the compiled shards."""
+        self.temp_dir.cleanup()
+
+    def test_lookup_loads_only_needed_towns(self):
+        """Test that lookups map only the shard they need."""
+        world = ShardedWorld(self.manifest)
+
+        self.assertEqual(self.stats["towns"], 4)
+        self.assertEqual(len(world), 9)
+        self.assertEqual(world.resident_towns, [])
+        self.assertEqual(world.get("C Store")["description"], "Store of C")
+        self.assertEqual(world.resident_towns, ["C"])
+        self.assertEqual(world.town_of("D Square"), "D")
+        self.assertEqual(world.unlocked_by("cellar key"), ("A Cellar",))
+        self.assertEqual(world.resident_towns, ["C"])
+
+    def test_loading_a_shard_binds_its_searches(self):
+        """Test that search outcomes are resolved as each shard is mapped."""
+        world = ShardedWorld(self.manifest)
+        keys = [("c store", "search the store"), ("d store", "search the store")]
+        for key in keys:
+            loot_table._outcomes.pop(key, None)
+
+        world.get("C Store")
+        self.assertIn(keys[0], loot_table._outcomes)
+        self.assertNotIn(keys[1], loot_table._outcomes)
+
+    def test_activate_pins_neighbours_and_evicts(self):
+        """Test that activation keeps the current and reachable towns within budget."""
+        world = ShardedWorld(self.manifest, memory_budget=1)
+        world.get("C Store")
+        world.get("D Store")
+
+        world.activate("A Square")
+        world.wait_for_prefetch()
+
+        self.assertEqual(sorted(world.resident_towns), ["A", "B"])
+        self.assertGreaterEqual(world.evictions, 2)
+        graph = world.graph_for("A Square")
+        self.assertEqual([graph.name_of(n) for n in graph.neighbors_short(graph.id_of("A Square"))],
+                         ["A Store"])
+
+    def test_prefetch_in_background(self):
+        """Test that a destination's shard can be loaded ahead of travel."""
+        world = ShardedWorld(self.manifest)
+        world.prefetch("D Square")
+        world.wait_for_prefetch()
+
+        self.assertIn("D", world.resident_towns)
+        self.assertEqual(world.shard_loads, 1)
+
+
+class TestWorldGenerator(unittest.TestCase):
+    """Test the procedural world generator."""
+
+    def test_same_seed_same_world(self):
+        """Test that generation is deterministic for a seed."""
+        self.assertEqual(generate_world(seed=5, towns=3), generate_world(seed=5, towns=3))
+        self.assertNotEqual(generate_world(seed=5, towns=3), generate_world(seed=6, towns=3))
+
+    def test_world_is_valid_and_connected(self):
+        """Test that generated worlds match the schema and have no dangling references."""
+        locations = generate_world(seed=1, towns=5, locations_per_town=20, degree=4,
+                                   hidden_chance=0.3, vehicle_chance=0.3)
+        validate_location_data(locations)
+        index = WorldIndex(locations)
+        graph = index.graph
+
+        self.assertEqual(graph.location_count, len(graph.names))
+        self.assertEqual(sum(1 for loc in locations if not loc.get("hidden")), 100)
+        for location in locations:
+            if location.get("hidden"):
+                self.assertIn(location["name"], index.unlocked_by(location["requires_item"]))
+            else:
+                self.assertGreaterEqual(len(location["nearby_short"]), 2)
+        self.assertTrue(any(loc.get("has_repairable_vehicle") for loc in locations))
+
+    def test_canned_worlds(self):
+        """Test that the canned worlds are defined with fixed seeds."""
+        self.assertIn("large", CANNED_WORLDS)
+        for settings in CANNED_WORLDS.values():
+            self.assertIn("seed", settings)
+        with self.assertRaises(ValueError):
+            generate_world(towns=0)
+
+
+class TestWorldWatcher(unittest.TestCase):
+    """Test hot reload of world data."""
+
+    def setUp(self):
+        """Build a small world with a hidden location."""
+        self.locations = [
+            {"name": "Square", "description": "Town square", "town": "A", "nearby_short": ["Store"],
+             "hidden_location": "Cellar"},
+            {"name": "Store", "description": "A store", "town": "A", "nearby_short": ["Square"]},
+            {"name": "Cellar", "description": "A cellar", "town": "A", "hidden": True,
+             "requires_item": "cellar key"}
+        ]
+        self.world = WorldIndex(self.locations)
+
+    def test_content_change_patches_only_changed_entries(self):
+        """Test that an edit reuses unchanged records and patches the graph."""
+        new_locations = json.loads(json.dumps(self.locations))
+        new_locations[1]["description"] = "A looted store"
+        new_locations[1]["nearby_short"] = ["Square", "Gas Station"]
+        new_locations[2]["requires_item"] = "crowbar"
+
+        diff = diff_world(self.world, new_locations)
+        self.assertEqual(diff.changed, ["Store", "Cellar"])
+        self.assertFalse(diff.structural)
+
+        new_world = apply_diff(self.world, new_locations, diff)
+        self.assertIs(new_world.get("Square"), self.world.get("Square"))
+        self.assertEqual(new_world.get("Store")["description"], "A looted store")
+        graph = new_world.graph
+        self.assertEqual([graph.name_of(n) for n in graph.neighbors_short(graph.id_of("Store"))],
+                         ["Square", "Gas Station"])
+        self.assertEqual(new_world.unlocked_by("crowbar"), ("Cellar",))
+        self.assertEqual(new_world.unlocked_by("cellar key"), ())
+        # The old world is untouched for sessions still reading it
+        self.assertEqual(self.world.get("Store")["description"], "A store")
+        self.assertEqual(self.world.unlocked_by("cellar key"), ("Cellar",))
+
+    def test_added_location_rebuilds_graph(self):
+        """Test that adding a location is applied as a structural change."""
+        new_locations = self.locations + [{"name": "Gas Station", "description": "Pumps", "town": "A"}]
+        diff = diff_world(self.world, new_locations)
+
+        self.assertEqual(diff.added, ["Gas Station"])
+        self.assertTrue(diff.structural)
+        new_world = apply_diff(self.world, new_locations, diff)
+        self.assertIn("Gas Station", new_world)
+        self.assertIs(new_world.get("Store"), self.world.get("Store"))
+
+    def test_watcher_swaps_world_when_file_changes(self):
+        """Test that a poll picks up an edited locations file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "locations.json")
+            with open(path, "w") as f:
+                json.dump(self.locations, f)
+            cache = WorldCache()
+            watcher = WorldWatcher(cache)
+            with patch("world_index.find_location_file", return_value=path), \
+                 patch("world_watcher.find_location_file", return_value=path):
+                first = cache.get()
+                self.assertIsNone(watcher.check())
+
+                self.locations[0]["description"] = "An empty square"
+                with open(path, "w") as f:
+                    json.dump(self.locations, f)
+                os.utime(path, (first.mtime + 5, first.mtime + 5))
+
+                diff = watcher.check()
+            self.assertEqual(diff.changed, ["Square"])
+            self.assertEqual(cache.get().get("Square")["description"], "An empty square")
+            self.assertEqual(watcher.reloads, 1)
+
+    def test_malformed_file_keeps_current_world(self):
+        """Test that a half-written or invalid locations file is not swapped in."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "locations.json")
+            with open(path, "w") as f:
+                json.dump(self.locations, f)
+            cache = WorldCache()
+            watcher = WorldWatcher(cache)
+            with patch("world_index.find_location_file", return_value=path), \
+                 patch("world_watcher.find_location_file", return_value=path), \
+                 patch("builtins.print") as mock_print:
+                first = cache.get()
+                self.assertIsNone(watcher.check())
+
+                for mtime, text in [(first.mtime + 5, json.dumps(self.locations) + "junk"),
+                                    (first.mtime + 10, json.dumps([{"name": "Square"}]))]:
+                    with open(path, "w") as f:
+                        f.write(text)
+                    os.utime(path, (mtime, mtime))
+                    self.assertIsNone(watcher.check())
+                    self.assertIsNone(watcher.check())
+                    self.assertIs(cache.get(), first)
+            self.assertEqual(mock_print.call_count, 2)
+            self.assertEqual(watcher.reloads, 0)
+
+
+class TestSymbols(unittest.TestCase):
+    """Test interned names in game state collections."""
+
+    def test_symbol_list_behaves_like_list(self):
+        """Test that a symbol list keeps list semantics over interned IDs."""
+        items = SymbolList(["water bottle", "rope"])
+        items.append("water bottle")
+        items.remove("rope")
+
+        self.assertEqual(items, ["water bottle", "water bottle"])
+        self.assertEqual(items.count("water bottle"), 2)
+        self.assertNotIn("never interned item", items)
+        self.assertTrue(items.contains_id(symbols.intern("water bottle")))
+        self.assertEqual(items[-1], "water bottle")
+        with self.assertRaises(ValueError):
+            items.remove("rope")
+
+    def test_symbol_set_and_dict(self):
+        """Test set and dict wrappers over interned IDs."""
+        visited = SymbolSet(["Town Square"])
+        visited.add("Church")
+        visited.add("Church")
+        self.assertEqual(visited, {"Town Square", "Church"})
+        visited.discard("Church")
+        visited.discard("never interned location")
+        self.assertEqual(SymbolSet.thaw(visited.freeze()), {"Town Square"})
+
+        installed = SymbolListDict()
+        installed["Auto Shop"] = []
+        installed["Auto Shop"].append("spark plugs")
+        self.assertEqual(installed.get("Auto Shop"), ["spark plugs"])
+        self.assertEqual(installed.get("Church", []), [])
+        self.assertEqual(installed.to_dict(), {"Auto Shop": ["spark plugs"]})
+
+    def test_symbol_set_scales_with_members(self):
+        """Test that a small set stays small and fast in a large symbol table."""
+        table = SymbolTable()
+        names = [f"Location {i}" for i in range(200000)]
+        for name in names:
+            table.intern(name)
+        visited = SymbolSet([names[-1], names[0]], table)
+
+        self.assertEqual(visited.ids, (0, 199999))
+        self.assertEqual(list(visited), [names[0], names[-1]])
+        self.assertEqual(sys.getsizeof(visited.freeze()), sys.getsizeof(frozenset({0, 1})))
+        start = time.perf_counter()
+        for _ in range(100000):
+            names[-1] in visited
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_game_state_converts_assigned_collections(self):
+        """Test that GameState stores names as symbols and saves them as names."""
+        state = GameState()
+        state.inventory = ["rope", "rope"]
+        state.vehicle_parts_installed = {"Auto Shop": ["car battery"]}
+
+        self.assertIsInstance(state.inventory, Inventory)
+        self.assertIsInstance(state.visited_locations, SymbolSet)
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            filename = f.name
+        try:
+            self.assertTrue(state.save_to_file(filename))
+            with open(filename) as f:
+                saved = json.load(f)
+            self.assertEqual(saved["inventory"], ["rope", "rope"])
+            self.assertEqual(saved["vehicle_parts_installed"], {"Auto Shop": ["car battery"]})
+            self.assertEqual(saved["towns_visited"], ["Riverside"])
+        finally:
+            os.unlink(filename)
+
+
+class TestActionDispatch(unittest.TestCase):
+    """Test binding world actions to handlers."""
+
+    def test_rules_follow_original_precedence(self):
+        """Test that rule order reproduces the old if/elif chain."""
+        self.assertEqual(match_action_name("Move to nearby location"), MOVE_SHORT)
+        self.assertEqual(match_action_name("Travel to distant location"), MOVE_LONG)
+        self.assertEqual(match_action_name("Search for fuel"), SEARCH)
+        self.assertEqual(match_action_name("Rest on porch"), REST)
+        self.assertEqual(match_action_name("inventory"), "inventory")
+        self.assertIsNone(match_action_name("Find shelter"))
+
+    def test_explicit_handler_and_unmatched_report(self):
+        """Test that a handler field wins and unknown actions are reported at bind time."""
+        table = ActionTable()
+        locations = [{"name": "Town Center", "actions": [
+            {"name": "Find shelter", "handler": "rest"},
+            {"name": "Dance", "handler": "no_such_handler"},
+            {"name": "Juggle"}
+        ]}]
+
+        self.assertEqual(table.bind(locations), [("Town Center", "Dance"), ("Town Center", "Juggle")])
+        self.assertEqual(table.resolve({"name": "Find shelter", "handler": "rest"}), REST)
+
+    def test_shipped_world_has_no_unmatched_actions(self):
+        """Test that every action in the shipped locations file has a handler."""
+        locations = read_location_data(os.path.join(os.path.dirname(__file__), "Assets", "locations.json"))
+        self.assertEqual(ActionTable().bind(locations), [])
+
+    def test_engine_dispatches_through_table(self):
+        """Test that execute_action calls the bound handler."""
+        from game_engine import GameEngine
+        engine = GameEngine()
+        with patch.object(engine, "handle_rest") as handle_rest, \
+             patch.object(engine, "handle_search") as handle_search:
+            engine.execute_action({"name": "Find shelter", "handler": "rest"})
+            engine.execute_action({"name": "Check pharmacy"})
+
+        handle_rest.assert_called_once_with()
+        handle_search.assert_called_once_with({"name": "Check pharmacy"})
+
+
+class TestLootTables(unittest.TestCase):
+    """Test data-driven search outcomes."""
+
+    def setUp(self):
+        """Build a loot table from inline rules."""
+        self.table = LootTable({
+            "locations": [
+                {"match": "gas station", "searches": [
+                    {"actions": ["fuel"], "description": "Pumps", "items": ["gas can"], "success_chance": 0.4},
+                    {"description": "Store", "items": ["flashlight"], "success_chance": 0.6}
+                ]},
+                {"match": "supermarket", "searches": [
+                    {"actions": ["food"], "description": "Aisles", "items": ["canned food"]}
+                ]}
+            ],
+            "default": {"description": "You search around {location}.", "items": ["coins"]}
+        })
+
+    def test_rules_resolve_by_location_and_action(self):
+        """Test location groups, action keywords and the fallback to the default."""
+        self.assertEqual(self.table.lookup("Abandoned Gas Station", {"name": "Search for fuel"})["items"],
+                         ("gas can",))
+        self.assertEqual(self.table.lookup("Abandoned Gas Station", {"name": "Check cars"})["description"], "Store")
+        # A matching location group without a matching search falls back to the default
+        self.assertEqual(self.table.lookup("Riverside Supermarket", {"name": "Search pharmacy"})["items"], ("coins",))
+        self.assertEqual(self.table.lookup("Riverside Church")["description"], "You search around {location}.")
+
+    def test_bind_precomputes_search_actions_and_inline_loot_wins(self):
+        """Test that binding resolves search actions once and inline loot overrides the file."""
+        inline = {"description": "A hidden stash", "items": ["pistol"], "success_chance": 1.0}
+        locations = [{"name": "Gas Station", "actions": [
+            {"name": "Search for fuel"}, {"name": "Rest here"}, {"name": "Check the till", "loot": inline}
+        ]}]
+
+        self.assertEqual(self.table.bind(locations), 2)
+        self.assertIn(("gas station", "search for fuel"), self.table._outcomes)
+        self.assertNotIn(("gas station", "rest here"), self.table._outcomes)
+        self.assertIs(self.table.lookup("Gas Station", locations[0]["actions"][2]), inline)
+
+    def test_shipped_loot_file_loads(self):
+        """Test that the shipped loot file compiles and covers the cemetery searches."""
+        table = LootTable()
+        outcome = table.lookup("Riverside Cemetery", {"name": "Search church"})
+        self.assertIn("rusty church key", outcome["items"])
+        self.assertEqual(outcome["success_chance"], 0.7)
+
+
+class TestItemCatalog(unittest.TestCase):
+    """Test the shared item registry."""
+
+    def test_catalog_is_single_source_of_truth(self):
+        """Test that every module reads the same item facts."""
+        from game_engine import GameEngine
+        self.assertEqual(GameEngine().get_item_weight("first aid kit"), GameState().get_item_weight("first aid kit"))
+        self.assertIs(CombatSystem().weapons, item_catalog.weapons)
+        self.assertEqual(item_catalog.weapons["hunting knife"]["damage"], 15)
+        self.assertIn("fists", item_catalog.weapons)
+        self.assertEqual(get_item_info("axe"), item_catalog.info("axe"))
+        self.assertEqual(item_catalog.category("first aid kit"), "Medical")
+
+    def test_use_item_removes_the_weight_it_was_picked_up_with(self):
+        """Test that using a consumable gives back its catalog weight."""
+        state = GameState()
+        start_weight = state.current_weight
+        state.add_item("energy drink", item_catalog.weight("energy drink"))
+        state.fatigue = 50
+
+        result = state.use_item("energy drink")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(state.fatigue, 30)
+        self.assertAlmostEqual(state.current_weight, start_weight)
+
+    def test_defaults_and_unlisted_categories(self):
+        """Test unknown items and categories missing from the category list."""
+        catalog = ItemCatalog({
+            "default_weight": 2.0,
+            "categories": [{"name": "Food", "icon": "F"}],
+            "items": {"apple": {"weight": 0.2, "category": "Food", "effects": {"hunger": 5}},
+                      "lantern": {"category": "Lights"}}
+        })
+
+        self.assertEqual(catalog.weight("unknown item"), 2.0)
+        self.assertEqual(catalog.category("unknown item"), "Miscellaneous")
+        self.assertTrue(catalog.is_usable("apple"))
+        self.assertFalse(catalog.is_usable("lantern"))
+        self.assertEqual([name for name, _ in catalog.categories], ["Food", "Lights", "Miscellaneous"])
+
+
+class TestInventory(unittest.TestCase):
+    """Test the counted inventory."""
+
+    def setUp(self):
+        """Set up an inventory with its own catalog."""
+        self.catalog = ItemCatalog({"items": {"bandages": {"weight": 0.2}, "axe": {"weight": 3.0}}})
+
+    def test_stacks_counts_and_order(self):
+        """Test that repeated items share a stack and stacks keep pickup order."""
+        inventory = Inventory(["axe", "bandages", "axe"], catalog=self.catalog)
+        inventory.add("bandages", count=2)
+
+        self.assertEqual(inventory.stacks(), [("axe", 2), ("bandages", 3)])
+        self.assertEqual(len(inventory), 5)
+        self.assertEqual(inventory.count("bandages"), 3)
+        self.assertEqual(list(inventory), ["axe", "axe", "bandages", "bandages", "bandages"])
+        self.assertEqual(inventory[2], "bandages")
+        self.assertAlmostEqual(inventory.weight, 6.6)
+
+    def test_removal_uses_the_weight_an_item_was_added_with(self):
+        """Test that the cached weight cannot drift."""
+        inventory = Inventory(catalog=self.catalog)
+        inventory.add("axe", weight=2.5)
+        inventory.append("axe")
+        inventory.remove("axe")
+
+        self.assertAlmostEqual(inventory.weight, 2.5)
+        inventory.remove("axe")
+        self.assertEqual(inventory.weight, 0.0)
+        self.assertNotIn("axe", inventory)
+        with self.assertRaises(ValueError):
+            inventory.remove("axe")
+        self.assertEqual(inventory.discard("axe"), 0)
+
+    def test_ignored_weight_is_reported_once(self):
+        """Test that a weight disagreeing with a carried item warns once instead of failing."""
+        state = GameState()
+        state.add_item("flare gun", 3.0)
+        with patch("builtins.print") as mock_print:
+            self.assertTrue(state.add_item("flare gun", 4.0))
+            self.assertTrue(state.add_item("flare gun", 4.0))
+        self.assertEqual(mock_print.call_count, 1)
+        self.assertAlmostEqual(state.current_weight, 2.0 + 3 * 3.0)
+
+    def test_game_state_weight_follows_inventory(self):
+        """Test that GameState derives its weight from the inventory, including after a load."""
+        state = GameState()
+        state.add_item("first aid kit")
+        state.add_item("first aid kit", 5.0)  # a second kit weighs the same as the first
+        self.assertAlmostEqual(state.current_weight, 2.0 + 2 * item_catalog.weight("first aid kit"))
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            filename = f.name
+        try:
+            self.assertTrue(state.save_to_file(filename))
+            with open(filename) as f:
+                saved = json.load(f)
+            self.assertEqual(saved["inventory"], ["can of motor oil", "first aid kit", "first aid kit"])
+            saved["current_weight"] = 99  # stale weight in an older save
+            with open(filename, "w") as f:
+                json.dump(saved, f)
+
+            loaded = GameState()
+            self.assertTrue(loaded.load_from_file(filename))
+            self.assertEqual(loaded.inventory.stacks(), [("can of motor oil", 1), ("first aid kit", 2)])
+            self.assertAlmostEqual(loaded.current_weight, state.current_weight)
+        finally:
+            os.unlink(filename)
+
+
+class TestCompactGameState(unittest.TestCase):
+    """Test the slotted game state layout."""
+
+    def test_no_instance_dict_and_stats_in_array(self):
+        """Test that stats live in the typed array and keep their int/float values."""
+        state = GameState()
+        self.assertFalse(hasattr(state, "__dict__"))
+        with self.assertRaises(AttributeError):
+            state.not_a_field = 1
+
+        self.assertEqual(state._stats.typecode, "d")
+        self.assertEqual(list(state._stats), [100.0, 100.0, 100.0, 0.0, 100.0])
+        self.assertIsInstance(state.health, int)
+        self.assertEqual(state.get_status_summary().splitlines()[0], "Health: 100/100")
+
+        state.update_survival_stats(1)
+        self.assertEqual(state.hunger, 98.5)
+        self.assertEqual(state.thirst, 97.5)
+
+    def test_symbol_set_is_a_bitset(self):
+        """Test set semantics of the bitset over symbol IDs."""
+        flags = SymbolSet(["event_b", "event_a", "event_b"])
+        self.assertEqual(len(flags), 2)
+        self.assertEqual(list(flags.ids), sorted([symbols.intern("event_a"), symbols.intern("event_b")]))
+        self.assertTrue(flags.contains_id(symbols.intern("event_a")))
+
+        flags.discard("event_a")
+        flags.discard("event_a")
+        flags.discard("never interned event")
+        self.assertEqual(flags, {"event_b"})
+        self.assertEqual(len(flags), 1)
+        self.assertEqual(flags | {"event_c"}, {"event_b", "event_c"})
+
+    def test_save_and_load_round_trip(self):
+        """Test that every converted field survives a save and load."""
+        state = GameState()
+        state.fatigue = 12.5
+        state.weapons = ["baseball bat"]
+        state.add_event({"id": "horde_warning"})
+        state.remove_event("horde_warning")
+        state.visited_locations.add("Riverside Cemetery")
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
+            filename = f.name
+        try:
+            self.assertTrue(state.save_to_file(filename))
+            loaded = GameState()
+            self.assertTrue(loaded.load_from_file(filename))
+        finally:
+            os.unlink(filename)
+
+        self.assertEqual(loaded.fatigue, 12.5)
+        self.assertEqual(loaded.weapons, ["baseball bat"])
+        self.assertIn("horde_warning", loaded.completed_events)
+        self.assertEqual(loaded.visited_locations, {"Riverside Cemetery"})
+
+
+class TestSnapshots(unittest.TestCase):
+    """Test in-memory snapshots, forks and undo."""
+
+    def test_fork_is_independent(self):
+        """Test that changing a fork leaves the original untouched, and the reverse."""
+        state = GameState()
+        state.add_item("rope")
+        state.vehicle_parts_installed = {"Auto Shop": ["spark plugs"]}
+        fork = state.fork()
+
+        fork.add_item("rope")
+        fork.health = 40
+        fork.visited_locations.add("Riverside Cemetery")
+        fork.vehicle_parts_installed["Auto Shop"].append("car battery")
+        fork.skills["combat"] = 3
+        state.towns_visited.append("Millbrook")
+
+        self.assertEqual(state.inventory.count("rope"), 1)
+        self.assertEqual(fork.inventory.count("rope"), 2)
+        self.assertAlmostEqual(fork.current_weight - state.current_weight, item_catalog.weight("rope"))
+        self.assertEqual(state.health, 100)
+        self.assertNotIn("Riverside Cemetery", state.visited_locations)
+        self.assertEqual(state.vehicle_parts_installed["Auto Shop"], ["spark plugs"])
+        self.assertEqual(state.skills["combat"], 0)
+        self.assertEqual(fork.towns_visited, ["Riverside"])
+
+    def test_unchanged_parts_are_shared(self):
+        """Test that consecutive snapshots share what did not change."""
+        state = GameState()
+        first = state.snapshot()
+        state.health = 90
+        second = state.snapshot()
+        self.assertIs(first._inventory, second._inventory)
+        self.assertIs(first._lists[1], second._lists[1])
+
+        state.add_item("rope")
+        self.assertIsNot(state.snapshot()._inventory, second._inventory)
+
+    def test_undo_last_turns(self):
+        """Test undoing one or more recorded turns."""
+        state = GameState()
+        history = UndoHistory(state, depth=3)
+        for turn in range(5):
+            history.record()
+            state.move_to_location(f"Location {turn}")
+            state.add_item("water bottle")
+
+        self.assertEqual(history.turns, (2, 3, 4))
+        self.assertTrue(history.undo())
+        self.assertEqual(state.current_location, "Location 3")
+        self.assertTrue(history.undo(2))
+        self.assertEqual(state.current_location, "Location 1")
+        self.assertEqual(state.inventory.count("water bottle"), 2)
+        self.assertEqual(len(history), 0)
+        self.assertFalse(history.undo())
+
+
+class TestJournal(unittest.TestCase):
+    """Test the change journal and replay."""
+
+    def _state_data(self, state):
+        data = json.loads(json.dumps(state.to_dict()))
+        del data["save_time"]
+        return data
+
+    def _play(self, state, turns):
+        """Make a mix of journaled changes over a number of turns."""
+        expected = {}
+        for turn in range(turns):
+            expected[state.turn_count] = self._state_data(state)
+            state.update_survival_stats()  # the game loop's per-turn tick
+            state.add_item("water bottle")
+            state.thirst = 60  # direct assignment, as the engine does
+            state.use_item("water bottle")  # removal inside is covered by this record
+            state.zombie_kills += 1
+            state.gain_experience(30, "combat")
+            state.discover_location(f"Hidden Place {turn}")
+            state.move_to_location(f"Location {turn}")
+        return expected
+
+    def test_records_outer_calls_and_assignments(self):
+        """Test what gets recorded for a single turn."""
+        state = GameState()
+        journal = Journal(seed=7)
+        journal.attach(state)
+        with patch("builtins.print"):
+            self._play(state, 1)
+
+        operations = [record[1] for record in journal.records]
+        self.assertEqual(operations, ["update_survival_stats", "add_item", "set", "use_item", "set",
+                                      "gain_experience", "discover_location", "move_to_location"])
+        self.assertEqual(journal.records[2], (0, "set", ("thirst", 60), {}))
+        self.assertEqual(state.turn_count, 1)
+
+    def test_replay_any_turn_within_bounded_history(self):
+        """Test that replay rebuilds each kept turn exactly, from the nearest checkpoint."""
+        state = GameState()
+        journal = Journal(seed=7, checkpoint_every=10, keep_checkpoints=3)
+        journal.attach(state)
+        with patch("builtins.print"):
+            expected = self._play(state, 12)
+
+        self.assertLessEqual(len(journal.records), 3 * 10)
+        self.assertGreater(journal.first_turn, 0)
+        for turn in range(journal.first_turn, 12):
+            self.assertEqual(self._state_data(journal.replay(turn)), expected[turn])
+        self.assertEqual(self._state_data(journal.replay()), self._state_data(state))
+        with self.assertRaises(ValueError):
+            journal.replay(0)
+
+    def test_recover_from_file(self):
+        """Test crash recovery from the journal file, including after a load."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "journal.jsonl")
+            save_path = os.path.join(directory, "save.json")
+            state = GameState()
+            journal = Journal(seed=42, path=path, checkpoint_every=15)
+            journal.attach(state)
+            with patch("builtins.print"):
+                self._play(state, 3)
+                state.save_to_file(save_path)
+                self._play(state, 2)
+                state.load_from_file(save_path)
+                self._play(state, 4)
+            journal.close()
+
+            recovered, seed = recover(path)
+            self.assertEqual(seed, 42)
+            self.assertEqual(self._state_data(recovered), self._state_data(state))
+            self.assertIsNone(recovered._journal)
+
+    def test_second_attach_keeps_previous_session(self):
+        """Test that starting a new journal on the same path keeps a crashed session's records."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "journal.jsonl")
+            state = GameState()
+            crashed = Journal(seed=42, path=path)
+            crashed.attach(state)
+            with patch("builtins.print"):
+                self._play(state, 3)
+            # Crash: the file is closed with the process, but never detached
+            crashed.close()
+            self.assertTrue(unfinished_session(path))
+
+            journal = Journal(seed=43, path=path)
+            journal.attach(GameState())
+            recovered, seed = recover(path + PREVIOUS_SUFFIX)
+            self.assertEqual(seed, 42)
+            self.assertEqual(self._state_data(recovered), self._state_data(state))
+            self.assertFalse(unfinished_session(path))
+
+            # A clean exit does not look like a crash next time
+            journal.detach(GameState())
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(recover(path + PREVIOUS_SUFFIX)[1], 43)
+
+
+class TestSaveSlots(unittest.TestCase):
+    """Test the save slot manifest."""
+
+    def setUp(self):
+        """Set up save slots in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.slots = SaveSlots(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_records_slot_without_rescanning(self):
+        """Test that saving updates the manifest and listing does not parse saves."""
+        state = GameState()
+        state.move_to_location("Riverside Cemetery")
+        self.assertTrue(self.slots.save(state, "save_one.json"))
+        self.assertTrue(self.slots.save(GameState(), "save_two.json"))
+
+        with patch.object(self.slots, "_scan", side_effect=AssertionError("save file parsed")):
+            slots = self.slots.slots()
+        self.assertEqual([slot.filename for slot in slots], ["save_one.json", "save_two.json"])
+        self.assertEqual(slots[0].location, "Riverside Cemetery")
+        self.assertEqual(slots[0].turn, 1)
+
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(self.slots.path("save_one.json")))
+        self.assertEqual(loaded.current_location, "Riverside Cemetery")
+
+    def test_rebuilds_missing_or_corrupt_manifest(self):
+        """Test the rebuild-from-scan fallback."""
+        GameState().save_to_file(self.slots.path("save_old.json"))
+        with open(self.slots.path("save_broken.json"), "w") as f:
+            f.write("{not json")
+
+        slots = self.slots.slots()
+        self.assertEqual([slot.filename for slot in slots], ["save_broken.json", "save_old.json"])
+        self.assertEqual(slots[0].location, "Unknown")
+        self.assertEqual(slots[1].location, "Abandoned Gas Station")
+        self.assertTrue(os.path.exists(self.slots.manifest_path))
+
+        with open(self.slots.manifest_path, "w") as f:
+            f.write("garbage")
+        self.assertEqual(len(self.slots.slots()), 2)
+
+    def test_stale_entries_are_refreshed(self):
+        """Test saves changed, added or removed behind the manifest's back."""
+        self.slots.save(GameState(), "save_a.json")
+        self.slots.save(GameState(), "save_b.json")
+
+        changed = GameState()
+        changed.health = 42
+        changed.save_to_file(self.slots.path("save_a.json"))
+        os.utime(self.slots.path("save_a.json"), (1, 1))
+        os.unlink(self.slots.path("save_b.json"))
+        GameState().save_to_file(self.slots.path("save_c.json"))
+
+        slots = self.slots.slots()
+        self.assertEqual([slot.filename for slot in slots], ["save_a.json", "save_c.json"])
+        self.assertEqual(slots[0].health, 42)
+        with open(os.path.join(self.directory.name, MANIFEST_FILE)) as f:
+            self.assertEqual(sorted(json.load(f)["slots"]), ["save_a.json", "save_c.json"])
+
+
+class TestSaveCodec(unittest.TestCase):
+    """Test the binary save format."""
+
+    def setUp(self):
+        """Set up a late-game state and a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.state = GameState()
+        self.state.max_inventory_weight = 10000
+        for item in ["Bandage", "Water Bottle", "Canned Food"] * 50:
+            self.state.add_item(item)
+        for i in range(40):
+            self.state.visited_locations.add(f"Location {i}")
+        self.state.health = 72.5
+        self.state.zombie_kills = 300
+        self.state.story_flags["met_survivor"] = True
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_binary_roundtrip_and_size(self):
+        """Test that a .sav file round-trips the same data as JSON in fewer bytes."""
+        json_path = os.path.join(self.directory.name, "save_late.json")
+        binary_path = os.path.join(self.directory.name, "save_late.sav")
+        self.assertTrue(self.state.save_to_file(json_path))
+        self.assertTrue(self.state.save_to_file(binary_path))
+
+        with open(binary_path, "rb") as f:
+            data = f.read()
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertLess(len(data) * 5, os.path.getsize(json_path))
+        with open(json_path) as f:
+            expected = json.load(f)
+        decoded = decode_save(data)
+        del expected["save_time"], decoded["save_time"]
+        self.assertEqual(decoded, expected)
+        self.assertEqual(decode_save(encode_save(expected, compress=False)), expected)
+
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(binary_path))
+        self.assertEqual(loaded.health, 72.5)
+        self.assertEqual(loaded.inventory.count("Bandage"), 50)
+        self.assertEqual(loaded.visited_locations, self.state.visited_locations)
+
+    def test_format_is_detected_on_load(self):
+        """Test that JSON saves still load and the codec can be picked explicitly."""
+        path = os.path.join(self.directory.name, "save_mixed.json")
+        self.assertTrue(self.state.save_to_file(path, codec=BINARY))
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(path))
+        self.assertEqual(loaded.zombie_kills, 300)
+
+        self.state.save_to_file(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["zombie_kills"], 300)
+        self.assertTrue(loaded.load_from_file(path))
+        self.assertEqual(loaded.story_flags, {"met_survivor": True})
+
+        slots = SaveSlots(self.directory.name)
+        slots.save(self.state, "save_compact.sav")
+        self.assertEqual([slot.filename for slot in slots.slots()], ["save_compact.sav", "save_mixed.json"])
+
+    def test_corrupt_saves_are_rejected(self):
+        """Test the checksum, length and version checks."""
+        data = bytearray(encode_save(self.state.to_dict()))
+        damaged = bytearray(data)
+        damaged[-3] ^= 0xFF
+        with self.assertRaises(SaveFormatError):
+            decode_save(bytes(damaged))
+        with self.assertRaises(SaveFormatError):
+            decode_save(bytes(data[:-1]))
+        other_version = bytearray(data)
+        other_version[4] += 1
+        with self.assertRaises(SaveFormatError):
+            decode_save(bytes(other_version))
+
+        path = os.path.join(self.directory.name, "save_bad.sav")
+        with open(path, "wb") as f:
+            f.write(damaged)
+        with patch("builtins.print"):
+            self.assertFalse(GameState().load_from_file(path))
+
+
+class TestDeltaSaves(unittest.TestCase):
+    """Test appending changed fields to binary save slots."""
+
+    def setUp(self):
+        """Set up save slots in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.slots = SaveSlots(self.directory.name)
+        self.path = self.slots.path("save_delta.sav")
+        self.state = GameState()
+        for item in ["Bandage", "Water Bottle"] * 20:
+            self.state.add_item(item)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def advance(self):
+        """Play a turn that changes only a few fields."""
+        self.state.turn_count += 1
+        self.state.health -= 1
+
+    def test_deltas_hold_changed_fields_only(self):
+        """Test that later saves append small deltas that load back in order."""
+        self.assertTrue(self.slots.write_delta("save_delta.sav", self.state.to_dict()))
+        base_size = os.path.getsize(self.path)
+        previous = self.state.to_dict()
+        self.advance()
+        self.assertEqual(sorted(save_delta(previous, self.state.to_dict())), ["health", "save_time", "turn_count"])
+
+        for _ in range(3):
+            self.slots.write_delta("save_delta.sav", self.state.to_dict())
+            self.advance()
+        self.state.move_to_location("Riverside Cemetery")
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        self.assertLess(os.path.getsize(self.path) - base_size, base_size)
+
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual((loaded.turn_count, loaded.health), (self.state.turn_count, self.state.health))
+        self.assertEqual(loaded.current_location, "Riverside Cemetery")
+        self.assertEqual(loaded.inventory.count("Bandage"), 20)
+        self.assertEqual(self.slots.slots()[0].turn, self.state.turn_count)
+
+    def test_full_save_every_few_deltas_and_after_outside_writes(self):
+        """Test when write_delta() starts the file over with a full save."""
+        sizes = []
+        for _ in range(5):
+            self.slots.write_delta("save_delta.sav", self.state.to_dict(), base_every=2)
+            sizes.append(os.path.getsize(self.path))
+            self.advance()
+        self.assertLess(sizes[0], sizes[1])
+        self.assertLess(sizes[1], sizes[2])
+        self.assertGreater(sizes[2], sizes[3])
+
+        # Overwritten with JSON: a delta appended to it would not load
+        self.state.save_to_file(self.path, codec=JSON)
+        self.advance()
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual(loaded.turn_count, self.state.turn_count)
+
+    def test_torn_delta_is_dropped(self):
+        """Test that a delta cut short by a crash leaves the previous save intact."""
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        self.advance()
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        saved_turn = self.state.turn_count
+        self.advance()
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual(loaded.turn_count, saved_turn)
+
+        # The damaged file is not appended to; the next save starts it over
+        self.advance()
+        self.slots.write_delta("save_delta.sav", self.state.to_dict())
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual(loaded.turn_count, self.state.turn_count)
+
+
+class TestSaveStore(unittest.TestCase):
+    """Test the SQLite save backend."""
+
+    def setUp(self):
+        """Set up an in-memory store with a few saves."""
+        self.store = SqliteSaveStore(":memory:", player="alice")
+        for name, days, location, rank in [("save_a", 3, "Riverside Cemetery", "Rookie"),
+                                           ("save_b", 12, "Abandoned Gas Station", "Survivor"),
+                                           ("save_c", 7, "Riverside Cemetery", "Survivor")]:
+            state = GameState()
+            state.days_survived = days
+            state.current_location = location
+            state.survivor_rank = rank
+            self.assertTrue(self.store.save(state, name))
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_save_and_load_slot(self):
+        """Test that a slot round-trips and replaces the previous save."""
+        state = GameState()
+        state.health = 55
+        state.add_item("Bandage")
+        self.store.save(state, "save_a")
+
+        loaded = GameState()
+        self.assertTrue(self.store.load(loaded, "save_a"))
+        self.assertEqual(loaded.health, 55)
+        self.assertIn("Bandage", loaded.inventory)
+        self.assertFalse(self.store.load(loaded, "save_missing"))
+        self.assertEqual([slot.filename for slot in self.store.slots()], ["save_a", "save_b", "save_c"])
+
+    def test_indexed_queries(self):
+        """Test sorting, filtering and per-player isolation."""
+        by_days = self.store.slots(order_by="days", descending=True, limit=2)
+        self.assertEqual([slot.filename for slot in by_days], ["save_b", "save_c"])
+        self.assertEqual(by_days[0].rank, "Survivor")
+        self.assertEqual([slot.filename for slot in self.store.slots(location="Riverside Cemetery")],
+                         ["save_a", "save_c"])
+        self.assertEqual([slot.days for slot in self.store.slots(rank="Survivor", min_days=10)], [12])
+        with self.assertRaises(ValueError):
+            self.store.slots(order_by="state; DROP TABLE saves")
+
+        other = SqliteSaveStore(":memory:", player="bob")
+        self.assertEqual(other.slots(), [])
+        other.close()
+
+    def test_prune_and_engine_menus(self):
+        """Test pruning old slots and loading through the engine's load menu."""
+        with patch("save_store.time.time", return_value=2e9):
+            self.store.save(GameState(), "save_newest")
+        self.assertEqual(self.store.prune(2), 2)
+        self.assertEqual(len(self.store.slots()), 2)
+        self.assertTrue(self.store.delete("save_newest"))
+        self.assertFalse(self.store.delete("save_newest"))
+
+        from game_engine import GameEngine
+        engine = GameEngine(saves=self.store)
+        with patch("game_engine.game_state", GameState()) as state, \
+                patch("builtins.input", side_effect=["1", "y", ""]), patch("builtins.print"):
+            engine.load_game()
+        remaining = self.store.slots()[0]
+        self.assertEqual(state.days_survived, remaining.days)
+
+
+class TestAutosave(unittest.TestCase):
+    """Test background autosaving."""
+
+    def setUp(self):
+        """Set up an autosaver writing to a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.slots = SaveSlots(self.directory.name)
+        self.state = GameState()
+        self.autosaver = Autosaver(self.state, self.slots, every=3)
+
+    def tearDown(self):
+        self.autosaver.stop()
+        self.directory.cleanup()
+
+    def test_saves_every_few_turns_and_on_move(self):
+        """Test when tick() asks for a save."""
+        with patch.object(self.autosaver, "request") as request:
+            self.assertFalse(self.autosaver.tick())
+            self.assertFalse(self.autosaver.tick())
+            self.assertFalse(self.autosaver.tick())
+            self.assertTrue(self.autosaver.tick())
+        self.assertEqual(request.call_count, 1)
+
+        self.autosaver.request()
+        self.state.move_to_location("Riverside Cemetery")
+        self.assertTrue(self.autosaver.tick())
+
+    def test_saves_without_moving(self):
+        """Test that turns spent in one location still trigger saves."""
+        turn_count = self.state.turn_count
+        self.autosaver.start()
+        self.autosaver.tick()
+        # Searching, resting and fighting never move the player
+        for _ in range(9):
+            self.autosaver.tick()
+        self.assertTrue(self.autosaver.flush(timeout=5))
+        self.assertEqual(self.state.turn_count, turn_count)
+        self.assertGreaterEqual(self.autosaver.saves_written, 1)
+        self.assertTrue(os.path.exists(self.slots.path(self.autosaver.filename)))
+
+    def test_bursts_are_coalesced(self):
+        """Test that only the latest of several queued snapshots is written."""
+        for health in (90, 80, 70):
+            self.state.health = health
+            self.autosaver.request()
+        self.autosaver.start()
+        self.assertTrue(self.autosaver.flush(timeout=5))
+        self.assertEqual(self.autosaver.saves_written, 1)
+
+        loaded = GameState()
+        self.assertTrue(loaded.load_from_file(self.slots.path(self.autosaver.filename)))
+        self.assertEqual(loaded.health, 70)
+
+    def test_stop_writes_pending_save(self):
+        """Test that stopping writes a queued save and records it in the manifest."""
+        self.autosaver.start()
+        self.state.move_to_location("Riverside Cemetery")
+        self.autosaver.request()
+        # Changes after the request do not leak into the queued snapshot
+        self.state.health = 1
+        self.autosaver.stop()
+
+        self.assertEqual(self.autosaver.saves_written, 1)
+        slots = self.slots.slots()
+        self.assertEqual([slot.filename for slot in slots], [self.autosaver.filename])
+        self.assertEqual(slots[0].location, "Riverside Cemetery")
+        self.assertEqual(slots[0].health, 100)
+        self.assertEqual([name for name in os.listdir(self.directory.name) if name.endswith(".tmp")], [])
+
+
 class TestInventoryFunctions(unittest.TestCase):
     """Test inventory-related functions."""
     
@@ -312,6 +1842,24 @@ class TestInventoryFunctions(unittest.TestCase):
         for item in items:
             self.assertIn(item, result)
     
+    def test_check_inventory_cached_until_changed(self):
+        """Test that the inventory text is only rebuilt after the inventory changes."""
+        module = sys.modules[check_inventory.__module__]
+        inventory = Inventory(["water bottle"])
+        with patch.object(module, "_render_inventory", wraps=module._render_inventory) as render:
+            first = check_inventory(inventory)
+            self.assertIs(check_inventory(inventory), first)
+            self.assertEqual(render.call_count, 1)
+
+            version = inventory.version
+            inventory.append("water bottle")
+            self.assertGreater(inventory.version, version)
+            self.assertIn("water bottle x2", check_inventory(inventory))
+            self.assertEqual(render.call_count, 2)
+
+            check_inventory(Inventory(["water bottle", "water bottle"]))
+            self.assertEqual(render.call_count, 3)
+
     def test_get_item_info(self):
         """Test getting item information."""
         info = get_item_info("water bottle")
@@ -0,0 +1,594 @@
+"""
+World Compiler - Binary world format for fast startup
+
+This module compiles locations.json into a versioned binary artifact. All
+strings are interned into one table, every location record is encoded
+against that table, and the location graph is stored as flat integer
+arrays. Loading the artifact memory-maps it and only decodes a location
+when it is looked up, so startup cost no longer grows with the size of
+the JSON file.
+
+Long text (location and action descriptions) is kept out of the records in
+a separate text section. Records only hold its offset and length, and the
+text is decoded when it is displayed, through a small LRU cache, so
+resident memory stays flat as the world grows.
+
+Usage:
+    python world_compiler.py compile-world [source] [-o output] [--shard-by-town]
+"""
+
+import argparse
+import array
+import collections.abc
+import json
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from action_dispatch import action_table, report_unmatched
+from Functions.read_location_data import COMPILED_SUFFIX, validate_location_data
+from location_graph import CsrAdjacency, LocationGraph
+
+MAGIC = b"ZSWD"
+FORMAT_VERSION = 2
+
+# Strings at least this long (in UTF-8 bytes) are stored in the text section
+LONG_TEXT_BYTES = 48
+
+# Default number of decoded records and texts kept in memory
+RECORD_CACHE_SIZE = 256
+TEXT_CACHE_SIZE = 32
+
+# magic, version, flags, location count, node count, section count
+_HEADER = struct.Struct("<4sHHIII")
+# tag, reserved, offset, length
+_SECTION = struct.Struct("<4sIQQ")
+
+# Value tags used by the record encoding
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _TEXT = range(9)
+_DOUBLE = struct.Struct("<d")
+
+
+class WorldFormatError(ValueError):
+    """Raised when a compiled world file is missing, corrupt or from another version."""
+
+
+def _write_varint(out: bytearray, value: int):
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf: Sequence[int], pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint, returning (value, new position)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class _TextBlobBuilder:
+    """Collects long strings into one blob, storing each distinct text once."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, encoded: bytes, value: str) -> Tuple[int, int]:
+        location = self.offsets.get(value)
+        if location is None:
+            location = (len(self.data), len(encoded))
+            self.data += encoded
+            self.offsets[value] = location
+        return location
+
+
+class _StringTableBuilder:
+    """Assigns each distinct string a small integer ID."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.ids[value] = string_id
+        return string_id
+
+
+def _encode_value(value: Any, strings: _StringTableBuilder, out: bytearray,
+                  texts: Optional[_TextBlobBuilder] = None):
+    """Encode a JSON value with strings replaced by string table or text blob references."""
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        if texts is not None and len(encoded) >= LONG_TEXT_BYTES:
+            offset, length = texts.add(encoded, value)
+            out.append(_TEXT)
+            _write_varint(out, offset)
+            _write_varint(out, length)
+        else:
+            out.append(_STR)
+            _write_varint(out, strings.intern(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode_value(item, strings, out, texts)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _write_varint(out, strings.intern(key))
+            _encode_value(item, strings, out, texts)
+    else:
+        raise WorldFormatError(f"Cannot encode value of type {type(value).__name__}")
+
+
+class TextRef:
+    """Position of a long text in the text section."""
+
+    __slots__ = ("offset", "length")
+
+    def __init__(self, offset: int, length: int):
+        self.offset = offset
+        self.length = length
+
+
+class TextStore:
+    """Decodes long texts from the memory-mapped text section through an LRU cache."""
+
+    def __init__(self, data: memoryview, cache_size: int = TEXT_CACHE_SIZE):
+        self._data = data
+        self._cache: 'OrderedDict[int, str]' = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ref: TextRef) -> str:
+        """Get the text for a reference, decoding it if it is not cached."""
+        value = self._cache.get(ref.offset)
+        if value is not None:
+            self.hits += 1
+            self._cache.move_to_end(ref.offset)
+            return value
+
+        self.misses += 1
+        value = str(self._data[ref.offset:ref.offset + ref.length], "utf-8")
+        self._cache[ref.offset] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class LazyRecord(collections.abc.Mapping):
+    """Read-only mapping whose long text values are decoded on access."""
+
+    __slots__ = ("_fields", "_texts")
+
+    def __init__(self, fields: Dict[str, Any], texts: TextStore):
+        self._fields = fields
+        self._texts = texts
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._fields[key]
+        if type(value) is TextRef:
+            return self._texts.get(value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"LazyRecord({dict(self)!r})"
+
+
+def _decode_value(buf: memoryview, pos: int, strings: 'StringTable',
+                  texts: Optional[TextStore] = None) -> Tuple[Any, int]:
+    """Decode a value written by _encode_value into read-only structures."""
+    tag = buf[pos]
+    pos += 1
+    if tag == _STR:
+        string_id, pos = _read_varint(buf, pos)
+        return strings[string_id], pos
+    if tag == _TEXT:
+        offset, pos = _read_varint(buf, pos)
+        length, pos = _read_varint(buf, pos)
+        return TextRef(offset, length), pos
+    if tag == _DICT:
+        count, pos = _read_varint(buf, pos)
+        result = {}
+        has_text = False
+        for _ in range(count):
+            key_id, pos = _read_varint(buf, pos)
+            value, pos = _decode_value(buf, pos, strings, texts)
+            has_text = has_text or type(value) is TextRef
+            result[strings[key_id]] = value
+        if has_text:
+            return LazyRecord(result, texts), pos
+        return MappingProxyType(result), pos
+    if tag == _LIST:
+        count, pos = _read_varint(buf, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _decode_value(buf, pos, strings, texts)
+            if type(item) is TextRef:
+                item = texts.get(item)
+            items.append(item)
+        return tuple(items), pos
+    if tag == _INT:
+        raw, pos = _read_varint(buf, pos)
+        return (raw >> 1) ^ -(raw & 1), pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(buf, pos)[0], pos + _DOUBLE.size
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _NONE:
+        return None, pos
+    raise WorldFormatError(f"Unknown value tag {tag}")
+
+
+def _int_array(values: Sequence[int], typecode: str = "i") -> bytes:
+    """Pack integers as a little-endian array."""
+    packed = array.array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _csr_arrays(adjacency: Sequence[Tuple[int, ...]]) -> Tuple[List[int], List[int]]:
+    """Flatten adjacency tuples into offset and target lists."""
+    offsets = [0]
+    targets: List[int] = []
+    for neighbours in adjacency:
+        targets.extend(neighbours)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def compile_world(locations: List[Dict[str, Any]], output_path: str) -> Dict[str, int]:
+    """
+    Validate a list of locations and write it as a compiled world.
+
+    Args:
+        locations: Location data in the locations.json schema
+        output_path: File to write
+
+    Returns:
+        Dictionary with counts describing the compiled world
+
+    Raises:
+        ValueError: If the location data is invalid
+    """
+    validate_location_data(locations)
+    graph = LocationGraph(locations)
+    strings = _StringTableBuilder()
+    texts = _TextBlobBuilder()
+
+    # Location records
+    records = bytearray()
+    record_offsets = [0]
+    for location in locations:
+        _encode_value(location, strings, records, texts)
+        record_offsets.append(len(records))
+
+    # Graph tables
+    node_names = [strings.intern(name) for name in graph.names]
+    towns = [strings.intern(town) for town in graph.towns]
+    short_offsets, short_targets = _csr_arrays(graph.nearby_short)
+    long_offsets, long_targets = _csr_arrays(graph.nearby_long)
+    indexes = bytearray()
+    _encode_value({
+        "hidden_by_town": {town: list(nodes) for town, nodes in graph.hidden_by_town.items()},
+        "unlocks_by_item": {item: list(nodes) for item, nodes in graph.unlocks_by_item.items()}
+    }, strings, indexes)
+
+    # String table
+    string_data = bytearray()
+    string_offsets = [0]
+    for value in strings.strings:
+        string_data += value.encode("utf-8")
+        string_offsets.append(len(string_data))
+
+    sections = [
+        (b"STRO", _int_array(string_offsets, "I")),
+        (b"STRD", bytes(string_data)),
+        (b"RECO", _int_array(record_offsets, "I")),
+        (b"RECD", bytes(records)),
+        (b"NAME", _int_array(node_names, "I")),
+        (b"TOWN", _int_array(towns, "I")),
+        (b"HIDN", bytes(graph.hidden)),
+        (b"HLOC", _int_array(graph.hidden_location)),
+        (b"SHRO", _int_array(short_offsets, "I")),
+        (b"SHRT", _int_array(short_targets)),
+        (b"LNGO", _int_array(long_offsets, "I")),
+        (b"LNGT", _int_array(long_targets)),
+        (b"IDXS", bytes(indexes)),
+        (b"TEXT", bytes(texts.data))
+    ]
+    _write_sections(output_path, sections, graph.location_count, len(graph.names))
+
+    return {
+        "locations": graph.location_count,
+        "nodes": len(graph.names),
+        "strings": len(strings.strings),
+        "texts": len(texts.offsets),
+        "bytes": os.path.getsize(output_path)
+    }
+
+
+def _write_sections(output_path: str, sections: List[Tuple[bytes, bytes]],
+                    location_count: int, node_count: int):
+    """Write the header, section table and 8-byte aligned section payloads."""
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for tag, payload in sections:
+        offset = (offset + 7) & ~7
+        table.append((tag, offset, len(payload)))
+        offset += len(payload)
+
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, location_count, node_count, len(sections)))
+        for tag, section_offset, length in table:
+            f.write(_SECTION.pack(tag, 0, section_offset, length))
+        for (tag, section_offset, length), (_, payload) in zip(table, sections):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(payload)
+    os.replace(temp_path, output_path)
+
+
+class StringTable:
+    """Read-only view of the interned strings, decoded on first use."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+        self._cache: Dict[int, str] = {}
+
+    def __getitem__(self, string_id: int) -> str:
+        value = self._cache.get(string_id)
+        if value is None:
+            start = self._offsets[string_id]
+            value = str(self._data[start:self._offsets[string_id + 1]], "utf-8")
+            self._cache[string_id] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class _StringColumn(collections.abc.Sequence):
+    """Sequence of strings stored as string table IDs."""
+
+    def __init__(self, ids: memoryview, strings: StringTable):
+        self._ids = ids
+        self._strings = strings
+
+    def __getitem__(self, index):
+        return self._strings[self._ids[index]]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class CompiledLocations(collections.abc.Sequence):
+    """Location records from a compiled world, decoded on access and kept in an LRU cache."""
+
+    def __init__(self, offsets: memoryview, records: memoryview, strings: StringTable,
+                 texts: TextStore, cache_size: int = RECORD_CACHE_SIZE):
+        self._offsets = offsets
+        self._records = records
+        self._strings = strings
+        self._texts = texts
+        self._cache: 'OrderedDict[int, Mapping[str, Any]]' = OrderedDict()
+        self.cache_size = cache_size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("location index out of range")
+
+        location = self._cache.get(index)
+        if location is not None:
+            self._cache.move_to_end(index)
+            return location
+
+        location, _ = _decode_value(self._records, self._offsets[index], self._strings, self._texts)
+        self._cache[index] = location
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return location
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class CompiledWorld:
+    """A memory-mapped compiled world file."""
+
+    def __init__(self, path: str):
+        """
+        Open and map a compiled world.
+
+        Args:
+            path: Path to a .zworld file
+
+        Raises:
+            WorldFormatError: If the file is not a compiled world of this version
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise WorldFormatError(f"{path} is empty") from e
+        self._view = memoryview(self._map)
+
+        if len(self._view) < _HEADER.size:
+            raise WorldFormatError(f"{path} is too short to be a compiled world")
+        magic, version, _, self.location_count, self.node_count, section_count = \
+            _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise WorldFormatError(f"{path} is not a compiled world")
+        if version != FORMAT_VERSION:
+            raise WorldFormatError(
+                f"{path} uses world format {version}, expected {FORMAT_VERSION}; recompile it")
+
+        self._sections: Dict[bytes, memoryview] = {}
+        for index in range(section_count):
+            tag, _, offset, length = _SECTION.unpack_from(self._view, _HEADER.size + index * _SECTION.size)
+            if offset + length > len(self._view):
+                raise WorldFormatError(f"{path} is truncated")
+            self._sections[tag] = self._view[offset:offset + length]
+
+        self.strings = StringTable(self._ints(b"STRO", "I"), self._section(b"STRD"))
+        self.texts = TextStore(self._section(b"TEXT"))
+        self.locations = CompiledLocations(self._ints(b"RECO", "I"), self._section(b"RECD"),
+                                           self.strings, self.texts)
+        self.graph = self._load_graph()
+
+    def _section(self, tag: bytes) -> memoryview:
+        """Get a section's raw bytes."""
+        try:
+            return self._sections[tag]
+        except KeyError:
+            raise WorldFormatError(f"{self.path} is missing section {tag.decode()}") from None
+
+    def _ints(self, tag: bytes, typecode: str = "i") -> Sequence[int]:
+        """Get a section as an integer array, without copying where possible."""
+        raw = self._section(tag)
+        if sys.byteorder == "little":
+            return raw.cast(typecode)
+        values = array.array(typecode, raw)
+        values.byteswap()
+        return values
+
+    def _load_graph(self) -> LocationGraph:
+        """Wrap the stored graph tables in a LocationGraph."""
+        names = [self.strings[string_id] for string_id in self._ints(b"NAME", "I")]
+        indexes, _ = _decode_value(self._section(b"IDXS"), 0, self.strings)
+        return LocationGraph.from_arrays(
+            names=names,
+            location_count=self.location_count,
+            towns=_StringColumn(self._ints(b"TOWN", "I"), self.strings),
+            hidden=self._section(b"HIDN"),
+            nearby_short=CsrAdjacency(self._ints(b"SHRO", "I"), self._ints(b"SHRT")),
+            nearby_long=CsrAdjacency(self._ints(b"LNGO", "I"), self._ints(b"LNGT")),
+            hidden_location=self._ints(b"HLOC"),
+            hidden_by_town=dict(indexes["hidden_by_town"]),
+            unlocks_by_item=dict(indexes["unlocks_by_item"])
+        )
+
+
+def load_compiled_world(path: str):
+    """
+    Load a compiled world as a WorldIndex.
+
+    Args:
+        path: Path to a .zworld file
+
+    Returns:
+        WorldIndex backed by the memory-mapped file
+    """
+    from world_index import WorldIndex
+
+    compiled = CompiledWorld(path)
+    return WorldIndex(compiled.locations, source=path, mtime=os.path.getmtime(path),
+                      graph=compiled.graph)
+
+
+def compile_world_file(source: str, output: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compile a locations.json file.
+
+    Args:
+        source: Path to the JSON file
+        output: Path to write; defaults to the source path with a .zworld suffix
+
+    Returns:
+        Dictionary with counts describing the compiled world
+    """
+    if output is None:
+        output = os.path.splitext(source)[0] + COMPILED_SUFFIX
+    with open(source, "r", encoding="utf-8") as f:
+        locations = json.load(f)
+    # Compiled worlds are not re-read as JSON at load time, so check the actions here
+    report_unmatched(action_table.bind(locations))
+    return compile_world(locations, output)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Build tools for Zombie Survival Story world data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser("compile-world", help="compile locations.json to the binary world format")
+    compile_parser.add_argument("source", nargs="?", default=os.path.join("Assets", "locations.json"),
+                                help="locations file to compile (default: Assets/locations.json)")
+    compile_parser.add_argument("-o", "--output",
+                                help="output file (default: next to the source, .zworld or .zshards)")
+    compile_parser.add_argument("--shard-by-town", action="store_true",
+                                help="write one shard per town plus a manifest instead of a single file")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.shard_by_town:
+            from world_shards import compile_sharded_world_file
+            stats = compile_sharded_world_file(args.source, args.output)
+            print(f"Compiled {stats['locations']} locations into {stats['towns']} town shards "
+                  f"({stats['bytes']} bytes)")
+            return 0
+        stats = compile_world_file(args.source, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error compiling {args.source}: {e}")
+        return 1
+
+    print(f"Compiled {stats['locations']} locations ({stats['nodes']} nodes, "
+          f"{stats['strings']} strings, {stats['texts']} texts) into {stats['bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+World Generator - Seeded procedural worlds for scale and soak testing
+
+This module generates worlds in the locations.json schema of any size, so
+the world index, movement menus, unlock checks and save format can be
+exercised with far more than the shipped twelve locations. The same seed
+and settings always produce the same world.
+
+Usage:
+    python world_generator.py --preset large -o large_world.json
+    python world_generator.py --towns 20 --locations-per-town 50 --seed 7 -o world.json
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+# Item pools drawn from the items the game already knows about
+DEFAULT_ITEM_POOLS = {
+    "food": ["canned food", "water bottle", "energy bar", "crackers", "energy drink", "food rations"],
+    "medical": ["first aid kit", "bandages", "painkillers", "vitamins", "antiseptic"],
+    "tools": ["flashlight", "batteries", "rope", "compass", "road map", "lighter", "binoculars"],
+    "weapons": ["hunting knife", "baseball bat", "crowbar", "kitchen knife", "pipe wrench", "axe"],
+    "parts": ["car battery", "spark plugs", "motor oil", "alternator", "radiator", "brake pads"]
+}
+
+PLACE_KINDS = [
+    ("Gas Station", "Broken pumps and an empty forecourt.", ["Search for fuel", "Check abandoned cars"]),
+    ("Supermarket", "Aisles of toppled shelves and spoiled produce.", ["Search for food", "Check storage room"]),
+    ("Hospital", "Abandoned gurneys line the silent corridors.", ["Search emergency room", "Check pharmacy"]),
+    ("Police Station", "The front desk is barricaded with filing cabinets.", ["Search police cars", "Check back entrance"]),
+    ("Auto Shop", "Tools and car parts are scattered across the bays.", ["Search for car parts", "Check the garage"]),
+    ("Church", "Pews are stacked against the doors.", ["Search church", "Check cemetery"]),
+    ("School", "Children's drawings still hang in the hallways.", ["Search classrooms", "Check the gym"]),
+    ("Farm", "An overgrown field surrounds a weathered barn.", ["Search the barn", "Check the farmhouse"]),
+    ("Motel", "A row of doors hang open along the walkway.", ["Search rooms", "Check the office"]),
+    ("Hardware Store", "Empty racks where the tools used to be.", ["Search for tools", "Check storage room"])
+]
+
+HIDDEN_KINDS = ["Bunker", "Cellar", "Bell Tower", "Safe Room", "Rooftop Hideout"]
+
+# Canned worlds that benchmarks and load tests can refer to by name
+CANNED_WORLDS: Dict[str, Dict[str, Any]] = {
+    "small": {"seed": 1, "towns": 4, "locations_per_town": 10},
+    "medium": {"seed": 2, "towns": 20, "locations_per_town": 50},
+    "large": {"seed": 3, "towns": 100, "locations_per_town": 100},
+    "huge": {"seed": 4, "towns": 1000, "locations_per_town": 100}
+}
+
+
+def generate_world(seed: int = 0, towns: int = 4, locations_per_town: int = 10,
+                   degree: int = 3, long_degree: int = 2, hidden_chance: float = 0.05,
+                   vehicle_chance: float = 0.1, items_per_location: int = 5,
+                   item_pools: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Generate a world in the locations.json schema.
+
+    Every town's visible locations are connected (each one links to the
+    next), with extra random walking links up to the requested degree.
+    One location per town is a travel hub with vehicle links to other
+    towns' hubs. Hidden locations are attached to a visible location via
+    hidden_location and are unlocked by a requires_item drawn from the
+    item pools.
+
+    Args:
+        seed: Random seed; the same arguments always give the same world
+        towns: Number of towns
+        locations_per_town: Visible locations per town
+        degree: Target number of walking links per location
+        long_degree: Vehicle links from each town's hub
+        hidden_chance: Chance that a location has an attached hidden location
+        vehicle_chance: Chance that a location has a repairable vehicle
+        items_per_location: Number of items in each location's item list
+        item_pools: Item names by category; defaults to DEFAULT_ITEM_POOLS
+
+    Returns:
+        List of location dictionaries
+    """
+    if towns < 1 or locations_per_town < 1:
+        raise ValueError("A world needs at least one town with one location")
+
+    rng = random.Random(seed)
+    pools = item_pools or DEFAULT_ITEM_POOLS
+    all_items = sorted({item for pool in pools.values() for item in pool})
+    parts = pools.get("parts") or all_items
+    town_names = [f"Town {i:04d}" for i in range(towns)]
+    hubs = [f"{town} Square" for town in town_names]
+
+    locations: List[Dict[str, Any]] = []
+    for town_index, town in enumerate(town_names):
+        names = [hubs[town_index]] + [
+            f"{town} {PLACE_KINDS[i % len(PLACE_KINDS)][0]} {i}" for i in range(1, locations_per_town)
+        ]
+
+        # Walking links: a ring keeps the town connected, random chords add degree
+        links = [set() for _ in names]
+        for i in range(len(names)):
+            if len(names) > 1:
+                j = (i + 1) % len(names)
+                if j != i:
+                    links[i].add(j)
+                    links[j].add(i)
+            while len(links[i]) < min(degree, len(names) - 1):
+                j = rng.randrange(len(names))
+                if j != i:
+                    links[i].add(j)
+                    links[j].add(i)
+
+        other_hubs = [hub for index, hub in enumerate(hubs) if index != town_index]
+        town_locations = []
+        for i, name in enumerate(names):
+            kind, description, special_actions = PLACE_KINDS[i % len(PLACE_KINDS)]
+            if i == 0:
+                kind, description = "Town Square", "Abandoned cars and scattered belongings fill the square."
+
+            actions = [
+                {"name": "Look around", "description": f"Search the {kind.lower()} for useful items"},
+                {"name": "Move to nearby location", "description": f"Travel to another location in {town}"}
+            ]
+            actions += [{"name": action, "description": f"{action} at the {kind.lower()}"}
+                        for action in special_actions]
+
+            location: Dict[str, Any] = {
+                "name": name,
+                "description": f"{description} This {kind.lower()} in {town} has seen better days.",
+                "actions": actions,
+                "town": town,
+                "nearby_short": [names[j] for j in sorted(links[i])],
+                "nearby_long": [],
+                "items": rng.sample(all_items, min(items_per_location, len(all_items))),
+                "parts_needed": [],
+                "fuel_available": kind == "Gas Station",
+                "zombie_chance": round(rng.uniform(0.05, 0.3), 2),
+                "shelter": rng.random() < 0.2,
+                "rest_bonus": rng.choice([0, 0, 5, 10])
+            }
+
+            if i == 0 and other_hubs:
+                location["nearby_long"] = rng.sample(other_hubs, min(long_degree, len(other_hubs)))
+                location["actions"].append(
+                    {"name": "Travel to distant location", "description": "Drive to another town"})
+
+            if rng.random() < vehicle_chance:
+                location["has_repairable_vehicle"] = True
+                location["parts_needed"] = rng.sample(parts, min(3, len(parts)))
+                location["actions"].append(
+                    {"name": "Repair vehicle", "description": "Try to fix a car for long-distance travel"})
+
+            town_locations.append(location)
+
+            if rng.random() < hidden_chance:
+                hidden_name = f"{name} {rng.choice(HIDDEN_KINDS)}"
+                location["hidden_location"] = hidden_name
+                town_locations.append({
+                    "name": hidden_name,
+                    "description": f"A hidden refuge tucked away near the {kind.lower()}. It feels safe here.",
+                    "actions": [
+                        {"name": "Look around", "description": "Search the hideout"},
+                        {"name": "Rest safely", "description": "Take a secure rest"}
+                    ],
+                    "town": town,
+                    "nearby_short": [name],
+                    "nearby_long": [],
+                    "items": rng.sample(all_items, min(3, len(all_items))),
+                    "parts_needed": [],
+                    "fuel_available": False,
+                    "zombie_chance": 0.0,
+                    "shelter": True,
+                    "secure_location": True,
+                    "rest_bonus": 15,
+                    "hidden": True,
+                    "requires_item": rng.choice(all_items)
+                })
+
+        locations.extend(town_locations)
+
+    return locations
+
+
+def generate_canned_world(name: str) -> List[Dict[str, Any]]:
+    """
+    Generate one of the canned worlds by name.
+
+    Args:
+        name: Key of CANNED_WORLDS
+
+    Returns:
+        List of location dictionaries
+    """
+    try:
+        settings = CANNED_WORLDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown canned world '{name}'; choose from {', '.join(CANNED_WORLDS)}") from None
+    return generate_world(**settings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a procedural world in the locations.json schema.")
+    parser.add_argument("--preset", choices=sorted(CANNED_WORLDS), help="generate a canned world")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--towns", type=int, default=4)
+    parser.add_argument("--locations-per-town", type=int, default=10)
+    parser.add_argument("--degree", type=int, default=3, help="walking links per location")
+    parser.add_argument("--long-degree", type=int, default=2, help="vehicle links per town")
+    parser.add_argument("--hidden-chance", type=float, default=0.05)
+    parser.add_argument("--vehicle-chance", type=float, default=0.1)
+    parser.add_argument("--items-per-location", type=int, default=5)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.preset:
+            locations = generate_canned_world(args.preset)
+        else:
+            locations = generate_world(
+                seed=args.seed, towns=args.towns, locations_per_town=args.locations_per_town,
+                degree=args.degree, long_degree=args.long_degree, hidden_chance=args.hidden_chance,
+                vehicle_chance=args.vehicle_chance, items_per_location=args.items_per_location)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(locations, f, indent=1)
+        print(f"Wrote {len(locations)} locations to {args.output}", file=sys.stderr)
+    else:
+        json.dump(locations, sys.stdout, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+World Index - Shared, cached view of the game world
+
+This module loads the location data once per process and shares it between
+the game engine, combat system, game state and movement helpers, so a turn
+never has to touch the disk to answer "where am I?".
+"""
+
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from Functions.read_location_data import (COMPILED_SUFFIX, find_location_file, is_shard_manifest,
+                                          read_location_data, source_for_built_world)
+from action_dispatch import action_table, report_unmatched
+from location_graph import LocationGraph
+from loot_tables import loot_table
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert JSON data into read-only structures.
+
+    Args:
+        value: Parsed JSON value
+
+    Returns:
+        The same data with dicts as read-only mappings and lists as tuples
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class WorldIndex:
+    """Immutable snapshot of every location with O(1) lookup by name and a compiled graph."""
+
+    def __init__(self, locations: Sequence[Mapping[str, Any]], source: Optional[str] = None,
+                 mtime: Optional[float] = None, graph: Optional[LocationGraph] = None):
+        """
+        Build an index over a list of location dictionaries.
+
+        Args:
+            locations: Location data as returned by read_location_data
+            source: File the data was read from, if any
+            mtime: Modification time of the source file when it was read
+            graph: Precompiled graph for these locations; when given, the
+                locations are assumed to be read-only already and are not copied
+        """
+        self.source = source
+        self.mtime = mtime
+        if graph is None:
+            locations = tuple(freeze(location) for location in locations)
+            graph = LocationGraph(locations)
+        self._locations: Sequence[Mapping[str, Any]] = locations
+        self.graph = graph
+
+    @property
+    def locations(self) -> Sequence[Mapping[str, Any]]:
+        """All locations in file order."""
+        return self._locations
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get a location by name, or None if it does not exist."""
+        node = self.graph.ids.get(name)
+        if node is None or node >= self.graph.location_count:
+            return None
+        return self._locations[node]
+
+    def graph_for(self, name: str) -> LocationGraph:
+        """Get the graph that contains a location (the whole world, for a single index)."""
+        return self.graph
+
+    def town_of(self, name: str) -> str:
+        """Get the town a location belongs to."""
+        return self.graph.town_of(self.graph.id_of(name))
+
+    def unlocked_by(self, item: str) -> Tuple[str, ...]:
+        """Get the names of the hidden locations that an item unlocks."""
+        return tuple(self.graph.name_of(node) for node in self.graph.unlocked_by(item))
+
+    def activate(self, name: str):
+        """Note the player's location; everything is already resident in a single index."""
+
+    def prefetch(self, name: str):
+        """Start loading a location ahead of use; everything is already resident in a single index."""
+
+    def __contains__(self, name: object) -> bool:
+        return self.get(name) is not None
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._locations)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+
+class WorldCache:
+    """Process-wide holder for the current WorldIndex."""
+
+    def __init__(self):
+        """Initialize an empty cache; the world is loaded on first use."""
+        self._world: Optional[WorldIndex] = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def get(self) -> WorldIndex:
+        """
+        Get the current world, loading it on first use.
+
+        Returns:
+            The shared WorldIndex
+        """
+        world = self._world
+        if world is not None:
+            self.hits += 1
+            return world
+
+        with self._lock:
+            if self._world is None:
+                self._world = self._load()
+            return self._world
+
+    def refresh(self) -> bool:
+        """
+        Reload the world if the source file changed on disk.
+
+        Returns:
+            True if a new world was loaded
+        """
+        with self._lock:
+            world = self._world
+            path = find_location_file()
+            if world is not None and path == world.source and _mtime(path) == world.mtime:
+                return False
+            self._world = self._load()
+            return True
+
+    def install(self, world: WorldIndex):
+        """Replace the current world, e.g. with one built in memory."""
+        with self._lock:
+            self._world = world
+
+    def swap(self, expected: WorldIndex, world: WorldIndex) -> bool:
+        """
+        Replace the current world only if it is still the expected one.
+
+        Args:
+            expected: The world the replacement was derived from
+            world: The replacement
+
+        Returns:
+            True if the world was replaced
+        """
+        with self._lock:
+            if self._world is not expected:
+                return False
+            self._world = world
+            return True
+
+    def invalidate(self):
+        """Drop the cached world so the next access reloads it."""
+        with self._lock:
+            self._world = None
+
+    def stats(self) -> Dict[str, int]:
+        """Get the load and hit counters."""
+        world = self._world
+        return {
+            "loads": self.loads,
+            "hits": self.hits,
+            "locations": len(world) if world is not None else 0
+        }
+
+    def _load(self) -> WorldIndex:
+        """Read the locations file and build a fresh index."""
+        path = find_location_file()
+        if path is not None and (path.endswith(COMPILED_SUFFIX) or is_shard_manifest(path)):
+            from world_compiler import WorldFormatError, load_compiled_world
+            from world_shards import ShardedWorld
+            try:
+                if is_shard_manifest(path):
+                    # Each shard binds its own locations when it is mapped
+                    world = ShardedWorld(path)
+                else:
+                    world = load_compiled_world(path)
+                    # Unmatched actions were already reported by the compiler
+                    action_table.bind(world.locations)
+                    loot_table.bind(world.locations)
+                self.loads += 1
+                return world
+            except (OSError, WorldFormatError) as e:
+                print(f"Warning: could not load compiled world ({e}), falling back to JSON")
+                path = source_for_built_world(path)
+
+        mtime = _mtime(path)
+        locations = read_location_data(path)
+        self.loads += 1
+        world = WorldIndex(locations, source=path, mtime=mtime)
+        report_unmatched(action_table.bind(world.locations))
+        loot_table.bind(world.locations)
+        return world
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    """Get a file's modification time, or None if it is unavailable."""
+    if path is None:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def get_world() -> WorldIndex:
+    """Get the shared world index."""
+    return world_cache.get()
+
+
+# Global world cache instance
+world_cache = WorldCache()
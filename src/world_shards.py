@@ -0,0 +1,330 @@
+"""
+World Shards - Per-town world loading
+
+This module splits a world into one compiled shard per town plus a small
+manifest. A ShardedWorld only maps the shards it needs: the player's
+current town and the towns reachable from it by vehicle. Other towns are
+evicted once the resident shards exceed a memory budget, and a vehicle
+destination can be prefetched on a background thread while the player
+confirms the trip.
+"""
+
+import collections.abc
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from action_dispatch import action_table, report_unmatched
+from Functions.read_location_data import SHARD_MANIFEST, SHARDED_SUFFIX, validate_location_data
+from location_graph import LocationGraph
+from loot_tables import loot_table
+from world_compiler import WorldFormatError, compile_world, load_compiled_world
+
+MANIFEST_VERSION = 1
+
+# Default budget for mapped shard files
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+def compile_sharded_world(locations: List[Dict[str, Any]], output_dir: str) -> Dict[str, int]:
+    """
+    Compile a world into one shard per town and write its manifest.
+
+    Args:
+        locations: Location data in the locations.json schema
+        output_dir: Directory to write the shards and manifest into
+
+    Returns:
+        Dictionary with counts describing the sharded world
+
+    Raises:
+        ValueError: If the location data is invalid
+    """
+    validate_location_data(locations)
+    os.makedirs(output_dir, exist_ok=True)
+
+    towns: List[str] = []
+    town_ids: Dict[str, int] = {}
+    by_town: Dict[int, List[Dict[str, Any]]] = {}
+    location_towns: Dict[str, int] = {}
+    for location in locations:
+        town = location.get("town", "")
+        town_id = town_ids.setdefault(town, len(towns))
+        if town_id == len(towns):
+            towns.append(town)
+        by_town.setdefault(town_id, []).append(location)
+        location_towns.setdefault(location["name"], town_id)
+
+    unlocks: Dict[str, List[str]] = {}
+    for location in locations:
+        if location.get("hidden", False) and location.get("requires_item"):
+            unlocks.setdefault(location["requires_item"], []).append(location["name"])
+
+    town_entries = []
+    total_bytes = 0
+    for town_id, town in enumerate(towns):
+        town_locations = by_town[town_id]
+        neighbours = sorted({
+            location_towns[target]
+            for location in town_locations
+            for target in location.get("nearby_long", [])
+            if target in location_towns and location_towns[target] != town_id
+        })
+        filename = f"town_{town_id:04d}.zworld"
+        stats = compile_world(town_locations, os.path.join(output_dir, filename))
+        total_bytes += stats["bytes"]
+        town_entries.append({
+            "name": town,
+            "file": filename,
+            "bytes": stats["bytes"],
+            "locations": len(town_locations),
+            "neighbors": neighbours
+        })
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "towns": town_entries,
+        "locations": location_towns,
+        "unlocks": unlocks
+    }
+    temp_path = os.path.join(output_dir, SHARD_MANIFEST + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(temp_path, os.path.join(output_dir, SHARD_MANIFEST))
+
+    return {"locations": len(locations), "towns": len(towns), "bytes": total_bytes}
+
+
+def compile_sharded_world_file(source: str, output_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compile a locations.json file into town shards.
+
+    Args:
+        source: Path to the JSON file
+        output_dir: Directory to write; defaults to the source path with a .zshards suffix
+
+    Returns:
+        Dictionary with counts describing the sharded world
+    """
+    if output_dir is None:
+        output_dir = os.path.splitext(source)[0] + SHARDED_SUFFIX
+    with open(source, "r", encoding="utf-8") as f:
+        locations = json.load(f)
+    # Compiled worlds are not re-read as JSON at load time, so check the actions here
+    report_unmatched(action_table.bind(locations))
+    return compile_sharded_world(locations, output_dir)
+
+
+class _ShardedLocations(collections.abc.Sequence):
+    """All locations of a sharded world, town by town; iterating loads every shard."""
+
+    def __init__(self, world: 'ShardedWorld'):
+        self._world = world
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        for town_id, town in enumerate(self._world.towns):
+            if index < town["locations"]:
+                return self._world.shard(town_id).locations[index]
+            index -= town["locations"]
+        raise IndexError("location index out of range")
+
+    def __len__(self) -> int:
+        return len(self._world)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        for town_id in range(len(self._world.towns)):
+            yield from self._world.shard(town_id).locations
+
+
+class ShardedWorld:
+    """World index that keeps only nearby towns memory-mapped."""
+
+    def __init__(self, manifest_path: str, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        Open a sharded world from its manifest.
+
+        Args:
+            manifest_path: Path to the manifest.json written by compile_sharded_world
+            memory_budget: Mapped bytes to allow before cold towns are evicted
+
+        Raises:
+            WorldFormatError: If the manifest is missing or from another version
+        """
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise WorldFormatError(f"Cannot read shard manifest {manifest_path}: {e}") from e
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise WorldFormatError(f"{manifest_path} uses manifest version {manifest.get('version')}, "
+                                   f"expected {MANIFEST_VERSION}; recompile it")
+
+        self.source = manifest_path
+        self.mtime = os.path.getmtime(manifest_path)
+        self.directory = os.path.dirname(manifest_path)
+        self.memory_budget = memory_budget
+        self.towns: List[Dict[str, Any]] = manifest["towns"]
+        self._location_towns: Dict[str, int] = manifest["locations"]
+        self._unlocks: Dict[str, List[str]] = manifest["unlocks"]
+
+        self._shards: 'OrderedDict[int, Any]' = OrderedDict()
+        self._pinned: Set[int] = set()
+        self._lock = threading.RLock()
+        self._prefetches: Dict[int, threading.Thread] = {}
+        self.shard_loads = 0
+        self.evictions = 0
+
+    @property
+    def locations(self) -> _ShardedLocations:
+        """All locations; iterating this loads every shard, so prefer get()."""
+        return _ShardedLocations(self)
+
+    @property
+    def resident_towns(self) -> List[str]:
+        """Names of the towns whose shards are currently mapped."""
+        with self._lock:
+            return [self.towns[town_id]["name"] for town_id in self._shards]
+
+    @property
+    def resident_bytes(self) -> int:
+        """Size of the currently mapped shard files."""
+        with self._lock:
+            return sum(self.towns[town_id]["bytes"] for town_id in self._shards)
+
+    def shard(self, town_id: int):
+        """
+        Get a town's shard, loading it if needed.
+
+        Args:
+            town_id: Index of the town in the manifest
+
+        Returns:
+            WorldIndex for the town's locations
+        """
+        with self._lock:
+            world = self._shards.get(town_id)
+            if world is not None:
+                self._shards.move_to_end(town_id)
+                return world
+
+        # Load outside the lock so a background prefetch does not block lookups
+        # for towns that are already resident
+        path = os.path.join(self.directory, self.towns[town_id]["file"])
+        world = load_compiled_world(path)
+        action_table.bind(world.locations)
+        loot_table.bind(world.locations)
+
+        with self._lock:
+            existing = self._shards.get(town_id)
+            if existing is not None:
+                return existing
+            self._shards[town_id] = world
+            self.shard_loads += 1
+            self._evict(keep=town_id)
+            return world
+
+    def _evict(self, keep: Optional[int] = None):
+        """Drop least recently used, unpinned shards until within budget."""
+        for town_id in list(self._shards):
+            if self.resident_bytes <= self.memory_budget:
+                break
+            if town_id not in self._pinned and town_id != keep:
+                del self._shards[town_id]
+                self.evictions += 1
+
+    def _shard_for(self, name: str):
+        """Get the shard that holds a location, or None if the name is unknown."""
+        town_id = self._location_towns.get(name)
+        if town_id is None:
+            return None
+        return self.shard(town_id)
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get a location by name, or None if it does not exist."""
+        shard = self._shard_for(name)
+        return shard.get(name) if shard is not None else None
+
+    def graph_for(self, name: str) -> LocationGraph:
+        """Get the graph of the town that contains a location."""
+        shard = self._shard_for(name)
+        if shard is None:
+            return LocationGraph([])
+        return shard.graph
+
+    def town_of(self, name: str) -> str:
+        """Get the town a location belongs to, without loading its shard."""
+        town_id = self._location_towns.get(name)
+        return self.towns[town_id]["name"] if town_id is not None else ""
+
+    def unlocked_by(self, item: str) -> Tuple[str, ...]:
+        """Get the names of the hidden locations that an item unlocks."""
+        return tuple(self._unlocks.get(item, ()))
+
+    def activate(self, name: str):
+        """
+        Make a location's town the active one.
+
+        The town is loaded immediately, the towns reachable from it by
+        vehicle are prefetched, and only those stay pinned against eviction.
+
+        Args:
+            name: The player's current location
+        """
+        town_id = self._location_towns.get(name)
+        if town_id is None:
+            return
+        neighbours = self.towns[town_id]["neighbors"]
+        with self._lock:
+            self._pinned = {town_id, *neighbours}
+        self.shard(town_id)
+        for neighbour in neighbours:
+            self._prefetch_town(neighbour)
+        with self._lock:
+            self._evict()
+
+    def prefetch(self, name: str):
+        """Start loading the shard for a location on a background thread."""
+        town_id = self._location_towns.get(name)
+        if town_id is not None:
+            self._prefetch_town(town_id)
+
+    def _prefetch_town(self, town_id: int):
+        """Load a town's shard in the background if it is not resident or loading."""
+        with self._lock:
+            if town_id in self._shards:
+                return
+            thread = self._prefetches.get(town_id)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._prefetch_worker, args=(town_id,), daemon=True)
+            self._prefetches[town_id] = thread
+        thread.start()
+
+    def _prefetch_worker(self, town_id: int):
+        """Background body for _prefetch_town."""
+        try:
+            self.shard(town_id)
+        except (OSError, WorldFormatError) as e:
+            print(f"Warning: could not prefetch {self.towns[town_id]['name']}: {e}")
+
+    def wait_for_prefetch(self, timeout: Optional[float] = None):
+        """Wait for outstanding background loads to finish."""
+        with self._lock:
+            threads = list(self._prefetches.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._location_towns
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self.locations)
+
+    def __len__(self) -> int:
+        return sum(town["locations"] for town in self.towns)
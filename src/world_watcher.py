@@ -0,0 +1,343 @@
+"""
+World Watcher - Hot reload of the locations file
+
+This module polls the locations file for changes while the game runs. When
+it changes, the new data is diffed against the current world location by
+location, and a new WorldIndex is built that reuses the frozen records and
+graph entries of everything that did not change. The new index replaces
+the shared one in a single swap, so a reader sees either the old world or
+the new one, never a mix.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from action_dispatch import action_table, report_unmatched
+from Functions.read_location_data import find_location_file, validate_location_data
+from location_graph import NO_NODE, LocationGraph
+from loot_tables import loot_table
+from world_index import WorldCache, WorldIndex, _mtime, freeze, world_cache
+
+# Seconds between checks of the locations file
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class WorldDiff:
+    """Names of the locations that were added, removed or changed between two worlds."""
+
+    def __init__(self, added: List[str], removed: List[str], changed: List[str], reordered: bool):
+        """
+        Record a diff.
+
+        Args:
+            added: Locations only in the new world
+            removed: Locations only in the old world
+            changed: Locations in both worlds whose data differs
+            reordered: True if the location order differs even apart from additions and removals
+        """
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.reordered = reordered
+
+    @property
+    def structural(self) -> bool:
+        """True if the set or order of locations changed, so node IDs must be reassigned."""
+        return bool(self.added or self.removed or self.reordered)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.reordered)
+
+    def __repr__(self) -> str:
+        return (f"WorldDiff(added={self.added}, removed={self.removed}, "
+                f"changed={self.changed}, reordered={self.reordered})")
+
+
+def _same(frozen: Any, raw: Any) -> bool:
+    """Compare a frozen record from a WorldIndex with freshly parsed JSON."""
+    if isinstance(raw, dict):
+        if not isinstance(frozen, Mapping) or len(frozen) != len(raw):
+            return False
+        return all(key in frozen and _same(frozen[key], value) for key, value in raw.items())
+    if isinstance(raw, list):
+        if not isinstance(frozen, tuple) or len(frozen) != len(raw):
+            return False
+        return all(_same(a, b) for a, b in zip(frozen, raw))
+    return type(frozen) is type(raw) and frozen == raw
+
+
+def diff_world(world: WorldIndex, locations: Sequence[Dict[str, Any]],
+               previous: Optional[Sequence[Dict[str, Any]]] = None) -> WorldDiff:
+    """
+    Compare the current world with new location data.
+
+    Args:
+        world: The world currently in use
+        locations: Newly parsed location data
+        previous: The parsed data the world was built from, if still at hand;
+            comparing plain dicts is much faster than walking frozen records
+
+    Returns:
+        WorldDiff describing what changed
+    """
+    old_names = [location["name"] for location in world.locations]
+    new_names = [location["name"] for location in locations]
+    old_set, new_set = set(old_names), set(new_names)
+
+    changed = []
+    if previous is not None:
+        old_by_name: Dict[str, Dict[str, Any]] = {}
+        for location in previous:
+            old_by_name.setdefault(location["name"], location)
+        for location in locations:
+            old = old_by_name.get(location["name"])
+            if old is not None and old != location:
+                changed.append(location["name"])
+    else:
+        for location in locations:
+            old = world.get(location["name"])
+            if old is not None and not _same(old, location):
+                changed.append(location["name"])
+
+    kept_old = [name for name in old_names if name in new_set]
+    kept_new = [name for name in new_names if name in old_set]
+    return WorldDiff(
+        added=[name for name in new_names if name not in old_set],
+        removed=[name for name in old_names if name not in new_set],
+        changed=changed,
+        reordered=kept_old != kept_new or len(old_set) != len(old_names) or len(new_set) != len(new_names)
+    )
+
+
+def _patch_graph(graph: LocationGraph, locations: Sequence[Mapping[str, Any]],
+                 changed_nodes: Set[int]) -> LocationGraph:
+    """
+    Build a graph for locations whose node IDs are unchanged, recomputing only changed nodes.
+
+    The old graph is left untouched, since sessions may still be reading it.
+
+    Args:
+        graph: Graph of the current world
+        locations: Frozen locations of the new world, in the same order as before
+        changed_nodes: Node IDs whose location data changed
+
+    Returns:
+        A new LocationGraph
+    """
+    names = list(graph.names)
+    ids = dict(graph.ids)
+    towns = list(graph.towns)
+    hidden = bytearray(graph.hidden)
+    nearby_short = list(graph.nearby_short)
+    nearby_long = list(graph.nearby_long)
+    hidden_location = list(graph.hidden_location)
+
+    def intern(name: str) -> int:
+        node = ids.get(name)
+        if node is None:
+            node = len(names)
+            names.append(name)
+            ids[name] = node
+        return node
+
+    # Town and item keys whose index entries have to be rebuilt
+    towns_touched: Set[str] = set()
+    items_touched: Set[str] = set()
+    for node in changed_nodes:
+        old_location_town = towns[node]
+        if hidden[node]:
+            towns_touched.add(old_location_town)
+            items_touched.update(item for item, nodes in graph.unlocks_by_item.items() if node in nodes)
+
+        location = locations[node]
+        towns[node] = location.get("town", "")
+        nearby_short[node] = tuple(intern(name) for name in location.get("nearby_short", ()))
+        nearby_long[node] = tuple(intern(name) for name in location.get("nearby_long", ()))
+        target = location.get("hidden_location")
+        hidden_location[node] = intern(target) if target else NO_NODE
+        hidden[node] = 1 if location.get("hidden", False) else 0
+        if hidden[node]:
+            towns_touched.add(towns[node])
+            if location.get("requires_item"):
+                items_touched.add(location["requires_item"])
+
+    hidden_by_town = dict(graph.hidden_by_town)
+    unlocks_by_item = dict(graph.unlocks_by_item)
+    for town in towns_touched:
+        hidden_by_town.pop(town, None)
+    for item in items_touched:
+        unlocks_by_item.pop(item, None)
+
+    if towns_touched or items_touched:
+        rebuilt_towns: Dict[str, List[int]] = {}
+        rebuilt_items: Dict[str, List[int]] = {}
+        hidden_nodes = set(changed_nodes)
+        for nodes in graph.hidden_by_town.values():
+            hidden_nodes.update(nodes)
+        for node in sorted(hidden_nodes):
+            if not hidden[node]:
+                continue
+            if towns[node] in towns_touched:
+                rebuilt_towns.setdefault(towns[node], []).append(node)
+            item = locations[node].get("requires_item")
+            if item in items_touched:
+                rebuilt_items.setdefault(item, []).append(node)
+        hidden_by_town.update((town, tuple(nodes)) for town, nodes in rebuilt_towns.items())
+        unlocks_by_item.update((item, tuple(nodes)) for item, nodes in rebuilt_items.items())
+
+    return LocationGraph.from_arrays(names, graph.location_count, towns, hidden, nearby_short,
+                                     nearby_long, hidden_location, hidden_by_town, unlocks_by_item)
+
+
+def apply_diff(world: WorldIndex, locations: Sequence[Dict[str, Any]], diff: WorldDiff,
+               source: Optional[str] = None, mtime: Optional[float] = None) -> WorldIndex:
+    """
+    Build the next world from the current one and a diff.
+
+    Unchanged locations keep their frozen records. If only location contents
+    changed, the graph is patched for the changed nodes; if locations were
+    added, removed or reordered, node IDs shift and the graph is rebuilt.
+
+    Args:
+        world: The world currently in use
+        locations: Newly parsed location data
+        diff: Result of diff_world(world, locations)
+        source: File the new data was read from
+        mtime: Modification time of that file
+
+    Returns:
+        A new WorldIndex; the old one is not modified
+    """
+    changed = set(diff.changed) | set(diff.added)
+    frozen = tuple(
+        freeze(location) if location["name"] in changed else world.get(location["name"])
+        for location in locations
+    )
+
+    if diff.structural:
+        graph = LocationGraph(frozen)
+    else:
+        graph = _patch_graph(world.graph, frozen, {world.graph.ids[name] for name in diff.changed})
+
+    return WorldIndex(frozen, source=source, mtime=mtime, graph=graph)
+
+
+def read_locations_strict(path: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate a locations file, without falling back to default data.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        List of location dictionaries
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON or does not match the schema
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        locations = json.load(f)
+    validate_location_data(locations)
+    return locations
+
+
+class WorldWatcher:
+    """Background poller that hot-reloads the shared world when its file changes."""
+
+    def __init__(self, cache: WorldCache = world_cache, interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Set up a watcher; call start() to begin polling.
+
+        Args:
+            cache: World cache to keep up to date
+            interval: Seconds between checks
+        """
+        self.cache = cache
+        self.interval = interval
+        self.reloads = 0
+        # Parsed data of the world last seen, kept to make the next diff cheap
+        self._baseline_world: Optional[WorldIndex] = None
+        self._baseline: Optional[List[Dict[str, Any]]] = None
+        # Modification time of a file that failed to load, so it is reported once
+        self._rejected_mtime: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> Optional[WorldDiff]:
+        """
+        Check the locations file once and apply any changes.
+
+        Returns:
+            The applied WorldDiff, or None if nothing changed
+        """
+        world = self.cache.get()
+        path = find_location_file()
+        mtime = _mtime(path)
+        is_json = isinstance(world, WorldIndex) and path is not None and path.endswith(".json")
+
+        if path == world.source and mtime == world.mtime:
+            # Unchanged; take a baseline for the next diff while nothing is waiting on it
+            if is_json and self._baseline_world is not world:
+                try:
+                    self._baseline = read_locations_strict(path)
+                    self._baseline_world = world
+                except (OSError, ValueError):
+                    pass
+            return None
+
+        # Compiled and sharded worlds have no per-location diff; reload them whole
+        if not is_json:
+            if self.cache.refresh():
+                self.reloads += 1
+            return None
+
+        if mtime is not None and mtime == self._rejected_mtime:
+            return None
+        try:
+            locations = read_locations_strict(path)
+        except (OSError, ValueError) as e:
+            # Likely a half-saved edit; keep the current world until the file is fixed
+            print(f"Warning: not reloading {path} ({e}); keeping the current world")
+            self._rejected_mtime = mtime
+            return None
+        self._rejected_mtime = None
+        previous = self._baseline if self._baseline_world is world else None
+        diff = diff_world(world, locations, previous)
+        new_world = apply_diff(world, locations, diff, source=path, mtime=mtime)
+        touched = set(diff.changed) | set(diff.added)
+        report_unmatched(action_table.bind(new_world.get(name) for name in touched))
+        loot_table.bind(new_world.get(name) for name in touched)
+        if not self.cache.swap(world, new_world):
+            return None
+        self._baseline, self._baseline_world = locations, new_world
+        self.reloads += 1
+        return diff
+
+    def start(self):
+        """Start polling on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="world-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Polling loop for start()."""
+        while not self._stop.wait(self.interval):
+            try:
+                diff = self.check()
+            except Exception as e:
+                print(f"Warning: could not reload world data: {e}")
+                continue
+            if diff:
+                print(f"World data updated: {len(diff.changed)} changed, "
+                      f"{len(diff.added)} added, {len(diff.removed)} removed")